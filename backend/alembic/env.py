@@ -9,7 +9,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.db.database import Base
 from app.core.config import get_settings
-from app.models import Store, SearchJob, SearchResult  # noqa: F401
+from app.models import Store, SearchJob, SearchResult, StoreFacet, SearchStat  # noqa: F401
 
 config = context.config
 
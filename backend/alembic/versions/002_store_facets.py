@@ -0,0 +1,51 @@
+"""Store facet counts
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '002'
+down_revision: Union[str, None] = '001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'store_facets',
+        sa.Column('facet', sa.String(20), nullable=False),
+        sa.Column('value', sa.String(255), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('facet', 'value')
+    )
+
+    # Backfill from existing stores
+    op.execute("""
+        INSERT INTO store_facets (facet, value, count)
+        SELECT 'total', '', COUNT(*) FROM stores
+        UNION ALL
+        SELECT 'niche', niche, COUNT(*) FROM stores
+        WHERE niche IS NOT NULL AND niche != '' GROUP BY niche
+        UNION ALL
+        SELECT 'country', country, COUNT(*) FROM stores
+        WHERE country IS NOT NULL AND country != '' GROUP BY country
+        UNION ALL
+        SELECT 'contact', 'has_email', COUNT(*) FROM stores
+        WHERE email IS NOT NULL AND email != ''
+        UNION ALL
+        SELECT 'contact', 'has_instagram', COUNT(*) FROM stores
+        WHERE instagram IS NOT NULL AND instagram != ''
+        UNION ALL
+        SELECT 'contact', 'has_tiktok', COUNT(*) FROM stores
+        WHERE tiktok IS NOT NULL AND tiktok != ''
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('store_facets')
@@ -0,0 +1,78 @@
+"""Store contact flags and partial indexes
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 10000
+
+
+def upgrade() -> None:
+    # Constant defaults: metadata-only change, no table rewrite
+    for flag in ('has_email', 'has_instagram', 'has_tiktok'):
+        op.add_column(
+            'stores',
+            sa.Column(flag, sa.Boolean(), nullable=False, server_default=sa.false()),
+        )
+
+    # Backfill and build indexes outside the migration transaction, so each
+    # batch commits on its own and index builds don't block writes
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        max_id = conn.execute(sa.text("SELECT COALESCE(MAX(id), 0) FROM stores")).scalar()
+
+        for start in range(0, max_id + 1, BACKFILL_BATCH_SIZE):
+            conn.execute(
+                sa.text("""
+                    UPDATE stores SET
+                        has_email = (email IS NOT NULL AND email != ''),
+                        has_instagram = (instagram IS NOT NULL AND instagram != ''),
+                        has_tiktok = (tiktok IS NOT NULL AND tiktok != '')
+                    WHERE id >= :start AND id < :end
+                      AND (email != '' OR instagram != '' OR tiktok != '')
+                """),
+                {"start": start, "end": start + BACKFILL_BATCH_SIZE},
+            )
+
+        op.create_index(
+            'ix_stores_email_niche_created', 'stores', ['niche', 'created_at'],
+            postgresql_where=sa.text('has_email'), postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_stores_email_created', 'stores', ['created_at'],
+            postgresql_where=sa.text('has_email'), postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_stores_instagram_created', 'stores', ['created_at'],
+            postgresql_where=sa.text('has_instagram'), postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_stores_tiktok_created', 'stores', ['created_at'],
+            postgresql_where=sa.text('has_tiktok'), postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_stores_created_at', 'stores', ['created_at'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_stores_created_at', table_name='stores')
+    op.drop_index('ix_stores_tiktok_created', table_name='stores')
+    op.drop_index('ix_stores_instagram_created', table_name='stores')
+    op.drop_index('ix_stores_email_created', table_name='stores')
+    op.drop_index('ix_stores_email_niche_created', table_name='stores')
+    op.drop_column('stores', 'has_tiktok')
+    op.drop_column('stores', 'has_instagram')
+    op.drop_column('stores', 'has_email')
@@ -0,0 +1,44 @@
+"""Search stats and stores-per-day facets
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'search_stats',
+        sa.Column('status', sa.String(20), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('stores_found', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('status')
+    )
+
+    # Backfill from existing searches (stats use the lowercase enum values)
+    op.execute("""
+        INSERT INTO search_stats (status, count, stores_found)
+        SELECT lower(status::text), COUNT(*), COALESCE(SUM(stores_found), 0)
+        FROM search_jobs GROUP BY status
+    """)
+
+    op.execute("""
+        INSERT INTO store_facets (facet, value, count)
+        SELECT 'day', to_char(created_at, 'YYYY-MM-DD'), COUNT(*)
+        FROM stores GROUP BY 2
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM store_facets WHERE facet = 'day'")
+    op.drop_table('search_stats')
@@ -0,0 +1,24 @@
+"""Stage timing breakdown on search jobs
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('search_jobs', sa.Column('timings', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('search_jobs', 'timings')
@@ -0,0 +1,47 @@
+"""Search URL checkpoints for resumable searches
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('search_jobs', sa.Column('serp_fetched_at', sa.DateTime(), nullable=True))
+
+    op.create_table(
+        'search_urls',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('search_id', sa.Integer(), nullable=False),
+        sa.Column('url', sa.String(2048), nullable=False),
+        sa.Column(
+            'status',
+            sa.Enum('PENDING', 'DONE', 'FAILED', 'NOT_SHOPIFY', name='searchurlstatus'),
+            nullable=False,
+        ),
+        sa.Column('store_id', sa.Integer(), nullable=True),
+        sa.Column('error_type', sa.String(255), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['search_id'], ['search_jobs.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['store_id'], ['stores.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('search_id', 'url', name='uq_search_urls_search_url'),
+    )
+    op.create_index('ix_search_urls_search_status', 'search_urls', ['search_id', 'status'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_search_urls_search_status', table_name='search_urls')
+    op.drop_table('search_urls')
+    sa.Enum(name='searchurlstatus').drop(op.get_bind(), checkfirst=True)
+    op.drop_column('search_jobs', 'serp_fetched_at')
@@ -0,0 +1,26 @@
+"""Queued status for search URLs handed to scrape tasks
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ADD VALUE can't run inside a transaction block before Postgres 12
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE searchurlstatus ADD VALUE IF NOT EXISTS 'QUEUED' AFTER 'PENDING'")
+
+
+def downgrade() -> None:
+    # Enum values can't be dropped: return queued URLs to pending
+    op.execute("UPDATE search_urls SET status = 'PENDING' WHERE status = 'QUEUED'")
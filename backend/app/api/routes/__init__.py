@@ -1,4 +1,6 @@
 from app.api.routes.stores import router as stores_router
 from app.api.routes.searches import router as searches_router
+from app.api.routes.stats import router as stats_router
+from app.api.routes.profiles import router as profiles_router
 
-__all__ = ["stores_router", "searches_router"]
+__all__ = ["stores_router", "searches_router", "stats_router", "profiles_router"]
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+
+from app.core.profiling import ProfileStore
+
+router = APIRouter(prefix="/profiles", tags=["profiles"])
+
+
+@router.get("")
+def list_profiles():
+    """List stored task profiles, newest first."""
+    return ProfileStore().list_profiles()
+
+
+@router.get("/{task_id}")
+def get_profile(task_id: str):
+    """Get a profile's metadata, including event loop lag samples."""
+    profile = ProfileStore().get(task_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
+
+
+@router.get("/{task_id}/download")
+def download_profile(task_id: str):
+    """
+    Download the cProfile stats file.
+
+    Open with `python -m pstats <file>` or snakeviz.
+    """
+    path = ProfileStore().path(task_id, "prof")
+    if not path:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type=ProfileStore.KINDS["prof"], filename=f"{task_id}.prof")
@@ -1,13 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 
 from app.core.dependencies import get_search_service
+from app.core.response_cache import response_cache
 from app.services.search_service import SearchService
+from app.services.export_service import ExportService
 from app.schemas.search import (
     SearchJobCreate,
     SearchJobResponse,
     SearchJobWithResults,
     SearchJobListResponse,
+    SearchRunStatsResponse,
+    RetryMode,
 )
+from app.schemas.store import parse_store_fields
+from app.tasks.celery_app import PRIORITY_INTERACTIVE
 from app.tasks.search_tasks import run_search_task
 
 router = APIRouter(prefix="/searches", tags=["searches"])
@@ -25,11 +33,17 @@ def list_searches(
 
 @router.get("/recent", response_model=list[SearchJobResponse])
 def get_recent_searches(
+    request: Request,
     limit: int = Query(10, ge=1, le=50, description="Number of recent searches"),
     search_service: SearchService = Depends(get_search_service),
 ):
     """Get recent search jobs."""
-    return search_service.get_recent_searches(limit=limit)
+    return response_cache.serve(
+        request,
+        list[SearchJobResponse],
+        ["searches"],
+        lambda: search_service.get_recent_searches(limit=limit),
+    )
 
 
 @router.get("/{search_id}", response_model=SearchJobResponse)
@@ -44,21 +58,84 @@ def get_search(
     return search
 
 
+@router.get("/{search_id}/stats", response_model=SearchRunStatsResponse)
+def get_search_stats(
+    search_id: int,
+    search_service: SearchService = Depends(get_search_service),
+):
+    """
+    Get where a search's time went.
+
+    Per-stage wall time (SERP, scraping, DB writes), URL outcomes and page
+    time percentiles, recorded when the latest run finished.
+    """
+    stats = search_service.get_run_stats(search_id)
+    if not stats:
+        raise HTTPException(status_code=404, detail="Search not found")
+    return stats
+
+
 @router.get("/{search_id}/results", response_model=SearchJobWithResults)
 def get_search_results(
+    request: Request,
     search_id: int,
+    fields: Optional[str] = Query(None, description="Comma-separated store fields to return"),
+    cursor: Optional[int] = Query(None, description="next_cursor from the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Stores per page (all if unset)"),
     search_service: SearchService = Depends(get_search_service),
 ):
-    """Get a search job with its results."""
-    search = search_service.get_search_with_results(search_id)
-    if not search:
+    """
+    Get a search job with its results.
+
+    Set limit to paginate: follow next_cursor until it is null.
+    """
+    columns = _parse_fields(fields)
+
+    def load_results():
+        search = search_service.get_search_with_results(
+            search_id, fields=columns, cursor=cursor, limit=limit
+        )
+        if not search:
+            raise HTTPException(status_code=404, detail="Search not found")
+        return search
+
+    return response_cache.serve(
+        request,
+        SearchJobWithResults,
+        [f"search:{search_id}", "stores"],
+        load_results,
+    )
+
+
+@router.get("/{search_id}/results/stream")
+def stream_search_results(
+    search_id: int,
+    fields: Optional[str] = Query(None, description="Comma-separated store fields to return"),
+    search_service: SearchService = Depends(get_search_service),
+):
+    """Stream a search's stores as NDJSON, one store per line."""
+    columns = _parse_fields(fields)
+
+    if not search_service.get_search(search_id):
         raise HTTPException(status_code=404, detail="Search not found")
-    return search
+
+    return StreamingResponse(
+        ExportService().stream_search_results(search_id, columns),
+        media_type="application/x-ndjson",
+    )
+
+
+def _parse_fields(fields: Optional[str]) -> list[str]:
+    try:
+        return parse_store_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("", response_model=SearchJobResponse, status_code=201)
 def create_search(
     search_data: SearchJobCreate,
+    profile: bool = Query(False, description="Profile the search task (see /profiles)"),
     search_service: SearchService = Depends(get_search_service),
 ):
     """
@@ -69,8 +146,8 @@ def create_search(
     """
     search = search_service.create_search(search_data)
 
-    # Queue the Celery task
-    run_search_task.delay(search.id)
+    # Queue the Celery task (ahead of batch work: a user is waiting on it)
+    run_search_task.apply_async((search.id,), {"profile": profile}, priority=PRIORITY_INTERACTIVE)
 
     return search
 
@@ -78,24 +155,43 @@ def create_search(
 @router.post("/{search_id}/retry", response_model=SearchJobResponse)
 def retry_search(
     search_id: int,
+    mode: RetryMode = Query(
+        RetryMode.FULL,
+        description="full: new SERP query, every URL; resume: URLs not yet visited; "
+        "failed: those plus the URLs that failed",
+    ),
+    profile: bool = Query(False, description="Profile the search task (see /profiles)"),
     search_service: SearchService = Depends(get_search_service),
 ):
-    """Retry a failed search job."""
+    """
+    Retry a failed search job.
+
+    The mode picks what is done again; resume and failed reuse the URLs
+    checkpointed by the last run instead of repeating the SERP query. A full
+    retry always queries the SERP, bypassing the SERP cache. A search still
+    running after SEARCH_STALLED_AFTER seconds has lost its tasks and can be
+    retried too.
+    """
     from app.models.search import SearchStatus
 
     search = search_service.get_search(search_id)
     if not search:
         raise HTTPException(status_code=404, detail="Search not found")
 
-    if search.status not in (SearchStatus.FAILED, SearchStatus.COMPLETED):
+    if not search_service.can_retry(search):
         raise HTTPException(
             status_code=400,
-            detail="Can only retry failed or completed searches"
+            detail="Can only retry failed, completed or stalled searches"
         )
 
     # Reset status and re-queue
+    search_service.prepare_retry(search_id, mode)
     search_service.update_search_status(search_id, SearchStatus.PENDING)
-    run_search_task.delay(search_id)
+    run_search_task.apply_async(
+        (search_id,),
+        {"profile": profile, "refresh_serp": mode == RetryMode.FULL},
+        priority=PRIORITY_INTERACTIVE,
+    )
 
     return search_service.get_search(search_id)
 
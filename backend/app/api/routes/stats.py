@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, Query, Request
+
+from app.core.dependencies import get_stats_service
+from app.core.response_cache import response_cache
+from app.services.stats_service import StatsService
+from app.schemas.stats import DashboardStatsResponse
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get("", response_model=DashboardStatsResponse)
+def get_stats(
+    request: Request,
+    days: int = Query(30, ge=1, le=365, description="Days of stores-per-day history"),
+    stats_service: StatsService = Depends(get_stats_service),
+):
+    """Dashboard statistics, served from precomputed aggregates."""
+    return response_cache.serve(
+        request,
+        DashboardStatsResponse,
+        ["stores", "searches"],
+        lambda: stats_service.get_dashboard_stats(days),
+    )
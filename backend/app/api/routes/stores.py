@@ -1,62 +1,122 @@
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 
 from app.core.dependencies import get_store_service
+from app.core.response_cache import response_cache
 from app.services.store_service import StoreService
+from app.services.export_service import ExportService, EXPORT_FORMATS, parquet_available
 from app.schemas.store import (
     StoreCreate,
     StoreUpdate,
     StoreResponse,
     StoreListResponse,
+    FilterOptionsResponse,
+    STORE_LIST_FIELDS,
+    parse_store_fields,
 )
+from app.tasks.celery_app import PRIORITY_INTERACTIVE
 from app.tasks.search_tasks import scrape_store_details
 
 router = APIRouter(prefix="/stores", tags=["stores"])
 
 
-@router.get("", response_model=StoreListResponse)
+# Served pre-encoded from row tuples (not validated): the model documents the shape
+@router.get("", responses={200: {"model": StoreListResponse}})
 def list_stores(
+    request: Request,
     query: Optional[str] = Query(None, description="Search query"),
-    niche: Optional[str] = Query(None, description="Filter by niche"),
-    country: Optional[str] = Query(None, description="Filter by country"),
+    niche: Optional[str] = Query(None, description="Filter by niche (exact value from /stores/filters)"),
+    country: Optional[str] = Query(None, description="Filter by country (exact value from /stores/filters)"),
     has_email: Optional[bool] = Query(None, description="Filter stores with email"),
     has_instagram: Optional[bool] = Query(None, description="Filter stores with Instagram"),
     has_tiktok: Optional[bool] = Query(None, description="Filter stores with TikTok"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated store fields (default: all but description)"
+    ),
     store_service: StoreService = Depends(get_store_service),
 ):
     """List stores with optional filtering."""
-    return store_service.search_stores(
-        query=query,
-        niche=niche,
-        country=country,
-        has_email=has_email,
-        has_instagram=has_instagram,
-        has_tiktok=has_tiktok,
-        page=page,
-        page_size=page_size,
+    try:
+        columns = parse_store_fields(fields, default=STORE_LIST_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return response_cache.serve(
+        request,
+        None,
+        ["stores"],
+        lambda: store_service.search_stores(
+            query=query,
+            niche=niche,
+            country=country,
+            has_email=has_email,
+            has_instagram=has_instagram,
+            has_tiktok=has_tiktok,
+            page=page,
+            page_size=page_size,
+            fields=columns,
+        ),
     )
 
 
-@router.get("/filters")
+@router.get("/filters", response_model=FilterOptionsResponse)
 def get_filter_options(
     store_service: StoreService = Depends(get_store_service),
 ):
-    """Get available filter options (niches, countries)."""
+    """Get available filter options (niches, countries) with store counts."""
     return store_service.get_filter_options()
 
 
+@router.get("/export")
+def export_stores(
+    format: str = Query("csv", pattern="^(csv|ndjson|parquet)$", description="Export format"),
+    query: Optional[str] = Query(None, description="Search query"),
+    niche: Optional[str] = Query(None, description="Filter by niche (exact value from /stores/filters)"),
+    country: Optional[str] = Query(None, description="Filter by country (exact value from /stores/filters)"),
+    has_email: Optional[bool] = Query(None, description="Filter stores with email"),
+    has_instagram: Optional[bool] = Query(None, description="Filter stores with Instagram"),
+    has_tiktok: Optional[bool] = Query(None, description="Filter stores with TikTok"),
+):
+    """
+    Export all matching stores in one streamed response.
+
+    Takes the same filters as the list endpoint, without pagination.
+    """
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+
+    filters = dict(
+        query=query,
+        niche=niche,
+        country=country,
+        has_email=has_email,
+        has_instagram=has_instagram,
+        has_tiktok=has_tiktok,
+    )
+    return StreamingResponse(
+        ExportService().stream(format, filters),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="stores.{format}"'},
+    )
+
+
 @router.get("/{store_id}", response_model=StoreResponse)
 def get_store(
+    request: Request,
     store_id: int,
     store_service: StoreService = Depends(get_store_service),
 ):
     """Get a specific store by ID."""
-    store = store_service.get_store(store_id)
-    if not store:
-        raise HTTPException(status_code=404, detail="Store not found")
-    return store
+    def load_store():
+        store = store_service.get_store(store_id)
+        if not store:
+            raise HTTPException(status_code=404, detail="Store not found")
+        return store
+
+    return response_cache.serve(request, StoreResponse, [f"store:{store_id}"], load_store)
 
 
 @router.post("", response_model=StoreResponse, status_code=201)
@@ -88,6 +148,7 @@ def update_store(
 def rescrape_store(
     store_id: int,
     scrape_social: bool = Query(False, description="Also scrape social media profiles"),
+    profile: bool = Query(False, description="Profile the scrape task (see /profiles)"),
     store_service: StoreService = Depends(get_store_service),
 ):
     """
@@ -99,8 +160,12 @@ def rescrape_store(
     if not store:
         raise HTTPException(status_code=404, detail="Store not found")
 
-    # Queue the scrape task
-    scrape_store_details.delay(store_id, scrape_social=scrape_social)
+    # Queue the scrape task, ahead of searches' batch scraping
+    scrape_store_details.apply_async(
+        (store_id,),
+        {"scrape_social": scrape_social, "profile": profile},
+        priority=PRIORITY_INTERACTIVE,
+    )
 
     return {"message": "Rescrape queued", "store_id": store_id}
 
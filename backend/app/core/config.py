@@ -13,6 +13,7 @@ class Settings(BaseSettings):
 
     # Redis
     redis_url: str = "redis://localhost:6379/0"
+    redis_socket_timeout: float = 1.0
 
     # Celery
     celery_broker_url: str = "redis://localhost:6379/0"
@@ -23,16 +24,77 @@ class Settings(BaseSettings):
     scrape_delay_max: float = 3.0
     max_concurrent_scrapes: int = 5
     max_results_per_search: int = 50
+    # Searches fan out across workers: a discovery task, scrape tasks of this
+    # many new URLs each, then a finalizer. 0 runs a search in a single task
+    search_chunk_size: int = 10
+    # A search RUNNING for longer than this (seconds) is taken to have lost
+    # its tasks, and can be retried. Keep it above a search's longest run:
+    # every chunk attempt hitting its 960s time limit
+    search_stalled_after: int = 3600
 
     # SerpAPI (optional - for more reliable Google searches)
     serpapi_key: Optional[str] = None
+    # Override to point at a stand-in (e.g. the pipeline benchmark's fake SERP)
+    serpapi_base_url: str = "https://serpapi.com"
 
     # Proxy settings (optional - comma-separated list)
     proxy_list: Optional[str] = None
 
+    # Bulk exports written by the export task / CLI
+    export_dir: str = "exports"
+
     # API settings
     api_prefix: str = "/api/v1"
 
+    # Pagination totals: exact COUNT up to the threshold, estimated/cached above
+    count_exact_threshold: int = 10000
+    count_cache_ttl: int = 30
+
+    # Redis response cache for read-heavy GET endpoints
+    response_cache_enabled: bool = True
+    response_cache_ttl: int = 60
+
+    # SERP URL lists cached per normalized query (0 disables), and how long
+    # one fetch holds the lock identical searches wait on
+    serp_cache_ttl: int = 86400
+    serp_cache_lock_timeout: int = 300
+
+    # API rate limiting. Limits are "N/unit" (second, minute, hour, day),
+    # comma-separated; all must pass
+    rate_limit_enabled: bool = True
+    rate_limit_backend: str = "redis"  # "redis" (shared by workers) or "memory"
+    rate_limit_default: str = "60/minute,1000/hour"
+    # Overrides keyed by "[METHOD ]path prefix"; matching requests are
+    # counted in their own bucket instead of the default one
+    rate_limit_routes: dict[str, str] = {
+        "POST /api/v1/searches": "10/minute,100/hour",
+        "GET /api/v1/stores/export": "5/minute",
+    }
+    # In-memory backend (and Redis fallback): max clients tracked per worker
+    rate_limit_memory_max_clients: int = 10000
+
+    # Health checks run in the background on each API worker; endpoints serve
+    # the latest sample. Celery is sampled less often (it broadcasts to workers)
+    health_check_interval: float = 10.0
+    health_check_celery_interval: float = 30.0
+    health_check_timeout: float = 5.0
+
+    # Add an X-DB-Queries header (SQL statements per request) to responses,
+    # for load tests (benchmarks/api_load.py)
+    query_count_header: bool = False
+
+    # Prometheus metrics port on each Celery worker (0 disables). The API
+    # serves its metrics on /metrics
+    worker_metrics_port: int = 9191
+
+    # Task profiling (cProfile + event loop lag). Enabled per task with the
+    # profile kwarg, or for every profiled task type with PROFILE_TASKS.
+    # The directory must be shared with the API to list/download artifacts
+    profile_tasks: bool = False
+    profiling_dir: str = "/tmp/leadgen-profiles"
+    profiling_lag_interval: float = 0.1
+    profiling_max_artifacts: int = 50
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -6,6 +6,7 @@ from app.repositories.store_repository import StoreRepository
 from app.repositories.search_repository import SearchRepository
 from app.services.store_service import StoreService
 from app.services.search_service import SearchService
+from app.services.stats_service import StatsService
 
 
 def get_store_repository(db: Session = Depends(get_db)) -> StoreRepository:
@@ -27,3 +28,10 @@ def get_search_service(
     store_repo: StoreRepository = Depends(get_store_repository),
 ) -> SearchService:
     return SearchService(search_repo, store_repo)
+
+
+def get_stats_service(
+    store_repo: StoreRepository = Depends(get_store_repository),
+    search_repo: SearchRepository = Depends(get_search_repository),
+) -> StatsService:
+    return StatsService(store_repo, search_repo)
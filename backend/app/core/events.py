@@ -0,0 +1,215 @@
+"""
+Redis pub/sub event bus between Celery workers and API workers.
+
+Celery tasks publish search events; every API worker subscribes and fans
+them out to its own WebSocket connections, so clients get updates no matter
+which process ran the task or holds their socket.
+"""
+
+import asyncio
+import json
+import time
+from typing import Any
+
+import redis
+
+from app.core.redis import get_async_redis, get_redis
+from app.core.serialization import dumps
+
+EVENTS_CHANNEL = "events:searches"
+# Per-search event sequence numbers, so clients can detect gaps
+SEQ_KEY = "events:seq:{search_id}"
+SEQ_TTL = 7 * 24 * 3600
+
+
+def search_update_event(
+    search_id: int,
+    status: str,
+    stores_found: int = 0,
+    error: str | None = None,
+) -> dict[str, Any]:
+    event = {
+        "type": "search_update",
+        "search_id": search_id,
+        "status": status,
+        "stores_found": stores_found,
+    }
+    if error:
+        event["error"] = error
+    return event
+
+
+def search_progress_event(
+    search_id: int,
+    stores_found: int,
+    stores: list[dict],
+) -> dict[str, Any]:
+    return {
+        "type": "search_progress",
+        "search_id": search_id,
+        "stores_found": stores_found,
+        "stores": stores,
+    }
+
+
+def publish_event(event: dict[str, Any]) -> None:
+    """Publish an event to all API workers (best effort, from sync code)."""
+    try:
+        get_redis().publish(EVENTS_CHANNEL, dumps(event))
+    except redis.RedisError:
+        pass
+
+
+# Stamp an event with the search's next sequence number and publish it, in one
+# step so events go out in seq order. KEYS: seq key; ARGV: event JSON (an
+# object), seq TTL, channel. The seq is spliced in as the first field.
+_PUBLISH_SEQ_SCRIPT = """
+local seq = redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+redis.call('PUBLISH', ARGV[3], '{"seq":' .. seq .. ',' .. string.sub(ARGV[1], 2))
+return seq
+"""
+
+
+def publish_search_event(search_id: int, event: dict[str, Any]) -> None:
+    """Stamp a search event with the search's next sequence number and publish it."""
+    try:
+        event["seq"] = get_redis().eval(
+            _PUBLISH_SEQ_SCRIPT,
+            1,
+            SEQ_KEY.format(search_id=search_id),
+            dumps(event),
+            SEQ_TTL,
+            EVENTS_CHANNEL,
+        )
+    except redis.RedisError:
+        pass
+
+
+def current_seq(search_id: int) -> int:
+    """Sequence number of the last event published for a search (0 if none)."""
+    try:
+        return int(get_redis().get(SEQ_KEY.format(search_id=search_id)) or 0)
+    except redis.RedisError:
+        return 0
+
+
+def notify_search_update(
+    search_id: int,
+    status: str,
+    stores_found: int = 0,
+    error: str | None = None,
+) -> None:
+    """Publish a search status update."""
+    publish_search_event(search_id, search_update_event(search_id, status, stores_found, error))
+
+
+class SearchProgress:
+    """
+    Coalesces stores found by one search into periodic progress events.
+
+    Stores are buffered and published as one search_progress delta every
+    `interval` seconds or `max_batch` stores, whichever comes first. On an
+    event loop a timer flushes a partial batch once the interval is up, even
+    while the next page is still loading; from sync code nothing runs in the
+    background, so a partial batch waits for the next tick() or store_found().
+    Call flush() before publishing a status change so deltas stay ordered
+    before it. Not thread-safe: once used on an event loop, call it only
+    from that loop (flush at the end of the coroutine, not after run_async).
+    """
+
+    def __init__(
+        self,
+        search_id: int,
+        stores_found: int = 0,
+        interval: float = 0.5,
+        max_batch: int = 50,
+    ):
+        self.search_id = search_id
+        self.stores_found = stores_found
+        self.interval = interval
+        self.max_batch = max_batch
+        self._pending: list[dict] = []
+        self._last_flush = time.monotonic()
+        self._timer: asyncio.TimerHandle | None = None
+
+    def store_found(self, store_data: dict, stores_found: int | None = None) -> None:
+        """Buffer a found store; pass the search's total when other tasks add to it too."""
+        self._pending.append(store_data)
+        self.stores_found = stores_found if stores_found is not None else self.stores_found + 1
+        if len(self._pending) >= self.max_batch:
+            self.flush()
+        else:
+            self.tick()
+            if self._pending:
+                self._schedule_flush()
+
+    def tick(self) -> None:
+        """Flush if the interval has passed since the last flush."""
+        if self._pending and time.monotonic() - self._last_flush >= self.interval:
+            self.flush()
+
+    def _schedule_flush(self) -> None:
+        if self._timer is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        delay = max(0.0, self.interval - (time.monotonic() - self._last_flush))
+        self._timer = loop.call_later(delay, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self.tick()
+
+    def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        stores, self._pending = self._pending, []
+        publish_search_event(
+            self.search_id,
+            search_progress_event(self.search_id, self.stores_found, stores),
+        )
+
+
+class EventSubscriber:
+    """Relays bus events to this worker's WebSocket connections."""
+
+    POLL_TIMEOUT = 1.0
+    RECONNECT_DELAY_MAX = 30.0
+
+    def __init__(self, manager):
+        self.manager = manager
+
+    async def run(self) -> None:
+        """Subscribe and relay until cancelled, reconnecting with backoff."""
+        delay = 1.0
+        while True:
+            try:
+                pubsub = get_async_redis().pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(EVENTS_CHANNEL)
+                try:
+                    delay = 1.0
+                    while True:
+                        # Polled with a timeout: a blocking listen() would hit
+                        # the client's socket timeout whenever the bus is idle
+                        message = await pubsub.get_message(timeout=self.POLL_TIMEOUT)
+                        if message is not None:
+                            self._relay(message["data"])
+                finally:
+                    await pubsub.aclose()
+            except redis.RedisError:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.RECONNECT_DELAY_MAX)
+
+    def _relay(self, data: str) -> None:
+        try:
+            event = json.loads(data)
+        except ValueError:
+            return
+        self.manager.dispatch(event)
@@ -1,23 +1,31 @@
 """Health check utilities for monitoring system status."""
 
+import asyncio
+import os
+import platform
+import time
 from datetime import datetime
-from typing import Any
+from functools import lru_cache
+from typing import Any, Callable
+
 from sqlalchemy import text
-from sqlalchemy.orm import Session
-import redis
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import get_settings
-
-settings = get_settings()
+from app.core.redis import get_redis
+from app.db.database import engine
 
 
-async def check_database(db: Session) -> dict[str, Any]:
-    """Check database connectivity."""
+def check_database() -> dict[str, Any]:
+    """Check database connectivity with a pooled connection (blocking)."""
     try:
-        db.execute(text("SELECT 1"))
+        with engine.connect() as conn:
+            start = time.perf_counter()
+            conn.execute(text("SELECT 1"))
+            latency = (time.perf_counter() - start) * 1000
         return {
             "status": "healthy",
-            "latency_ms": 0,
+            "latency_ms": round(latency, 2),
         }
     except Exception as e:
         return {
@@ -26,13 +34,13 @@ async def check_database(db: Session) -> dict[str, Any]:
         }
 
 
-async def check_redis() -> dict[str, Any]:
-    """Check Redis connectivity."""
+def check_redis() -> dict[str, Any]:
+    """Check Redis connectivity with the shared client (blocking)."""
     try:
-        r = redis.from_url(settings.redis_url)
-        start = datetime.now()
+        r = get_redis()
+        start = time.perf_counter()
         r.ping()
-        latency = (datetime.now() - start).total_seconds() * 1000
+        latency = (time.perf_counter() - start) * 1000
         info = r.info()
         return {
             "status": "healthy",
@@ -48,28 +56,19 @@ async def check_redis() -> dict[str, Any]:
         }
 
 
-async def check_celery() -> dict[str, Any]:
-    """Check Celery worker status."""
+def check_celery() -> dict[str, Any]:
+    """Check Celery worker status (blocking: broadcasts and waits for replies)."""
     try:
         from app.tasks.celery_app import celery_app
 
-        # Inspect active workers
-        inspect = celery_app.control.inspect(timeout=2.0)
-
-        stats = inspect.stats()
-        if stats:
-            worker_count = len(stats)
-            worker_names = list(stats.keys())
-
-            # Get active tasks
-            active = inspect.active() or {}
-            active_tasks = sum(len(tasks) for tasks in active.values())
-
+        # One broadcast: every live worker replies with its active tasks
+        active = celery_app.control.inspect(timeout=2.0).active()
+        if active:
             return {
                 "status": "healthy",
-                "workers": worker_count,
-                "worker_names": worker_names,
-                "active_tasks": active_tasks,
+                "workers": len(active),
+                "worker_names": list(active.keys()),
+                "active_tasks": sum(len(tasks) for tasks in active.values()),
             }
         else:
             return {
@@ -84,11 +83,9 @@ async def check_celery() -> dict[str, Any]:
         }
 
 
+@lru_cache
 def get_system_info() -> dict[str, Any]:
     """Get basic system information."""
-    import platform
-    import os
-
     return {
         "python_version": platform.python_version(),
         "platform": platform.system(),
@@ -97,38 +94,109 @@ def get_system_info() -> dict[str, Any]:
     }
 
 
-async def get_full_health_status(db: Session) -> dict[str, Any]:
-    """Get comprehensive health status of all components."""
-    db_status = await check_database(db)
-    redis_status = await check_redis()
-    celery_status = await check_celery()
-
-    # Determine overall status
-    all_healthy = all(
-        status.get("status") == "healthy"
-        for status in [db_status, redis_status, celery_status]
-    )
+class HealthMonitor:
+    """
+    Samples component health in the background and serves the latest results.
+
+    Each component is checked on its own interval in a worker thread, so a
+    slow dependency never blocks the event loop or delays the other checks,
+    and health endpoints only read memory. A check that exceeds the timeout
+    is reported unhealthy; it isn't restarted until the stuck call returns,
+    so a hung dependency ties up at most one thread per component.
+    """
+
+    def __init__(
+        self,
+        checks: dict[str, tuple[Callable[[], dict[str, Any]], float]],
+        timeout: float = 5.0,
+    ):
+        self.checks = checks
+        self.timeout = timeout
+        self._results: dict[str, dict[str, Any]] = {}
+        self._checked_at: dict[str, float] = {}
+
+    @classmethod
+    def from_settings(cls) -> "HealthMonitor":
+        settings = get_settings()
+        return cls(
+            {
+                "database": (check_database, settings.health_check_interval),
+                "redis": (check_redis, settings.health_check_interval),
+                "celery": (check_celery, settings.health_check_celery_interval),
+            },
+            timeout=settings.health_check_timeout,
+        )
+
+    async def run(self) -> None:
+        """Sample every component until cancelled."""
+        await asyncio.gather(*(
+            self._sample(name, check, interval)
+            for name, (check, interval) in self.checks.items()
+        ))
+
+    async def _sample(self, name: str, check: Callable, interval: float) -> None:
+        pending: asyncio.Future | None = None
+        try:
+            while True:
+                if pending is None:
+                    pending = asyncio.ensure_future(run_in_threadpool(check))
+                done, _ = await asyncio.wait({pending}, timeout=self.timeout)
+                if done:
+                    self._record(name, pending.result())
+                    pending = None
+                else:
+                    self._record(name, {
+                        "status": "unhealthy",
+                        "error": f"Check timed out after {self.timeout:g}s",
+                    })
+                await asyncio.sleep(interval)
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    def _record(self, name: str, result: dict[str, Any]) -> None:
+        self._results[name] = result
+        self._checked_at[name] = time.time()
+
+    def get(self, name: str) -> dict[str, Any]:
+        """Latest result for a component, with when it was taken."""
+        if name not in self._results:
+            return {"status": "unknown", "message": "Not checked yet"}
+
+        checked_at = self._checked_at[name]
+        age = time.time() - checked_at
+        result = {
+            **self._results[name],
+            "checked_at": datetime.utcfromtimestamp(checked_at).isoformat(),
+            "age_seconds": round(age, 1),
+        }
+        # Several missed samples: the sampler itself is stuck or stopped
+        _, interval = self.checks[name]
+        if age > 3 * interval + self.timeout:
+            result["stale"] = True
+        return result
+
+    def get_full_status(self) -> dict[str, Any]:
+        """Get comprehensive health status of all components."""
+        components = {name: self.get(name) for name in self.checks}
+        statuses = [status.get("status") for status in components.values()]
+
+        # Determine overall status
+        if all(status == "healthy" for status in statuses):
+            overall_status = "healthy"
+        elif "unhealthy" in statuses:
+            overall_status = "unhealthy"
+        else:
+            overall_status = "degraded"
 
-    any_unhealthy = any(
-        status.get("status") == "unhealthy"
-        for status in [db_status, redis_status, celery_status]
-    )
+        return {
+            "status": overall_status,
+            "timestamp": datetime.utcnow().isoformat(),
+            "version": "1.0.0",
+            "components": components,
+            "system": get_system_info(),
+        }
 
-    if all_healthy:
-        overall_status = "healthy"
-    elif any_unhealthy:
-        overall_status = "unhealthy"
-    else:
-        overall_status = "degraded"
 
-    return {
-        "status": overall_status,
-        "timestamp": datetime.utcnow().isoformat(),
-        "version": "1.0.0",
-        "components": {
-            "database": db_status,
-            "redis": redis_status,
-            "celery": celery_status,
-        },
-        "system": get_system_info(),
-    }
+# Global health monitor for this worker
+health_monitor = HealthMonitor.from_settings()
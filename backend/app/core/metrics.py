@@ -0,0 +1,156 @@
+"""Per-route request timing, recorded by a pure ASGI middleware."""
+
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.prometheus import HTTP_REQUEST_SECONDS
+from app.db.database import engine as db_engine
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class RequestMetrics:
+    """Request counts, status classes and latency histograms per route, for this worker."""
+
+    def __init__(self):
+        self._routes: dict[str, dict[str, Any]] = defaultdict(self._empty)
+
+    @staticmethod
+    def _empty() -> dict[str, Any]:
+        return {
+            "count": 0,
+            "status": defaultdict(int),
+            "total_seconds": 0.0,
+            "max_seconds": 0.0,
+            "buckets": [0] * (len(LATENCY_BUCKETS) + 1),
+        }
+
+    def observe(self, route: str, method: str, status: int, seconds: float) -> None:
+        stats = self._routes[f"{method} {route}"]
+        stats["count"] += 1
+        stats["status"][f"{status // 100}xx"] += 1
+        stats["total_seconds"] += seconds
+        stats["max_seconds"] = max(stats["max_seconds"], seconds)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                stats["buckets"][i] += 1
+                break
+        else:
+            stats["buckets"][-1] += 1
+
+    def get_stats(self) -> dict[str, Any]:
+        """Counts, mean/max and approximate percentiles (bucket upper bounds) in ms."""
+        routes = {}
+        for name, stats in self._routes.items():
+            count = stats["count"]
+            routes[name] = {
+                "count": count,
+                "status": dict(stats["status"]),
+                "mean_ms": round(stats["total_seconds"] / count * 1000, 2),
+                "max_ms": round(stats["max_seconds"] * 1000, 2),
+                "p50_ms": self._percentile(stats["buckets"], count, 0.50),
+                "p95_ms": self._percentile(stats["buckets"], count, 0.95),
+                "p99_ms": self._percentile(stats["buckets"], count, 0.99),
+            }
+        return {"routes": routes}
+
+    @staticmethod
+    def _percentile(buckets: list[int], count: int, q: float) -> float | None:
+        seen = 0
+        for bound, n in zip(LATENCY_BUCKETS, buckets):
+            seen += n
+            if seen >= q * count:
+                return bound * 1000
+        return None  # Above the largest bucket
+
+
+class MetricsMiddleware:
+    """
+    Time HTTP requests and record them per route template.
+
+    Adds an X-Process-Time header (ms to response start). Duration is
+    recorded when the response body finishes, so streaming responses are
+    measured in full, both here and in the Prometheus histogram. Non-HTTP
+    scopes pass straight through.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: "RequestMetrics | None" = None):
+        self.app = app
+        self.metrics = metrics or request_metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                MutableHeaders(scope=message)["X-Process-Time"] = f"{elapsed_ms:.2f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            # Template path set by the router, so ids don't explode cardinality
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            elapsed = time.perf_counter() - start
+            self.metrics.observe(route, scope["method"], status, elapsed)
+            HTTP_REQUEST_SECONDS.labels(scope["method"], route, f"{status // 100}xx").observe(elapsed)
+
+
+# Global request metrics for this worker
+request_metrics = RequestMetrics()
+
+# Statement count of the request being handled (a list, so the copy of the
+# context that sync endpoints run in updates the same counter)
+_request_queries: ContextVar[list[int] | None] = ContextVar("request_queries", default=None)
+
+
+def _count_query(*args) -> None:
+    counter = _request_queries.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+class QueryCountMiddleware:
+    """
+    Add an X-DB-Queries header: SQL statements the request ran before its
+    response started (0 for response cache hits). Enabled with
+    QUERY_COUNT_HEADER, for load tests and debugging.
+    """
+
+    def __init__(self, app: ASGIApp, engine: Engine | None = None):
+        self.app = app
+        event.listen(engine or db_engine, "before_cursor_execute", _count_query)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        counter = [0]
+        token = _request_queries.set(counter)
+
+        async def send_with_count(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-DB-Queries"] = str(counter[0])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_count)
+        finally:
+            _request_queries.reset(token)
@@ -0,0 +1,204 @@
+"""
+Opt-in profiling of Celery tasks.
+
+A profiled task runs under cProfile (in the task thread, and on the worker
+loop thread while its coroutine runs) while a coroutine samples event loop
+lag (how late a short sleep wakes up, i.e. how long the loop was blocked).
+Artifacts are written to the profiling directory, keyed by task id:
+{task_id}.prof (pstats, for snakeviz / python -m pstats) and
+{task_id}.json (task metadata and loop lag samples).
+"""
+
+import asyncio
+import cProfile
+import json
+import math
+import os
+import pstats
+import re
+import time
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Any, Awaitable, Optional, TypeVar
+
+from app.core.config import get_settings
+
+T = TypeVar("T")
+
+# Celery task ids are UUIDs; anything else never names an artifact
+_TASK_ID_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,127}$")
+# Cap on stored lag samples (the summary covers all of them)
+MAX_LAG_SAMPLES = 10000
+
+
+class TaskProfile:
+    """Profile one task run; use as a context manager around the task body."""
+
+    def __init__(
+        self,
+        task_id: str,
+        task_name: str,
+        directory: str,
+        lag_interval: float = 0.1,
+        max_artifacts: int = 50,
+        task_args: Optional[dict[str, Any]] = None,
+    ):
+        self.task_id = task_id
+        self.task_name = task_name
+        self.directory = directory
+        self.lag_interval = lag_interval
+        self.max_artifacts = max_artifacts
+        self.task_args = task_args or {}
+        self.lag_samples: list[float] = []
+        self._profiler = cProfile.Profile()
+        # Profiles of coroutines run on the worker loop thread (see watch)
+        self._loop_profilers: list[cProfile.Profile] = []
+        self._started_at: Optional[datetime] = None
+        self._start = 0.0
+
+    def __enter__(self) -> "TaskProfile":
+        self._started_at = datetime.utcnow()
+        self._start = time.perf_counter()
+        self._profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._profiler.disable()
+        self._save(time.perf_counter() - self._start, exc)
+
+    async def watch(self, awaitable: Awaitable[T]) -> T:
+        """Await `awaitable` while sampling loop lag and profiling the loop thread."""
+        profiler = cProfile.Profile()
+        self._loop_profilers.append(profiler)
+        sampler = asyncio.create_task(self._sample_lag())
+        profiler.enable()
+        try:
+            return await awaitable
+        finally:
+            profiler.disable()
+            sampler.cancel()
+
+    async def _sample_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.lag_interval)
+            self.lag_samples.append(max(0.0, loop.time() - start - self.lag_interval))
+
+    def _save(self, duration: float, exc: Optional[BaseException]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        stats = pstats.Stats(self._profiler)
+        for profiler in self._loop_profilers:
+            stats.add(profiler)
+        stats.dump_stats(os.path.join(self.directory, f"{self.task_id}.prof"))
+
+        metadata = {
+            "task_id": self.task_id,
+            "task_name": self.task_name,
+            "task_args": self.task_args,
+            "started_at": self._started_at.isoformat() if self._started_at else None,
+            "duration_seconds": round(duration, 3),
+            "error": repr(exc) if exc else None,
+            "loop_lag": _lag_summary(self.lag_samples, self.lag_interval),
+            "loop_lag_samples_ms": [
+                round(s * 1000, 2) for s in self.lag_samples[-MAX_LAG_SAMPLES:]
+            ],
+        }
+        with open(os.path.join(self.directory, f"{self.task_id}.json"), "w") as f:
+            json.dump(metadata, f)
+
+        ProfileStore(self.directory).prune(self.max_artifacts)
+
+
+def _lag_summary(samples: list[float], interval: float) -> dict[str, Any]:
+    ordered = sorted(samples)
+
+    def percentile(q: float) -> Optional[float]:
+        if not ordered:
+            return None
+        return round(ordered[max(0, math.ceil(q * len(ordered)) - 1)] * 1000, 2)
+
+    return {
+        "interval_ms": interval * 1000,
+        "samples": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2) if ordered else None,
+        "p95_ms": percentile(0.95),
+        "max_ms": percentile(1.0),
+    }
+
+
+def task_profile(task, task_args: Optional[dict[str, Any]] = None, enabled: bool = False):
+    """
+    Context manager profiling a bound Celery task, or a no-op.
+
+    Profiles when `enabled` (the task's profile kwarg) or PROFILE_TASKS is
+    set; yields the TaskProfile, or None when not profiling.
+    """
+    settings = get_settings()
+    if not (enabled or settings.profile_tasks):
+        return nullcontext()
+    return TaskProfile(
+        task_id=task.request.id or f"local-{int(time.time() * 1000)}",
+        task_name=task.name,
+        directory=settings.profiling_dir,
+        lag_interval=settings.profiling_lag_interval,
+        max_artifacts=settings.profiling_max_artifacts,
+        task_args=task_args,
+    )
+
+
+class ProfileStore:
+    """Read access to stored profiling artifacts."""
+
+    KINDS = {"prof": "application/octet-stream", "json": "application/json"}
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or get_settings().profiling_dir
+
+    def list_profiles(self) -> list[dict[str, Any]]:
+        """Metadata of stored profiles, newest first (without lag samples)."""
+        profiles = []
+        for name in self._metadata_files():
+            metadata = self._read(os.path.join(self.directory, name))
+            if metadata:
+                metadata.pop("loop_lag_samples_ms", None)
+                profiles.append(metadata)
+        return profiles
+
+    def get(self, task_id: str) -> Optional[dict[str, Any]]:
+        path = self.path(task_id, "json")
+        return self._read(path) if path else None
+
+    def path(self, task_id: str, kind: str) -> Optional[str]:
+        """Path of an existing artifact, or None (also for invalid ids)."""
+        if kind not in self.KINDS or not _TASK_ID_RE.match(task_id):
+            return None
+        path = os.path.join(self.directory, f"{task_id}.{kind}")
+        return path if os.path.isfile(path) else None
+
+    def prune(self, keep: int) -> None:
+        """Delete all but the newest `keep` profiles."""
+        for name in self._metadata_files()[keep:]:
+            task_id = name.removesuffix(".json")
+            for kind in self.KINDS:
+                try:
+                    os.remove(os.path.join(self.directory, f"{task_id}.{kind}"))
+                except FileNotFoundError:
+                    pass
+
+    def _metadata_files(self) -> list[str]:
+        """Profile metadata file names, newest first."""
+        try:
+            entries = [e for e in os.scandir(self.directory) if e.name.endswith(".json")]
+        except FileNotFoundError:
+            return []
+        entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+        return [e.name for e in entries]
+
+    @staticmethod
+    def _read(path: str) -> Optional[dict[str, Any]]:
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
@@ -0,0 +1,105 @@
+"""
+Prometheus metrics for the API and the scrape pipeline.
+
+Metrics live in the default registry of each process. With several
+processes (uvicorn --workers, Celery prefork), set PROMETHEUS_MULTIPROC_DIR
+to an empty directory per service before startup: each process then writes
+its samples there and render_metrics() aggregates them on scrape.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+# Buckets for operations that take seconds (page loads, scrapes, tasks)
+SLOW_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "leadgen_http_request_duration_seconds",
+    "API request latency by route template",
+    ["method", "route", "status"],
+)
+
+SEARCH_STAGE_SECONDS = Histogram(
+    "leadgen_search_stage_duration_seconds",
+    "Time spent per pipeline stage (serp, navigate, detect, extract, db_write)",
+    ["stage"],
+    buckets=SLOW_BUCKETS,
+)
+
+SCRAPES = Counter(
+    "leadgen_scrapes_total",
+    "Scraper calls by outcome (success, error, timeout, not_shopify)",
+    ["scraper", "outcome"],
+)
+
+SCRAPE_SECONDS = Histogram(
+    "leadgen_scrape_duration_seconds",
+    "Scraper call duration",
+    ["scraper"],
+    buckets=SLOW_BUCKETS,
+)
+
+BROWSER_LAUNCHES = Counter(
+    "leadgen_browser_launches_total",
+    "Chromium launches by scraper",
+    ["scraper"],
+)
+
+PROXY_REQUESTS = Counter(
+    "leadgen_proxy_requests_total",
+    "Proxy rotation outcomes (assigned, exhausted, failed)",
+    ["outcome"],
+)
+
+SERP_CACHE = Counter(
+    "leadgen_serp_cache_total",
+    "SERP lookups by source (hit, coalesced, miss, bypass)",
+    ["outcome"],
+)
+
+CELERY_TASK_SECONDS = Histogram(
+    "leadgen_celery_task_duration_seconds",
+    "Celery task run time by final state",
+    ["task", "state"],
+    buckets=SLOW_BUCKETS,
+)
+
+
+@contextmanager
+def observe_stage(stage: str) -> Iterator[None]:
+    """Time a block as one pipeline stage, whether or not it raises."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        SEARCH_STAGE_SECONDS.labels(stage).observe(time.perf_counter() - start)
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def metrics_registry() -> CollectorRegistry:
+    """Registry to expose: all processes' samples in multiprocess mode, else this one's."""
+    if not multiprocess_enabled():
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Current metrics in the Prometheus text format, with its content type."""
+    return generate_latest(metrics_registry()), CONTENT_TYPE_LATEST
@@ -1,118 +1,341 @@
+import math
 import time
-from collections import defaultdict
-from typing import Dict, Tuple
-from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import islice
+from typing import Optional, Sequence
+
+import redis
+from starlette.datastructures import MutableHeaders
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core.config import Settings, get_settings
+from app.core.redis import get_async_redis
 
-class RateLimiter:
-    """Simple in-memory rate limiter using sliding window."""
-
-    def __init__(self, requests_per_minute: int = 60, requests_per_hour: int = 1000):
-        self.requests_per_minute = requests_per_minute
-        self.requests_per_hour = requests_per_hour
-        # Dict of client_id -> list of (timestamp, count) for minute window
-        self._minute_requests: Dict[str, list] = defaultdict(list)
-        # Dict of client_id -> list of (timestamp, count) for hour window
-        self._hour_requests: Dict[str, list] = defaultdict(list)
-
-    def _clean_old_requests(self, requests: list, window_seconds: int) -> list:
-        """Remove requests outside the time window."""
-        cutoff = time.time() - window_seconds
-        return [r for r in requests if r > cutoff]
-
-    def is_allowed(self, client_id: str) -> Tuple[bool, dict]:
-        """
-        Check if a request from client_id is allowed.
-
-        Returns:
-            Tuple of (is_allowed, rate_limit_info)
-        """
-        now = time.time()
-
-        # Clean and count minute requests
-        self._minute_requests[client_id] = self._clean_old_requests(
-            self._minute_requests[client_id], 60
-        )
-        minute_count = len(self._minute_requests[client_id])
+_UNITS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """At most `limit` requests per `period` seconds."""
+
+    limit: int
+    period: int
+
+    @property
+    def interval(self) -> float:
+        """Seconds between requests at the sustained rate."""
+        return self.period / self.limit
+
+    @property
+    def name(self) -> str:
+        """Identifies the limit in state keys ("10/60"): two limits may share a period."""
+        return f"{self.limit}/{self.period}"
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of a request against the most constrained of its limits."""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    # Seconds until the bucket is full again
+    reset_after: float
+    # Seconds until the next request would be allowed (0 when allowed)
+    retry_after: float = 0.0
+
+
+def parse_limits(value: str) -> list[RateLimit]:
+    """Parse "60/minute,1000/hour" into RateLimits."""
+    limits = []
+    for part in value.split(","):
+        if not part.strip():
+            continue
+        count, _, unit = part.strip().partition("/")
+        unit = unit.strip().lower().rstrip("s")
+        if unit not in _UNITS:
+            raise ValueError(f"Unknown rate limit unit in {part!r}")
+        limits.append(RateLimit(int(count), _UNITS[unit]))
+    return limits
+
+
+def _gcra(
+    now: float,
+    tats: Sequence[Optional[float]],
+    limits: Sequence[RateLimit],
+) -> tuple[RateLimitResult, list[float]]:
+    """
+    Generic cell rate algorithm over several limits at once.
+
+    Each limit keeps a single "theoretical arrival time" (TAT) per client, so
+    state is O(1) regardless of request volume. A request is allowed only if
+    every limit allows it; returns the result and the new TATs to store.
+    """
+    new_tats = []
+    results = []
+    for tat, rate in zip(tats, limits):
+        tat = max(tat or now, now)
+        new_tat = tat + rate.interval
+        allow_at = new_tat - rate.period
+        new_tats.append(new_tat)
+        results.append(RateLimitResult(
+            allowed=allow_at <= now,
+            limit=rate.limit,
+            remaining=max(0, math.floor((now - allow_at) / rate.interval + 1e-6)),
+            reset_after=new_tat - now,
+            retry_after=max(0.0, allow_at - now),
+        ))
+
+    allowed = all(r.allowed for r in results)
+    tightest = min(results, key=lambda r: (r.allowed, r.remaining))
+    if not allowed:
+        # Nothing is recorded for rejected requests
+        tightest.remaining = 0
+        tightest.reset_after -= limits[results.index(tightest)].interval
+        tightest.retry_after = max(r.retry_after for r in results)
+    else:
+        tightest.retry_after = 0.0
+    return tightest, new_tats
+
+
+class RateLimitBackend(ABC):
+    """Storage for per-client rate limit state."""
+
+    @abstractmethod
+    async def hit(self, key: str, limits: Sequence[RateLimit]) -> RateLimitResult:
+        """Record a request for `key` if all `limits` allow it."""
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    Per-process GCRA state with bounded memory.
+
+    Keys are kept in least-recently-used order. Keys whose buckets have fully
+    drained carry no information and are evicted; each request looks for them
+    among the EVICT_SCAN least recently used keys, so a drained key behind
+    that many still-filling ones waits. Past `max_keys`, the least recently
+    used key is dropped even if it hasn't drained.
+    """
+
+    EVICT_SCAN = 32
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._tats: OrderedDict[tuple[str, str], float] = OrderedDict()
+
+    async def hit(self, key: str, limits: Sequence[RateLimit]) -> RateLimitResult:
+        now = time.monotonic()
+        self._evict(now)
 
-        # Clean and count hour requests
-        self._hour_requests[client_id] = self._clean_old_requests(
-            self._hour_requests[client_id], 3600
+        keys = [(key, rate.name) for rate in limits]
+        result, new_tats = _gcra(now, [self._tats.get(k) for k in keys], limits)
+        if result.allowed:
+            for k, tat in zip(keys, new_tats):
+                self._tats[k] = tat
+                self._tats.move_to_end(k)
+        return result
+
+    def _evict(self, now: float) -> None:
+        while len(self._tats) > self.max_keys:
+            self._tats.popitem(last=False)
+        drained = [k for k, tat in islice(self._tats.items(), self.EVICT_SCAN) if tat <= now]
+        for k in drained:
+            del self._tats[k]
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+
+# GCRA over all limits in one round trip, using Redis server time so every
+# worker shares one clock. KEYS: one per limit; ARGV: interval, period pairs.
+# Returns {allowed, tightest limit index, remaining, reset_after, retry_after}.
+_GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local allowed = 1
+local retry_after = 0
+local new_tats = {}
+local best, best_allowed, best_remaining, best_reset = 1, 2, math.huge, 0
+
+for i = 1, #KEYS do
+    local interval = tonumber(ARGV[2 * i - 1])
+    local period = tonumber(ARGV[2 * i])
+    local tat = tonumber(redis.call('GET', KEYS[i])) or now
+    if tat < now then tat = now end
+    local new_tat = tat + interval
+    local allow_at = new_tat - period
+    local ok = 1
+    if allow_at > now then
+        ok = 0
+        allowed = 0
+        retry_after = math.max(retry_after, allow_at - now)
+    end
+    local remaining = math.max(0, math.floor((now - allow_at) / interval + 1e-6))
+    if ok < best_allowed or (ok == best_allowed and remaining < best_remaining) then
+        best, best_allowed, best_remaining = i, ok, remaining
+        best_reset = new_tat - now
+        if ok == 0 then best_reset = tat - now end
+    end
+    new_tats[i] = new_tat
+end
+
+if allowed == 1 then
+    for i = 1, #KEYS do
+        redis.call('SET', KEYS[i], tostring(new_tats[i]),
+            'PX', math.ceil((new_tats[i] - now) * 1000))
+    end
+else
+    best_remaining = 0
+end
+
+return {allowed, best, best_remaining, tostring(best_reset), tostring(retry_after)}
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    GCRA state in Redis, shared by all workers.
+
+    Each client/limit pair is one key holding a timestamp, expiring once the
+    bucket drains. The check-and-update runs atomically in a Lua script.
+    Falls back to a per-process backend while Redis is unavailable.
+    """
+
+    PREFIX = "rl"
+
+    def __init__(self, fallback: RateLimitBackend):
+        self.fallback = fallback
+        self._script = None
+
+    async def hit(self, key: str, limits: Sequence[RateLimit]) -> RateLimitResult:
+        try:
+            if self._script is None:
+                self._script = get_async_redis().register_script(_GCRA_SCRIPT)
+            allowed, index, remaining, reset_after, retry_after = await self._script(
+                keys=[f"{self.PREFIX}:{key}:{rate.name}" for rate in limits],
+                args=[a for rate in limits for a in (rate.interval, rate.period)],
+            )
+        except redis.RedisError:
+            return await self.fallback.hit(key, limits)
+
+        return RateLimitResult(
+            allowed=bool(allowed),
+            limit=limits[int(index) - 1].limit,
+            remaining=int(remaining),
+            reset_after=float(reset_after),
+            retry_after=float(retry_after),
         )
-        hour_count = len(self._hour_requests[client_id])
-
-        # Check limits
-        rate_info = {
-            "minute_limit": self.requests_per_minute,
-            "minute_remaining": max(0, self.requests_per_minute - minute_count),
-            "hour_limit": self.requests_per_hour,
-            "hour_remaining": max(0, self.requests_per_hour - hour_count),
-        }
 
-        if minute_count >= self.requests_per_minute:
-            rate_info["retry_after"] = 60
-            return False, rate_info
 
-        if hour_count >= self.requests_per_hour:
-            rate_info["retry_after"] = 3600
-            return False, rate_info
+class RateLimiter:
+    """
+    Applies the default or a per-route set of limits to each client.
+
+    Route rules are "[METHOD ]path prefix" keys; the longest matching prefix
+    wins, and each rule counts requests in its own bucket.
+    """
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        default_limits: list[RateLimit],
+        route_limits: Optional[dict[str, list[RateLimit]]] = None,
+    ):
+        self.backend = backend
+        self.default_limits = default_limits
+        self._routes = []
+        for rule, limits in (route_limits or {}).items():
+            method, _, prefix = rule.rpartition(" ")
+            self._routes.append((prefix.rstrip("/"), method.upper() or None, rule, limits))
+        self._routes.sort(key=lambda route: len(route[0]), reverse=True)
 
-        # Record this request
-        self._minute_requests[client_id].append(now)
-        self._hour_requests[client_id].append(now)
+    @classmethod
+    def from_settings(cls, settings: Optional[Settings] = None) -> "RateLimiter":
+        settings = settings or get_settings()
+        backend: RateLimitBackend = MemoryRateLimitBackend(settings.rate_limit_memory_max_clients)
+        if settings.rate_limit_backend == "redis":
+            backend = RedisRateLimitBackend(fallback=backend)
+        return cls(
+            backend,
+            parse_limits(settings.rate_limit_default),
+            {rule: parse_limits(value) for rule, value in settings.rate_limit_routes.items()},
+        )
+
+    def limits_for(self, method: str, path: str) -> tuple[str, list[RateLimit]]:
+        """The bucket name and limits that apply to a request."""
+        for prefix, rule_method, rule, limits in self._routes:
+            if rule_method and rule_method != method:
+                continue
+            if path == prefix or path.startswith(prefix + "/"):
+                return rule, limits
+        return "default", self.default_limits
+
+    async def check(self, client_id: str, method: str, path: str) -> RateLimitResult:
+        """Record a request and return whether it's allowed."""
+        bucket, limits = self.limits_for(method, path)
+        return await self.backend.hit(f"{bucket}:{client_id}", limits)
 
-        return True, rate_info
 
+class RateLimitMiddleware:
+    """
+    Rate limiting as pure ASGI middleware.
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Rate limiting middleware for FastAPI."""
+    Excluded paths and non-HTTP scopes (WebSockets, lifespan) pass straight
+    through; limited requests only read the scope, never building a Request.
+    """
 
-    def __init__(self, app, requests_per_minute: int = 60, requests_per_hour: int = 1000):
-        super().__init__(app)
-        self.limiter = RateLimiter(requests_per_minute, requests_per_hour)
-        # Paths to exclude from rate limiting
-        self.excluded_paths = {"/health", "/docs", "/redoc", "/openapi.json", "/"}
+    def __init__(self, app: ASGIApp, limiter: Optional[RateLimiter] = None):
+        self.app = app
+        self.limiter = limiter or RateLimiter.from_settings()
+        # Paths to exclude from rate limiting (plus /health/* probes)
+        self.excluded_paths = {"/health", "/metrics", "/docs", "/redoc", "/openapi.json", "/"}
 
-    def _get_client_id(self, request: Request) -> str:
+    def _get_client_id(self, scope: Scope) -> str:
         """Get unique client identifier."""
         # Use X-Forwarded-For if behind proxy, otherwise use client host
-        forwarded = request.headers.get("X-Forwarded-For")
-        if forwarded:
-            return forwarded.split(",")[0].strip()
-        return request.client.host if request.client else "unknown"
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
 
-    async def dispatch(self, request: Request, call_next):
-        # Skip rate limiting for excluded paths
-        if request.url.path in self.excluded_paths:
-            return await call_next(request)
+    def _headers(self, result: RateLimitResult) -> dict[str, str]:
+        return {
+            "X-RateLimit-Limit": str(result.limit),
+            "X-RateLimit-Remaining": str(result.remaining),
+            "X-RateLimit-Reset": str(math.ceil(result.reset_after)),
+        }
 
-        # Skip WebSocket connections
-        if request.url.path.startswith("/ws"):
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["path"] in self.excluded_paths
+            or scope["path"].startswith("/health/")
+        ):
+            await self.app(scope, receive, send)
+            return
 
-        client_id = self._get_client_id(request)
-        is_allowed, rate_info = self.limiter.is_allowed(client_id)
+        result = await self.limiter.check(
+            self._get_client_id(scope), scope["method"], scope["path"]
+        )
+        headers = self._headers(result)
 
-        if not is_allowed:
-            return JSONResponse(
+        if not result.allowed:
+            retry_after = math.ceil(result.retry_after)
+            response = JSONResponse(
                 status_code=429,
-                content={
-                    "detail": "Rate limit exceeded",
-                    "retry_after": rate_info.get("retry_after", 60),
-                },
-                headers={
-                    "Retry-After": str(rate_info.get("retry_after", 60)),
-                    "X-RateLimit-Limit-Minute": str(rate_info["minute_limit"]),
-                    "X-RateLimit-Remaining-Minute": str(rate_info["minute_remaining"]),
-                },
+                content={"detail": "Rate limit exceeded", "retry_after": retry_after},
+                headers={"Retry-After": str(retry_after), **headers},
             )
+            await response(scope, receive, send)
+            return
 
-        response = await call_next(request)
-
-        # Add rate limit headers to response
-        response.headers["X-RateLimit-Limit-Minute"] = str(rate_info["minute_limit"])
-        response.headers["X-RateLimit-Remaining-Minute"] = str(rate_info["minute_remaining"])
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).update(headers)
+            await send(message)
 
-        return response
+        await self.app(scope, receive, send_with_headers)
@@ -0,0 +1,37 @@
+"""Shared Redis client for caching and coordination."""
+
+from functools import lru_cache
+
+import redis
+import redis.asyncio
+
+from app.core.config import get_settings
+
+
+@lru_cache
+def get_redis() -> redis.Redis:
+    """
+    Get the process-wide Redis client.
+
+    The client owns a connection pool, so callers should reuse it instead of
+    calling redis.from_url per operation.
+    """
+    settings = get_settings()
+    return redis.Redis.from_url(
+        settings.redis_url,
+        decode_responses=True,
+        socket_timeout=settings.redis_socket_timeout,
+        socket_connect_timeout=settings.redis_socket_timeout,
+    )
+
+
+@lru_cache
+def get_async_redis() -> redis.asyncio.Redis:
+    """Get the process-wide asyncio Redis client, for use on the event loop."""
+    settings = get_settings()
+    return redis.asyncio.Redis.from_url(
+        settings.redis_url,
+        decode_responses=True,
+        socket_timeout=settings.redis_socket_timeout,
+        socket_connect_timeout=settings.redis_socket_timeout,
+    )
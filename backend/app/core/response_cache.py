@@ -0,0 +1,170 @@
+"""Redis-backed cache for serialized GET responses with ETag revalidation."""
+
+import hashlib
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Callable
+
+import redis
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from app.core.config import get_settings
+from app.core.redis import get_redis
+from app.core.serialization import dumps
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+class ResponseCache:
+    """
+    Cache serialized JSON responses in Redis.
+
+    Entries are keyed by route path, query params and the current version of
+    each namespace the response depends on. Invalidating a namespace bumps its
+    version, so stale entries are never read again and simply expire.
+
+    Clients sending a matching If-None-Match get a 304 straight from Redis,
+    without the route touching Postgres.
+    """
+
+    PREFIX = "resp"
+
+    def __init__(self):
+        self.settings = get_settings()
+        # Per-route counters for this worker process
+        self._stats: dict[str, dict[str, int]] = defaultdict(
+            lambda: {"hits": 0, "misses": 0, "not_modified": 0, "errors": 0}
+        )
+
+    def serve(
+        self,
+        request: Request,
+        response_type: Any,
+        namespaces: list[str],
+        build: Callable[[], Any],
+    ) -> Response:
+        """
+        Return a cached response for this request, or build and cache it.
+
+        Args:
+            request: Incoming request (path, query params, If-None-Match)
+            response_type: Type used to validate and serialize build()'s result,
+                or None if build() returns JSON-ready data already shaped like
+                the response (encoded directly, skipping validation)
+            namespaces: Invalidation namespaces the response depends on
+            build: Produces the response data on a cache miss
+        """
+        route = self._route_name(request)
+        if_none_match = request.headers.get("if-none-match")
+
+        if not self.settings.response_cache_enabled:
+            return self._respond(self._serialize(response_type, build()), if_none_match)
+
+        try:
+            client = get_redis()
+            key = self._cache_key(client, request, namespaces)
+            cached = client.hgetall(key)
+        except redis.RedisError:
+            self._stats[route]["errors"] += 1
+            return self._respond(self._serialize(response_type, build()), if_none_match)
+
+        if cached:
+            if self._matches(if_none_match, cached["etag"]):
+                self._stats[route]["not_modified"] += 1
+            else:
+                self._stats[route]["hits"] += 1
+            return self._respond(cached["body"], if_none_match, cached["etag"], "HIT")
+
+        self._stats[route]["misses"] += 1
+        body = self._serialize(response_type, build())
+        etag = self._etag(body)
+
+        try:
+            pipe = client.pipeline()
+            pipe.hset(key, mapping={"etag": etag, "body": body})
+            pipe.expire(key, self.settings.response_cache_ttl)
+            pipe.execute()
+        except redis.RedisError:
+            self._stats[route]["errors"] += 1
+
+        return self._respond(body, if_none_match, etag, "MISS")
+
+    def invalidate(self, *namespaces: str) -> None:
+        """Bump namespace versions so dependent cached responses are skipped."""
+        if not namespaces:
+            return
+        try:
+            pipe = get_redis().pipeline()
+            for namespace in namespaces:
+                pipe.incr(self._version_key(namespace))
+            pipe.execute()
+        except redis.RedisError:
+            pass
+
+    def get_stats(self) -> dict[str, Any]:
+        """Hit/miss counters per route for this worker, with hit rates."""
+        routes = {}
+        for route, counts in self._stats.items():
+            served = counts["hits"] + counts["not_modified"]
+            total = served + counts["misses"]
+            routes[route] = {
+                **counts,
+                "hit_rate": round(served / total, 4) if total else 0.0,
+            }
+        return {"enabled": self.settings.response_cache_enabled, "routes": routes}
+
+    def _cache_key(self, client: redis.Redis, request: Request, namespaces: list[str]) -> str:
+        versions = client.mget([self._version_key(ns) for ns in namespaces])
+        params = sorted(request.query_params.multi_items())
+        raw = f"{request.url.path}?{params}|{[v or '0' for v in versions]}"
+        return f"{self.PREFIX}:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+    def _version_key(self, namespace: str) -> str:
+        return f"{self.PREFIX}:ver:{namespace}"
+
+    def _serialize(self, response_type: Any, value: Any) -> str:
+        if response_type is None:
+            return dumps(value).decode()
+        adapter = _adapter(response_type)
+        return adapter.dump_json(
+            adapter.validate_python(value, from_attributes=True)
+        ).decode()
+
+    def _etag(self, body: str) -> str:
+        return '"' + hashlib.blake2b(body.encode(), digest_size=12).hexdigest() + '"'
+
+    def _matches(self, if_none_match: str | None, etag: str) -> bool:
+        """Weak comparison, as proxies may weaken ETags (e.g. nginx gzip)."""
+        if not if_none_match:
+            return False
+        tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+        return etag in tags or "*" in tags
+
+    def _respond(
+        self,
+        body: str,
+        if_none_match: str | None,
+        etag: str | None = None,
+        cache_status: str | None = None,
+    ) -> Response:
+        etag = etag or self._etag(body)
+        # no-cache: browsers may store the response but must revalidate it
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if cache_status:
+            headers["X-Cache"] = cache_status
+
+        if self._matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def _route_name(self, request: Request) -> str:
+        route = request.scope.get("route")
+        return getattr(route, "path", request.url.path)
+
+
+# Global response cache instance
+response_cache = ResponseCache()
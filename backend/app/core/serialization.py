@@ -0,0 +1,19 @@
+"""Fast JSON encoding for responses built from row tuples."""
+
+from typing import Any, Iterable, Sequence
+
+import orjson
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Encode JSON-ready data (dicts, lists, datetimes) with orjson.
+
+    Naive datetimes come out as ISO 8601 without offset, matching Pydantic.
+    """
+    return orjson.dumps(value)
+
+
+def rows_to_dicts(columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> list[dict[str, Any]]:
+    """Zip row tuples into dicts keyed by column name."""
+    return [dict(zip(columns, row)) for row in rows]
@@ -0,0 +1,113 @@
+"""
+Redis cache of SERP results, with coalescing of identical in-flight fetches.
+
+URL lists are cached per engine and normalized query (as built by the
+scraper's _build_search_query) for SERP_CACHE_TTL seconds. On a miss the
+first caller takes a lock and fetches; callers for the same query meanwhile
+wait for the result to land in the cache instead of paying for the same
+query again. A fetch that fails releases the lock without caching anything,
+and one of the waiters fetches instead (as it does if the lock expires).
+"""
+
+import asyncio
+import hashlib
+import json
+import uuid
+from typing import Awaitable, Callable
+
+import redis
+
+from app.core.config import get_settings
+from app.core.prometheus import SERP_CACHE
+from app.core.redis import get_async_redis
+
+# Delete the lock only if it's still ours (it may have expired and been retaken)
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class SerpCache:
+    """SERP URL lists in Redis, fetched once per query across all workers."""
+
+    PREFIX = "serp"
+    # Empty results are often a block or a captcha: share them with searches
+    # waiting on the fetch, but don't keep them
+    EMPTY_TTL = 60
+    POLL_INTERVAL = 0.2
+
+    def __init__(self):
+        self.settings = get_settings()
+
+    async def get_or_fetch(
+        self,
+        engine: str,
+        query: str,
+        max_results: int,
+        fetch: Callable[[], Awaitable[list[str]]],
+        refresh: bool = False,
+    ) -> tuple[list[str], str]:
+        """
+        URLs for a query, from the cache, another fetch in flight, or fetch().
+
+        refresh=True drops the cached URLs first, so they are fetched again
+        (or taken from a fetch already in flight, which is just as fresh).
+        Returns the URLs and where they came from: "hit", "coalesced",
+        "miss" (fetched here), or "bypass" (cache disabled or Redis down).
+        """
+        if self.settings.serp_cache_ttl <= 0:
+            return await fetch(), "bypass"
+
+        key = self._key(engine, query, max_results)
+        lock_key = f"{key}:lock"
+        try:
+            client = get_async_redis()
+            if refresh:
+                await client.delete(key)
+            waited = False
+            while True:
+                cached = await client.get(key)
+                if cached is not None:
+                    source = "coalesced" if waited else "hit"
+                    SERP_CACHE.labels(source).inc()
+                    return json.loads(cached), source
+
+                token = uuid.uuid4().hex
+                if await client.set(lock_key, token, nx=True, ex=self.settings.serp_cache_lock_timeout):
+                    break
+
+                # Another worker is fetching this query: wait for its result,
+                # or for the lock to go (failed fetch) and try for it again
+                waited = True
+                while await client.exists(lock_key) and not await client.exists(key):
+                    await asyncio.sleep(self.POLL_INTERVAL)
+        except redis.RedisError:
+            SERP_CACHE.labels("bypass").inc()
+            return await fetch(), "bypass"
+
+        SERP_CACHE.labels("miss").inc()
+        try:
+            urls = await fetch()
+            ttl = self.settings.serp_cache_ttl if urls else min(self.EMPTY_TTL, self.settings.serp_cache_ttl)
+            try:
+                await client.set(key, json.dumps(urls), ex=ttl)
+            except redis.RedisError:
+                pass
+            return urls, "miss"
+        finally:
+            try:
+                await client.eval(_RELEASE_SCRIPT, 1, lock_key, token)
+            except redis.RedisError:
+                pass
+
+    def _key(self, engine: str, query: str, max_results: int) -> str:
+        normalized = " ".join(query.lower().split())
+        digest = hashlib.sha1(f"{normalized}|{max_results}".encode()).hexdigest()
+        return f"{self.PREFIX}:{engine}:{digest}"
+
+
+# Global SERP cache instance
+serp_cache = SerpCache()
@@ -1,90 +1,173 @@
-import json
+import asyncio
 from typing import Dict, Set
 from fastapi import WebSocket
-import asyncio
 
+from app.core.serialization import dumps
+
+# Queued for a client whose queue overflowed: it missed events and should refetch
+_RESYNC = object()
+# Close code for clients dropped for not keeping up (1013: try again later)
+SLOW_CONSUMER_CLOSE_CODE = 1013
 
-class ConnectionManager:
-    """Manages WebSocket connections for real-time updates."""
 
-    def __init__(self):
-        # Maps search_id to set of connected websockets
-        self._search_connections: Dict[int, Set[WebSocket]] = {}
-        # All active connections
-        self._active_connections: Set[WebSocket] = set()
+class _Client:
+    """A connection with its own bounded send queue, drained by a writer task."""
+
+    def __init__(self, websocket: WebSocket, search_id: int | None, queue_size: int):
+        self.websocket = websocket
+        self.search_id = search_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        # Set on overflow until the resync message has gone out
+        self.lagging = False
+        self.writer: asyncio.Task | None = None
+
+
+class ConnectionManager:
+    """
+    Manages WebSocket connections for real-time updates.
+
+    Each message is encoded once and queued to every recipient without
+    awaiting, so one slow client never delays the others. A per-connection
+    writer task drains the queue. When a client's queue overflows, its
+    backlog is replaced by a single resync message; if it overflows again
+    before that message is sent, the client is dropped. Sends that don't
+    complete within `send_timeout` evict the connection, and a periodic
+    heartbeat makes that happen for dead peers on idle searches too.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 100,
+        send_timeout: float = 10.0,
+        heartbeat_interval: float = 30.0,
+    ):
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self.heartbeat_interval = heartbeat_interval
+        self._clients: Dict[WebSocket, _Client] = {}
+        # Maps search_id to clients watching that search
+        self._search_clients: Dict[int, Set[_Client]] = {}
+        # Clients listening to all searches
+        self._global_clients: Set[_Client] = set()
+        # Close handshakes in flight (the loop only keeps weak references)
+        self._closing: Set[asyncio.Task] = set()
 
     async def connect(self, websocket: WebSocket, search_id: int | None = None):
-        """Accept a new WebSocket connection."""
+        """Accept a new WebSocket connection and start its writer."""
         await websocket.accept()
-        self._active_connections.add(websocket)
+        client = _Client(websocket, search_id, self.queue_size)
+        client.writer = asyncio.create_task(self._write(client))
+        self._clients[websocket] = client
 
         if search_id:
-            if search_id not in self._search_connections:
-                self._search_connections[search_id] = set()
-            self._search_connections[search_id].add(websocket)
+            self._search_clients.setdefault(search_id, set()).add(client)
+        else:
+            self._global_clients.add(client)
+
+    def disconnect(self, websocket: WebSocket):
+        """Remove a WebSocket connection and stop its writer."""
+        client = self._clients.pop(websocket, None)
+        if not client:
+            return
+
+        self._global_clients.discard(client)
+        watchers = self._search_clients.get(client.search_id)
+        if watchers is not None:
+            watchers.discard(client)
+            if not watchers:
+                del self._search_clients[client.search_id]
 
-    def disconnect(self, websocket: WebSocket, search_id: int | None = None):
-        """Remove a WebSocket connection."""
-        self._active_connections.discard(websocket)
+        if client.writer and client.writer is not asyncio.current_task():
+            client.writer.cancel()
 
-        if search_id and search_id in self._search_connections:
-            self._search_connections[search_id].discard(websocket)
-            if not self._search_connections[search_id]:
-                del self._search_connections[search_id]
+    def send_text(self, websocket: WebSocket, text: str):
+        """Queue a raw text frame to one connection."""
+        client = self._clients.get(websocket)
+        if client:
+            self._enqueue(client, text)
 
-    async def send_to_search(self, search_id: int, message: dict):
+    def send_to_search(self, search_id: int, message: dict):
         """Send a message to all connections watching a specific search."""
-        if search_id not in self._search_connections:
+        clients = self._search_clients.get(search_id)
+        if clients:
+            self._fan_out(clients, dumps(message).decode())
+
+    def broadcast(self, message: dict):
+        """Broadcast a message to all clients not tied to a specific search."""
+        if self._global_clients:
+            self._fan_out(self._global_clients, dumps(message).decode())
+
+    def dispatch(self, event: dict):
+        """Deliver a bus event to the search's watchers and global listeners."""
+        text = dumps(event).decode()
+        search_id = event.get("search_id")
+        if search_id is not None and search_id in self._search_clients:
+            self._fan_out(self._search_clients[search_id], text)
+        self._fan_out(self._global_clients, text)
+
+    async def run_heartbeat(self):
+        """Periodically send a heartbeat to every connection, until cancelled."""
+        text = dumps({"type": "heartbeat"}).decode()
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            self._fan_out(self._clients.values(), text)
+
+    def get_stats(self) -> dict:
+        return {
+            "connections": len(self._clients),
+            "searches_watched": len(self._search_clients),
+            "lagging": sum(1 for c in self._clients.values() if c.lagging),
+        }
+
+    def _fan_out(self, clients, text: str):
+        # Copy: overflowing clients are removed while iterating
+        for client in list(clients):
+            self._enqueue(client, text)
+
+    def _enqueue(self, client: _Client, text: str):
+        try:
+            client.queue.put_nowait(text)
             return
+        except asyncio.QueueFull:
+            pass
 
-        dead_connections = set()
-        for connection in self._search_connections[search_id]:
-            try:
-                await connection.send_json(message)
-            except Exception:
-                dead_connections.add(connection)
-
-        # Clean up dead connections
-        for conn in dead_connections:
-            self.disconnect(conn, search_id)
-
-    async def broadcast(self, message: dict):
-        """Broadcast a message to all connected clients."""
-        dead_connections = set()
-        for connection in self._active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception:
-                dead_connections.add(connection)
+        if client.lagging:
+            # Still hasn't caught up since the last overflow
+            self._drop(client)
+            return
 
-        # Clean up dead connections
-        for conn in dead_connections:
-            self._active_connections.discard(conn)
+        # Replace the backlog with one message telling the client to refetch
+        while not client.queue.empty():
+            client.queue.get_nowait()
+        client.queue.put_nowait(_RESYNC)
+        client.lagging = True
+
+    async def _write(self, client: _Client):
+        try:
+            while True:
+                text = await client.queue.get()
+                if text is _RESYNC:
+                    text = dumps({"type": "resync", "search_id": client.search_id}).decode()
+                    client.lagging = False
+                await asyncio.wait_for(client.websocket.send_text(text), self.send_timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Send failed or timed out: the peer is gone or not reading
+            self._drop(client)
+
+    def _drop(self, client: _Client):
+        self.disconnect(client.websocket)
+        task = asyncio.create_task(self._close(client.websocket))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close(self, websocket: WebSocket):
+        try:
+            await websocket.close(code=SLOW_CONSUMER_CLOSE_CODE)
+        except Exception:
+            pass
 
 
 # Global connection manager instance
 manager = ConnectionManager()
-
-
-async def notify_search_update(search_id: int, status: str, stores_found: int = 0, error: str | None = None):
-    """Send search status update to connected clients."""
-    message = {
-        "type": "search_update",
-        "search_id": search_id,
-        "status": status,
-        "stores_found": stores_found,
-    }
-    if error:
-        message["error"] = error
-
-    await manager.send_to_search(search_id, message)
-
-
-async def notify_store_found(search_id: int, store_data: dict):
-    """Notify clients when a new store is found."""
-    message = {
-        "type": "store_found",
-        "search_id": search_id,
-        "store": store_data,
-    }
-    await manager.send_to_search(search_id, message)
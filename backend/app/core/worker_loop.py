@@ -0,0 +1,152 @@
+"""
+A worker-lifetime asyncio event loop.
+
+Each worker process runs one event loop in a daemon thread for as long as
+the process lives; tasks submit coroutines to it with run() instead of
+creating and closing a loop per task. That makes long-lived async
+resources possible: they are created on the loop on first use (see
+shared_http_client / shared_playwright) and closed when the process shuts
+down. Celery starts the loop on worker_process_init and stops it on
+worker_process_shutdown; anywhere else it starts on first use and stops at
+exit.
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import os
+import threading
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+import httpx
+from playwright.async_api import Playwright, async_playwright
+
+T = TypeVar("T")
+
+
+class WorkerLoop:
+    """An event loop running in a background thread, plus resources bound to it."""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._atexit_registered = False
+        # name -> (task creating the resource, async close function)
+        self._resources: dict[str, tuple[asyncio.Task, Callable[[Any], Awaitable[None]]]] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        with self._lock:
+            if self.running:
+                return
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=self._run_forever, args=(loop,), name="worker-loop", daemon=True
+            )
+            thread.start()
+            self._loop, self._thread = loop, thread
+            if not self._atexit_registered:
+                atexit.register(self.stop)
+                self._atexit_registered = True
+
+    @staticmethod
+    def _run_forever(loop: asyncio.AbstractEventLoop) -> None:
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    def run(self, coro: Awaitable[T]) -> T:
+        """Run a coroutine on the loop and wait for its result (not from the loop itself)."""
+        self.start()
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result()
+        except BaseException:
+            # E.g. a soft time limit raised while waiting: don't leave it running
+            future.cancel()
+            raise
+
+    def in_loop(self) -> bool:
+        """Whether the caller is running on this loop."""
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    async def resource(
+        self,
+        name: str,
+        factory: Callable[[], Awaitable[T]],
+        close: Callable[[T], Awaitable[None]],
+    ) -> T:
+        """A resource living as long as the loop, created on first use (call on the loop)."""
+        if not self.in_loop():
+            raise RuntimeError("Worker loop resources can only be used on the worker loop")
+        if name not in self._resources:
+            self._resources[name] = (asyncio.ensure_future(factory()), close)
+        task, _ = self._resources[name]
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            # Don't cache a failed creation
+            if self._resources.get(name, (None,))[0] is task:
+                del self._resources[name]
+            raise
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Close resources, then stop the loop and its thread."""
+        with self._lock:
+            if not self.running:
+                return
+            loop, thread = self._loop, self._thread
+            try:
+                asyncio.run_coroutine_threadsafe(self._close_resources(), loop).result(timeout)
+            except (concurrent.futures.TimeoutError, RuntimeError):
+                pass
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            if not thread.is_alive():
+                loop.close()
+            self._loop = self._thread = None
+
+    async def _close_resources(self) -> None:
+        resources, self._resources = self._resources, {}
+        for task, close in resources.values():
+            try:
+                await close(await task)
+            except Exception:
+                pass
+
+    def _after_fork(self) -> None:
+        # The loop thread doesn't exist in a forked child; start afresh there
+        self._loop = self._thread = None
+        self._resources = {}
+        self._lock = threading.Lock()
+
+
+# The event loop of this worker process
+worker_loop = WorkerLoop()
+os.register_at_fork(after_in_child=worker_loop._after_fork)
+
+
+async def shared_http_client() -> Optional[httpx.AsyncClient]:
+    """This worker's pooled httpx client, or None when not on the worker loop."""
+    if not worker_loop.in_loop():
+        return None
+    return await worker_loop.resource("http_client", _open_http_client, lambda c: c.aclose())
+
+
+async def _open_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient()
+
+
+async def shared_playwright() -> Optional[Playwright]:
+    """This worker's Playwright driver, or None when not on the worker loop."""
+    if not worker_loop.in_loop():
+        return None
+    return await worker_loop.resource(
+        "playwright", lambda: async_playwright().start(), lambda p: p.stop()
+    )
@@ -1,14 +1,23 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Depends
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from contextlib import asynccontextmanager
+import asyncio
 
 from app.core.config import get_settings
 from app.core.websocket import manager
+from app.core.events import EventSubscriber
 from app.core.rate_limit import RateLimitMiddleware
-from app.core.dependencies import get_db
-from app.core.health import get_full_health_status, check_database, check_redis, check_celery
-from app.api.routes import stores_router, searches_router
+from app.core.metrics import MetricsMiddleware, QueryCountMiddleware, request_metrics
+from app.core.prometheus import render_metrics
+from app.core.health import health_monitor
+from app.core.response_cache import response_cache
+from app.core.serialization import dumps
+from app.db.database import SessionLocal
+from app.repositories.search_repository import SearchRepository
+from app.repositories.store_repository import StoreRepository
+from app.services.search_service import SearchService
+from app.api.routes import stores_router, searches_router, stats_router, profiles_router
 
 settings = get_settings()
 
@@ -16,10 +25,17 @@ settings = get_settings()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
-    # Startup
+    # Startup - relay search events from Celery workers to this worker's sockets
+    subscriber = asyncio.create_task(EventSubscriber(manager).run())
+    heartbeat = asyncio.create_task(manager.run_heartbeat())
+    # Sample dependency health off the request path
+    health = asyncio.create_task(health_monitor.run())
     yield
-    # Shutdown - clean up connections
-    pass
+    # Shutdown - stop the background tasks and wait for them to unwind
+    tasks = (subscriber, heartbeat, health)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
 
 
 app = FastAPI(
@@ -40,16 +56,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Rate limiting middleware
-app.add_middleware(
-    RateLimitMiddleware,
-    requests_per_minute=60,
-    requests_per_hour=1000,
-)
+# Rate limiting middleware (limits and backend from settings)
+if settings.rate_limit_enabled:
+    app.add_middleware(RateLimitMiddleware)
+
+# Per-request SQL statement counts (load testing only)
+if settings.query_count_header:
+    app.add_middleware(QueryCountMiddleware)
+
+# Request timing, outermost so it covers the other middleware
+app.add_middleware(MetricsMiddleware)
 
 # Include routers
 app.include_router(stores_router, prefix=settings.api_prefix)
 app.include_router(searches_router, prefix=settings.api_prefix)
+app.include_router(stats_router, prefix=settings.api_prefix)
+app.include_router(profiles_router, prefix=settings.api_prefix)
 
 
 @app.get("/")
@@ -61,38 +83,66 @@ def root():
     }
 
 
+# The /health endpoints only read in-memory state: they stay on the event loop
+# so probes answer even when the threadpool is saturated
 @app.get("/health")
-def health_check():
+async def health_check():
     """Simple health check endpoint for load balancers."""
     return {"status": "healthy"}
 
 
 @app.get("/health/detailed")
-async def health_check_detailed(db: Session = Depends(get_db)):
+async def health_check_detailed():
     """
     Detailed health check endpoint.
 
-    Returns status of all system components including database, Redis, and Celery workers.
+    Returns status of all system components including database, Redis, and Celery workers,
+    as last sampled in the background (see checked_at / age_seconds).
     """
-    return await get_full_health_status(db)
+    return health_monitor.get_full_status()
 
 
 @app.get("/health/db")
-async def health_check_db(db: Session = Depends(get_db)):
+async def health_check_db():
     """Check database health."""
-    return await check_database(db)
+    return health_monitor.get("database")
 
 
 @app.get("/health/redis")
 async def health_check_redis():
     """Check Redis health."""
-    return await check_redis()
+    return health_monitor.get("redis")
 
 
 @app.get("/health/celery")
 async def health_check_celery():
     """Check Celery workers health."""
-    return await check_celery()
+    return health_monitor.get("celery")
+
+
+@app.get("/health/cache")
+async def health_check_cache():
+    """Response cache hit rates for this worker."""
+    return response_cache.get_stats()
+
+
+@app.get("/health/websockets")
+async def health_check_websockets():
+    """WebSocket connections held by this worker."""
+    return manager.get_stats()
+
+
+@app.get("/health/requests")
+async def health_check_requests():
+    """Request counts and latency per route for this worker."""
+    return request_metrics.get_stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint (all API workers in multiprocess mode)."""
+    body, content_type = render_metrics()
+    return Response(content=body, headers={"Content-Type": content_type})
 
 
 @app.websocket("/ws/search/{search_id}")
@@ -102,19 +152,16 @@ async def websocket_search(websocket: WebSocket, search_id: int):
 
     Connect to receive updates for a specific search job.
     Messages sent:
-    - {"type": "search_update", "search_id": int, "status": str, "stores_found": int}
-    - {"type": "store_found", "search_id": int, "store": {...}}
+    - {"type": "search_update", "search_id": int, "seq": int, "status": str, "stores_found": int}
+    - {"type": "search_progress", "search_id": int, "seq": int, "stores_found": int, "stores": [...]}
+      (stores found since the previous progress event, batched)
+    - {"type": "snapshot", "search_id": int, "seq": int, "status": str, "stores_found": int}
+      in reply to "snapshot"; send it on (re)connect or on a seq gap
+    - {"type": "resync", "search_id": int} - updates were dropped; request a snapshot
+    - {"type": "heartbeat"} - sent periodically; dead connections are evicted
     """
     await manager.connect(websocket, search_id)
-    try:
-        while True:
-            # Keep connection alive, handle any client messages
-            data = await websocket.receive_text()
-            # Client can send ping to keep alive
-            if data == "ping":
-                await websocket.send_text("pong")
-    except WebSocketDisconnect:
-        manager.disconnect(websocket, search_id)
+    await _receive_until_disconnect(websocket, search_id)
 
 
 @app.websocket("/ws")
@@ -123,12 +170,35 @@ async def websocket_global(websocket: WebSocket):
     Global WebSocket endpoint for all updates.
 
     Connect to receive all search updates across the application.
+    Events are published by Celery workers and relayed by every API worker.
     """
     await manager.connect(websocket)
+    await _receive_until_disconnect(websocket)
+
+
+async def _receive_until_disconnect(websocket: WebSocket, search_id: int | None = None):
+    """Answer client pings and snapshot requests until the socket closes (or is evicted)."""
     try:
         while True:
             data = await websocket.receive_text()
             if data == "ping":
-                await websocket.send_text("pong")
-    except WebSocketDisconnect:
+                manager.send_text(websocket, "pong")
+            elif data == "snapshot" and search_id:
+                snapshot = await run_in_threadpool(_load_progress_snapshot, search_id)
+                if snapshot:
+                    manager.send_text(websocket, dumps(snapshot).decode())
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
         manager.disconnect(websocket)
+
+
+def _load_progress_snapshot(search_id: int) -> dict | None:
+    db = SessionLocal()
+
+    try:
+        service = SearchService(SearchRepository(db), StoreRepository(db))
+        return service.get_progress_snapshot(search_id)
+
+    finally:
+        db.close()
@@ -1,4 +1,6 @@
 from app.models.store import Store
-from app.models.search import SearchJob, SearchResult, SearchStatus
+from app.models.search import SearchJob, SearchResult, SearchStatus, SearchUrl, SearchUrlStatus
+from app.models.facet import StoreFacet
+from app.models.stats import SearchStat
 
-__all__ = ["Store", "SearchJob", "SearchResult", "SearchStatus"]
+__all__ = ["Store", "SearchJob", "SearchResult", "SearchStatus", "SearchUrl", "SearchUrlStatus", "StoreFacet", "SearchStat"]
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String
+
+from app.db.database import Base
+
+
+class StoreFacet(Base):
+    """Precomputed store counts per filter value (maintained on store writes)."""
+
+    __tablename__ = "store_facets"
+
+    facet = Column(String(20), primary_key=True)
+    value = Column(String(255), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<StoreFacet {self.facet}={self.value}: {self.count}>"
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, JSON, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 import enum
 
@@ -13,6 +13,15 @@ class SearchStatus(str, enum.Enum):
     FAILED = "failed"
 
 
+class SearchUrlStatus(str, enum.Enum):
+    PENDING = "pending"
+    # Handed to a scrape_search_chunk task
+    QUEUED = "queued"
+    DONE = "done"
+    FAILED = "failed"
+    NOT_SHOPIFY = "not_shopify"
+
+
 class SearchJob(Base):
     __tablename__ = "search_jobs"
 
@@ -23,6 +32,11 @@ class SearchJob(Base):
     status = Column(Enum(SearchStatus), default=SearchStatus.PENDING, nullable=False, index=True)
     stores_found = Column(Integer, default=0)
     error_message = Column(String(1000), nullable=True)
+    # Stage timing breakdown of the latest run (see SearchTimings)
+    timings = Column(JSON, nullable=True)
+    # When the SERP URLs were saved to search_urls: runs after that resume
+    # from them instead of querying again
+    serp_fetched_at = Column(DateTime, nullable=True)
 
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -49,3 +63,24 @@ class SearchResult(Base):
 
     def __repr__(self):
         return f"<SearchResult search={self.search_id} store={self.store_id}>"
+
+
+class SearchUrl(Base):
+    """A URL from a search's SERP query and its scrape outcome (the search's checkpoint)."""
+
+    __tablename__ = "search_urls"
+    __table_args__ = (
+        UniqueConstraint("search_id", "url", name="uq_search_urls_search_url"),
+        Index("ix_search_urls_search_status", "search_id", "status"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    search_id = Column(Integer, ForeignKey("search_jobs.id", ondelete="CASCADE"), nullable=False)
+    url = Column(String(2048), nullable=False)
+    status = Column(Enum(SearchUrlStatus), default=SearchUrlStatus.PENDING, nullable=False)
+    store_id = Column(Integer, ForeignKey("stores.id", ondelete="SET NULL"), nullable=True)
+    error_type = Column(String(255), nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<SearchUrl search={self.search_id} {self.status.value}: {self.url}>"
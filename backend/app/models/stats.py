@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String
+
+from app.db.database import Base
+
+
+class SearchStat(Base):
+    """Precomputed search job counts per status (maintained on search writes)."""
+
+    __tablename__ = "search_stats"
+
+    status = Column(String(20), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    stores_found = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<SearchStat {self.status}: {self.count}>"
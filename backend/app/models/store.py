@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, Index, false
 from sqlalchemy.orm import relationship
 
 from app.db.database import Base
@@ -7,6 +7,25 @@ from app.db.database import Base
 
 class Store(Base):
     __tablename__ = "stores"
+    __table_args__ = (
+        # Partial indexes for the contact filters, ordered like the list endpoint
+        Index(
+            "ix_stores_email_niche_created",
+            "niche", "created_at",
+            postgresql_where="has_email",
+        ),
+        Index("ix_stores_email_created", "created_at", postgresql_where="has_email"),
+        Index("ix_stores_instagram_created", "created_at", postgresql_where="has_instagram"),
+        Index("ix_stores_tiktok_created", "created_at", postgresql_where="has_tiktok"),
+        Index("ix_stores_created_at", "created_at"),
+    )
+
+    # Contact flag -> source column, kept in sync on every write
+    CONTACT_FLAGS = {
+        "has_email": "email",
+        "has_instagram": "instagram",
+        "has_tiktok": "tiktok",
+    }
 
     id = Column(Integer, primary_key=True, index=True)
     url = Column(String(500), unique=True, nullable=False, index=True)
@@ -24,6 +43,11 @@ class Store(Base):
     facebook = Column(String(255), nullable=True)
     twitter = Column(String(255), nullable=True)
 
+    # Denormalized contact availability (see CONTACT_FLAGS)
+    has_email = Column(Boolean, nullable=False, default=False, server_default=false())
+    has_instagram = Column(Boolean, nullable=False, default=False, server_default=false())
+    has_tiktok = Column(Boolean, nullable=False, default=False, server_default=false())
+
     # Metadata
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -32,5 +56,10 @@ class Store(Base):
     # Relationships
     search_results = relationship("SearchResult", back_populates="store")
 
+    def sync_contact_flags(self) -> None:
+        """Recompute has_* flags from the contact columns."""
+        for flag, column in self.CONTACT_FLAGS.items():
+            setattr(self, flag, bool(getattr(self, column)))
+
     def __repr__(self):
         return f"<Store {self.domain}>"
@@ -1,8 +1,9 @@
 from typing import Generic, TypeVar, Type, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, Query
 from sqlalchemy import func
 
 from app.db.database import Base
+from app.repositories.counting import CountStrategy, CountResult
 
 ModelType = TypeVar("ModelType", bound=Base)
 
@@ -27,6 +28,16 @@ class BaseRepository(Generic[ModelType]):
     def count(self) -> int:
         return self.db.query(func.count(self.model.id)).scalar()
 
+    def count_query(
+        self,
+        query: Optional[Query] = None,
+        cache_key: Optional[str] = None,
+    ) -> CountResult:
+        """Total for pagination: exact when small, estimated/cached when large."""
+        if query is None:
+            query = self.db.query(self.model)
+        return CountStrategy(self.db).count(query, cache_key)
+
     def create(self, obj_data: dict) -> ModelType:
         db_obj = self.model(**obj_data)
         self.db.add(db_obj)
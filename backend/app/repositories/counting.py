@@ -0,0 +1,114 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import redis
+from sqlalchemy import func, literal
+from sqlalchemy.orm import Query, Session
+
+from app.core.config import get_settings
+from app.core.redis import get_redis
+
+
+@dataclass
+class CountResult:
+    """Total row count for a paginated query."""
+    total: int
+    exact: bool
+
+
+def make_count_key(namespace: str, **filters: Any) -> str:
+    """Build a cache key for a filter set (order-independent, None values ignored)."""
+    active = {k: v for k, v in filters.items() if v is not None}
+    digest = hashlib.sha1(
+        json.dumps(active, sort_keys=True, default=str).encode()
+    ).hexdigest()[:16]
+    return f"count:{namespace}:{digest}"
+
+
+class CountStrategy:
+    """
+    Decide how to total a paginated query.
+
+    - Small results: bounded exact COUNT (scans at most threshold + 1 rows).
+    - Large results: cached total from Redis, or the Postgres planner
+      estimate, cached for a short TTL. These are flagged as not exact.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        exact_threshold: Optional[int] = None,
+        cache_ttl: Optional[int] = None,
+    ):
+        settings = get_settings()
+        self.db = db
+        # 0 is meaningful for both: always estimate / don't cache the total
+        self.exact_threshold = settings.count_exact_threshold if exact_threshold is None else exact_threshold
+        self.cache_ttl = settings.count_cache_ttl if cache_ttl is None else cache_ttl
+
+    def count(self, query: Query, cache_key: Optional[str] = None) -> CountResult:
+        """Count rows matched by query."""
+        if cache_key:
+            cached = self._get_cached(cache_key)
+            if cached is not None:
+                return CountResult(total=cached, exact=False)
+
+        bounded = self._bounded_count(query)
+        if bounded <= self.exact_threshold:
+            return CountResult(total=bounded, exact=True)
+
+        # More than threshold rows: never report fewer than we know exist
+        total = max(self._planner_estimate(query) or 0, bounded)
+
+        if cache_key:
+            self._set_cached(cache_key, total)
+
+        return CountResult(total=total, exact=False)
+
+    def _bounded_count(self, query: Query) -> int:
+        """Count matching rows, stopping after threshold + 1."""
+        limited = (
+            query.statement
+            .with_only_columns(literal(1), maintain_column_froms=True)
+            .order_by(None)
+            .limit(self.exact_threshold + 1)
+            .subquery()
+        )
+        return self.db.query(func.count()).select_from(limited).scalar() or 0
+
+    def _planner_estimate(self, query: Query) -> Optional[int]:
+        """Row estimate from EXPLAIN; None if unavailable (non-Postgres, errors)."""
+        bind = self.db.get_bind()
+        if bind.dialect.name != "postgresql":
+            return None
+
+        try:
+            compiled = query.order_by(None).statement.compile(dialect=bind.dialect)
+            # Savepoint so a failed EXPLAIN doesn't abort the request transaction
+            with self.db.begin_nested():
+                result = self.db.connection().exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+                )
+                plan = result.scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"])
+        except Exception:
+            return None
+
+    def _get_cached(self, key: str) -> Optional[int]:
+        try:
+            value = get_redis().get(key)
+        except redis.RedisError:
+            return None
+        return int(value) if value is not None else None
+
+    def _set_cached(self, key: str, total: int) -> None:
+        if self.cache_ttl <= 0:
+            return
+        try:
+            get_redis().set(key, total, ex=self.cache_ttl)
+        except redis.RedisError:
+            pass
@@ -0,0 +1,175 @@
+import json
+from datetime import date, datetime
+from typing import Any, Optional
+
+import redis
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.redis import get_redis
+from app.models.facet import StoreFacet
+from app.models.store import Store
+
+FACET_TOTAL = "total"
+FACET_NICHE = "niche"
+FACET_COUNTRY = "country"
+FACET_CONTACT = "contact"
+FACET_DAY = "day"
+
+FACETS_CACHE_KEY = "facets:stores"
+FACETS_CACHE_TTL = 300  # Safety net; writes invalidate explicitly
+
+FacetKey = tuple[str, str]
+
+
+def store_facet_keys(store: Store) -> set[FacetKey]:
+    """Facet buckets a store is counted in."""
+    keys = {(FACET_TOTAL, "")}
+    if store.niche:
+        keys.add((FACET_NICHE, store.niche))
+    if store.country:
+        keys.add((FACET_COUNTRY, store.country))
+    # Contact buckets are named after the has_* flags
+    for flag, column in Store.CONTACT_FLAGS.items():
+        if getattr(store, column):
+            keys.add((FACET_CONTACT, flag))
+    # created_at is only set on flush for new stores
+    created_at = store.created_at or datetime.utcnow()
+    keys.add((FACET_DAY, created_at.date().isoformat()))
+    return keys
+
+
+class FacetRepository:
+    """Store facet counts kept in the store_facets summary table."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply_delta(self, before: set[FacetKey], after: set[FacetKey]) -> None:
+        """
+        Adjust counts for a store moving from `before` to `after` buckets.
+
+        Runs in the caller's transaction; the caller commits.
+        """
+        deltas = {key: 1 for key in after - before}
+        deltas.update({key: -1 for key in before - after})
+        if not deltas:
+            return
+
+        # Sorted so concurrent writers lock rows in the same order
+        rows = [
+            {"facet": facet, "value": value, "count": delta}
+            for (facet, value), delta in sorted(deltas.items())
+        ]
+        stmt = insert(StoreFacet).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[StoreFacet.facet, StoreFacet.value],
+            set_={"count": StoreFacet.count + stmt.excluded.count},
+        )
+        self.db.execute(stmt)
+
+    def get_counts(self, facets: Optional[list[str]] = None) -> list[StoreFacet]:
+        """Non-empty buckets of the given facets (all if unset), largest first."""
+        query = self.db.query(StoreFacet).filter(StoreFacet.count > 0)
+        if facets is not None:
+            query = query.filter(StoreFacet.facet.in_(facets))
+        return (
+            query
+            .order_by(StoreFacet.count.desc(), StoreFacet.value.asc())
+            .all()
+        )
+
+    def get_daily_counts(self, since: date) -> list[StoreFacet]:
+        """Stores created per day (YYYY-MM-DD buckets) from `since`, oldest first."""
+        return (
+            self.db.query(StoreFacet)
+            .filter(StoreFacet.facet == FACET_DAY, StoreFacet.value >= since.isoformat())
+            .order_by(StoreFacet.value.asc())
+            .all()
+        )
+
+    def get_summary(self) -> dict[str, Any]:
+        """Facet counts grouped for the filters endpoint (Redis read-through)."""
+        cached = self._get_cached()
+        if cached is not None:
+            return cached
+
+        summary: dict[str, Any] = {
+            "total": 0,
+            FACET_NICHE: [],
+            FACET_COUNTRY: [],
+            FACET_CONTACT: {flag: 0 for flag in Store.CONTACT_FLAGS},
+        }
+        # Not FACET_DAY: one row per day of stores, not part of the summary
+        for row in self.get_counts([FACET_TOTAL, FACET_NICHE, FACET_COUNTRY, FACET_CONTACT]):
+            if row.facet == FACET_TOTAL:
+                summary["total"] = row.count
+            elif row.facet == FACET_CONTACT:
+                summary[FACET_CONTACT][row.value] = row.count
+            elif row.facet in (FACET_NICHE, FACET_COUNTRY):
+                summary[row.facet].append({"value": row.value, "count": row.count})
+
+        self._set_cached(summary)
+        return summary
+
+    def rebuild(self) -> None:
+        """
+        Recompute all facet counts from the stores table.
+
+        Store writes apply their deltas in the same transaction as the store
+        row, so the table is locked against them (reads still go through)
+        before counting: writes already holding it commit first and are
+        counted, later ones wait and apply their deltas on top.
+        """
+        self.db.execute(text(f"LOCK TABLE {StoreFacet.__tablename__} IN EXCLUSIVE MODE"))
+        rows: list[dict[str, Any]] = []
+
+        total = self.db.query(func.count(Store.id)).scalar() or 0
+        rows.append({"facet": FACET_TOTAL, "value": "", "count": total})
+
+        for facet, column in ((FACET_NICHE, Store.niche), (FACET_COUNTRY, Store.country)):
+            grouped = (
+                self.db.query(column, func.count(Store.id))
+                .filter(column.isnot(None), column != "")
+                .group_by(column)
+                .all()
+            )
+            rows.extend({"facet": facet, "value": v, "count": c} for v, c in grouped)
+
+        day = func.to_char(Store.created_at, "YYYY-MM-DD")
+        grouped = self.db.query(day, func.count(Store.id)).group_by(day).all()
+        rows.extend({"facet": FACET_DAY, "value": v, "count": c} for v, c in grouped)
+
+        contact_counts = self.db.query(*[
+            func.count(Store.id).filter(getattr(Store, flag))
+            for flag in Store.CONTACT_FLAGS
+        ]).one()
+        rows.extend(
+            {"facet": FACET_CONTACT, "value": flag, "count": count}
+            for flag, count in zip(Store.CONTACT_FLAGS, contact_counts)
+        )
+
+        self.db.query(StoreFacet).delete()
+        self.db.execute(insert(StoreFacet).values(rows))
+        self.db.commit()
+        self.invalidate_cache()
+
+    def invalidate_cache(self) -> None:
+        try:
+            get_redis().delete(FACETS_CACHE_KEY)
+        except redis.RedisError:
+            pass
+
+    def _get_cached(self) -> Optional[dict[str, Any]]:
+        try:
+            value = get_redis().get(FACETS_CACHE_KEY)
+        except redis.RedisError:
+            return None
+        return json.loads(value) if value else None
+
+    def _set_cached(self, summary: dict[str, Any]) -> None:
+        try:
+            get_redis().set(FACETS_CACHE_KEY, json.dumps(summary), ex=FACETS_CACHE_TTL)
+        except redis.RedisError:
+            pass
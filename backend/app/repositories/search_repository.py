@@ -1,15 +1,60 @@
-from typing import Optional
+from typing import Iterator, Optional
 from datetime import datetime
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import Row, delete, func, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, Query, joinedload
 
+from app.core.response_cache import response_cache
 from app.repositories.base import BaseRepository
-from app.models.search import SearchJob, SearchResult, SearchStatus
+from app.repositories.stats_repository import SearchStatsRepository, search_stat_key
+from app.models.search import SearchJob, SearchResult, SearchStatus, SearchUrl, SearchUrlStatus
 from app.models.store import Store
 
 
 class SearchRepository(BaseRepository[SearchJob]):
     def __init__(self, db: Session):
         super().__init__(db, SearchJob)
+        self.stats = SearchStatsRepository(db)
+
+    def create(self, obj_data: dict) -> SearchJob:
+        search = SearchJob(**obj_data)
+        self.db.add(search)
+        # Flush so column defaults (status, stores_found) are populated
+        self.db.flush()
+        self.stats.apply_delta(None, search_stat_key(search))
+        self.db.commit()
+        self.db.refresh(search)
+        self._after_write(search.id)
+        return search
+
+    def delete(self, id: int) -> bool:
+        search = self._get_for_update(id)
+        if not search:
+            return False
+        self.stats.apply_delta(search_stat_key(search), None)
+        self.db.delete(search)
+        self.db.commit()
+        self._after_write(id)
+        return True
+
+    def _get_for_update(self, search_id: int) -> Optional[SearchJob]:
+        """
+        The search row, locked and freshly read, for writes that move its stats.
+
+        Fan-out chunks increment stores_found concurrently; the lock makes
+        them wait, so the stats delta subtracts the current count.
+        """
+        return (
+            self.db.query(SearchJob)
+            .filter(SearchJob.id == search_id)
+            .populate_existing()
+            .with_for_update()
+            .first()
+        )
+
+    def _after_write(self, search_id: int) -> None:
+        """Invalidate cached responses showing this search."""
+        response_cache.invalidate("searches", f"search:{search_id}")
 
     def get_with_results(self, id: int) -> Optional[SearchJob]:
         """Get search job with store results loaded."""
@@ -30,14 +75,61 @@ class SearchRepository(BaseRepository[SearchJob]):
         )
         return [r.store for r in results]
 
+    def get_store_rows(
+        self,
+        search_id: int,
+        columns: list[str],
+        cursor: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> list[Row]:
+        """
+        Get stores found in a search as (result_id, *columns) rows.
+
+        Keyset-paginated on search_results.id: pass the last result_id seen
+        as cursor to get the next page.
+        """
+        q = self._store_rows_query(search_id, columns)
+        if cursor is not None:
+            q = q.filter(SearchResult.id > cursor)
+        if limit is not None:
+            q = q.limit(limit)
+        return q.all()
+
+    def iter_store_rows(
+        self,
+        search_id: int,
+        columns: list[str],
+        batch_size: int = 1000,
+    ) -> Iterator[Row]:
+        """Stream stores found in a search from a server-side cursor."""
+        q = self._store_rows_query(search_id, columns)
+        yield from q.execution_options(yield_per=batch_size)
+
+    def _store_rows_query(self, search_id: int, columns: list[str]) -> Query:
+        return (
+            self.db.query(SearchResult.id, *[getattr(Store, c) for c in columns])
+            .join(Store, Store.id == SearchResult.store_id)
+            .filter(SearchResult.search_id == search_id)
+            .order_by(SearchResult.id)
+        )
+
     def add_store_to_search(self, search_id: int, store_id: int) -> SearchResult:
         """Add a store to search results."""
         result = SearchResult(search_id=search_id, store_id=store_id)
         self.db.add(result)
         self.db.commit()
         self.db.refresh(result)
+        self._after_write(search_id)
         return result
 
+    def has_store(self, search_id: int, store_id: int) -> bool:
+        """Whether a store is already in a search's results."""
+        return self.db.query(
+            self.db.query(SearchResult)
+            .filter(SearchResult.search_id == search_id, SearchResult.store_id == store_id)
+            .exists()
+        ).scalar()
+
     def update_status(
         self,
         search_id: int,
@@ -45,33 +137,134 @@ class SearchRepository(BaseRepository[SearchJob]):
         error_message: Optional[str] = None,
     ) -> Optional[SearchJob]:
         """Update search job status."""
-        search = self.get(search_id)
+        search = self._get_for_update(search_id)
         if not search:
             return None
 
+        before = search_stat_key(search)
         search.status = status
 
         if status == SearchStatus.RUNNING:
             search.started_at = datetime.utcnow()
+            # Timings of a previous run no longer apply
+            search.timings = None
         elif status in (SearchStatus.COMPLETED, SearchStatus.FAILED):
             search.completed_at = datetime.utcnow()
 
         if error_message:
             search.error_message = error_message
 
+        self.stats.apply_delta(before, search_stat_key(search))
         self.db.commit()
         self.db.refresh(search)
+        self._after_write(search_id)
         return search
 
-    def increment_stores_found(self, search_id: int) -> Optional[SearchJob]:
-        """Increment the stores found counter."""
+    def update_timings(self, search_id: int, timings: dict) -> Optional[SearchJob]:
+        """Store the stage timing breakdown of the latest run."""
         search = self.get(search_id)
         if search:
-            search.stores_found += 1
+            search.timings = timings
             self.db.commit()
-            self.db.refresh(search)
+            self._after_write(search_id)
         return search
 
+    def increment_stores_found(self, search_id: int) -> Optional[SearchJob]:
+        """Increment the stores found counter."""
+        # One UPDATE, as the chunks of a fanned-out search increment concurrently
+        row = self.db.execute(
+            update(SearchJob)
+            .where(SearchJob.id == search_id)
+            .values(stores_found=SearchJob.stores_found + 1)
+            .returning(SearchJob.status, SearchJob.stores_found)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if not row:
+            return None
+        status, stores_found = row
+        self.stats.apply_delta((status.value, stores_found - 1), (status.value, stores_found))
+        self.db.commit()
+        self._after_write(search_id)
+        return self.get(search_id)
+
+    def save_urls(self, search_id: int, urls: list[str]) -> None:
+        """Checkpoint the URLs of a search's SERP query, all pending."""
+        now = datetime.utcnow()
+        if urls:
+            stmt = insert(SearchUrl).values([
+                {"search_id": search_id, "url": url, "status": SearchUrlStatus.PENDING, "updated_at": now}
+                for url in urls
+            ])
+            self.db.execute(stmt.on_conflict_do_nothing(constraint="uq_search_urls_search_url"))
+        self.db.execute(
+            update(SearchJob).where(SearchJob.id == search_id).values(serp_fetched_at=now)
+        )
+        self.db.commit()
+
+    def get_urls(self, search_id: int, *statuses: SearchUrlStatus) -> list[str]:
+        """A search's checkpointed URLs in SERP order, optionally only those with these statuses."""
+        query = self.db.query(SearchUrl.url).filter(SearchUrl.search_id == search_id)
+        if statuses:
+            query = query.filter(SearchUrl.status.in_(statuses))
+        return [url for url, in query.order_by(SearchUrl.id)]
+
+    def queue_urls(self, search_id: int, urls: list[str]) -> None:
+        """Mark pending URLs as handed to scrape tasks, so a redelivered run won't queue them again."""
+        self.db.execute(
+            update(SearchUrl)
+            .where(
+                SearchUrl.search_id == search_id,
+                SearchUrl.url.in_(urls),
+                SearchUrl.status == SearchUrlStatus.PENDING,
+            )
+            .values(status=SearchUrlStatus.QUEUED, updated_at=datetime.utcnow())
+        )
+        self.db.commit()
+
+    def set_url_status(
+        self,
+        search_id: int,
+        url: str,
+        status: SearchUrlStatus,
+        store_id: Optional[int] = None,
+        error_type: Optional[str] = None,
+    ) -> None:
+        """Record the outcome of one of a search's URLs."""
+        self.db.execute(
+            update(SearchUrl)
+            .where(SearchUrl.search_id == search_id, SearchUrl.url == url)
+            .values(status=status, store_id=store_id, error_type=error_type, updated_at=datetime.utcnow())
+        )
+        self.db.commit()
+
+    def url_counts(self, search_id: int) -> dict[str, int]:
+        """Number of a search's URLs per status."""
+        rows = (
+            self.db.query(SearchUrl.status, func.count())
+            .filter(SearchUrl.search_id == search_id)
+            .group_by(SearchUrl.status)
+            .all()
+        )
+        return {status.value: count for status, count in rows}
+
+    def reset_urls(self, search_id: int, status: SearchUrlStatus) -> int:
+        """Set a search's URLs with a status back to pending; returns how many."""
+        result = self.db.execute(
+            update(SearchUrl)
+            .where(SearchUrl.search_id == search_id, SearchUrl.status == status)
+            .values(status=SearchUrlStatus.PENDING, error_type=None, updated_at=datetime.utcnow())
+        )
+        self.db.commit()
+        return result.rowcount
+
+    def clear_urls(self, search_id: int) -> None:
+        """Drop a search's checkpoint, so its next run queries the SERP again."""
+        self.db.execute(delete(SearchUrl).where(SearchUrl.search_id == search_id))
+        self.db.execute(
+            update(SearchJob).where(SearchJob.id == search_id).values(serp_fetched_at=None)
+        )
+        self.db.commit()
+
     def get_recent(self, limit: int = 10) -> list[SearchJob]:
         """Get recent search jobs."""
         return (
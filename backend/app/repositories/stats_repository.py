@@ -0,0 +1,88 @@
+from typing import Optional
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.search import SearchJob
+from app.models.stats import SearchStat
+
+# (status, stores_found) a search job contributes to the stats
+SearchStatKey = tuple[str, int]
+
+
+def search_stat_key(search: SearchJob) -> SearchStatKey:
+    return search.status.value, search.stores_found or 0
+
+
+class SearchStatsRepository:
+    """Search job counts per status kept in the search_stats summary table."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply_delta(
+        self,
+        before: Optional[SearchStatKey],
+        after: Optional[SearchStatKey],
+    ) -> None:
+        """
+        Adjust counts for a search moving from `before` to `after`.
+
+        None means the search didn't exist (created) or no longer does
+        (deleted). Runs in the caller's transaction; the caller commits.
+        """
+        if before == after:
+            return
+
+        deltas: dict[str, list[int]] = {}
+        for key, sign in ((before, -1), (after, 1)):
+            if key is None:
+                continue
+            status, stores_found = key
+            delta = deltas.setdefault(status, [0, 0])
+            delta[0] += sign
+            delta[1] += sign * stores_found
+
+        # Sorted so concurrent writers lock rows in the same order
+        rows = [
+            {"status": status, "count": count, "stores_found": stores_found}
+            for status, (count, stores_found) in sorted(deltas.items())
+        ]
+        stmt = insert(SearchStat).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SearchStat.status],
+            set_={
+                "count": SearchStat.count + stmt.excluded.count,
+                "stores_found": SearchStat.stores_found + stmt.excluded.stores_found,
+            },
+        )
+        self.db.execute(stmt)
+
+    def get_counts(self) -> list[SearchStat]:
+        return self.db.query(SearchStat).order_by(SearchStat.status.asc()).all()
+
+    def rebuild(self) -> None:
+        """
+        Recompute all search stats from the search_jobs table.
+
+        Locked against concurrent deltas first, as in FacetRepository.rebuild.
+        """
+        self.db.execute(text(f"LOCK TABLE {SearchStat.__tablename__} IN EXCLUSIVE MODE"))
+        grouped = (
+            self.db.query(
+                SearchJob.status,
+                func.count(SearchJob.id),
+                func.coalesce(func.sum(SearchJob.stores_found), 0),
+            )
+            .group_by(SearchJob.status)
+            .all()
+        )
+
+        self.db.query(SearchStat).delete()
+        if grouped:
+            self.db.execute(insert(SearchStat).values([
+                {"status": status.value, "count": count, "stores_found": stores_found}
+                for status, count, stores_found in grouped
+            ]))
+        self.db.commit()
@@ -1,14 +1,55 @@
-from typing import Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
+from typing import Iterator, Optional
+from sqlalchemy.orm import Session, Query
+from sqlalchemy import or_, func, Row
 
+from app.core.response_cache import response_cache
 from app.repositories.base import BaseRepository
+from app.repositories.counting import CountResult, make_count_key
+from app.repositories.facet_repository import FacetRepository, store_facet_keys
 from app.models.store import Store
 
 
 class StoreRepository(BaseRepository[Store]):
     def __init__(self, db: Session):
         super().__init__(db, Store)
+        self.facets = FacetRepository(db)
+
+    def create(self, obj_data: dict) -> Store:
+        store = Store(**obj_data)
+        store.sync_contact_flags()
+        self.db.add(store)
+        self.facets.apply_delta(set(), store_facet_keys(store))
+        self.db.commit()
+        self.db.refresh(store)
+        self._after_write(store.id)
+        return store
+
+    def update(self, db_obj: Store, update_data: dict) -> Store:
+        before = store_facet_keys(db_obj)
+        for field, value in update_data.items():
+            if hasattr(db_obj, field):
+                setattr(db_obj, field, value)
+        db_obj.sync_contact_flags()
+        self.facets.apply_delta(before, store_facet_keys(db_obj))
+        self.db.commit()
+        self.db.refresh(db_obj)
+        self._after_write(db_obj.id)
+        return db_obj
+
+    def delete(self, id: int) -> bool:
+        store = self.get(id)
+        if not store:
+            return False
+        self.facets.apply_delta(store_facet_keys(store), set())
+        self.db.delete(store)
+        self.db.commit()
+        self._after_write(id)
+        return True
+
+    def _after_write(self, store_id: int) -> None:
+        """Invalidate caches derived from the stores table."""
+        self.facets.invalidate_cache()
+        response_cache.invalidate("stores", f"store:{store_id}")
 
     def get_by_domain(self, domain: str) -> Optional[Store]:
         return self.db.query(Store).filter(Store.domain == domain).first()
@@ -26,10 +67,59 @@ class StoreRepository(BaseRepository[Store]):
         has_tiktok: Optional[bool] = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> tuple[list[Store], int]:
-        """Search stores with filtering."""
-        q = self.db.query(Store)
+        columns: Optional[list[str]] = None,
+    ) -> tuple[list, CountResult]:
+        """
+        Search stores with filtering.
+
+        Items are Store entities, or row tuples of `columns` when given.
+        """
+        filters = dict(
+            query=query,
+            niche=niche,
+            country=country,
+            has_email=has_email,
+            has_instagram=has_instagram,
+            has_tiktok=has_tiktok,
+        )
+        if columns:
+            q = self.db.query(*[getattr(Store, c) for c in columns])
+        else:
+            q = self.db.query(Store)
+        q = self._apply_filters(q, **filters)
+
+        total = self.count_query(q, cache_key=make_count_key("stores", **filters))
+        items = q.order_by(Store.created_at.desc()).offset(skip).limit(limit).all()
+
+        return items, total
 
+    def iter_rows(
+        self,
+        columns: list[str],
+        batch_size: int = 1000,
+        **filters,
+    ) -> Iterator[Row]:
+        """
+        Stream matching stores as row tuples of the given columns.
+
+        Uses a server-side cursor, so memory stays flat regardless of row count.
+        Accepts the same filters as search().
+        """
+        q = self.db.query(*[getattr(Store, c) for c in columns])
+        q = self._apply_filters(q, **filters).order_by(Store.id)
+        yield from q.execution_options(yield_per=batch_size)
+
+    def _apply_filters(
+        self,
+        q: Query,
+        query: Optional[str] = None,
+        niche: Optional[str] = None,
+        country: Optional[str] = None,
+        has_email: Optional[bool] = None,
+        has_instagram: Optional[bool] = None,
+        has_tiktok: Optional[bool] = None,
+    ) -> Query:
+        """Apply the store list filters to a query."""
         if query:
             search_term = f"%{query}%"
             q = q.filter(
@@ -40,25 +130,24 @@ class StoreRepository(BaseRepository[Store]):
                 )
             )
 
+        # Exact matches (values come from /stores/filters) so indexes apply
         if niche:
-            q = q.filter(Store.niche.ilike(f"%{niche}%"))
+            q = q.filter(Store.niche == niche)
 
         if country:
-            q = q.filter(Store.country.ilike(f"%{country}%"))
+            q = q.filter(Store.country == country)
 
+        # Bare boolean columns so the planner matches the partial indexes
         if has_email is True:
-            q = q.filter(Store.email.isnot(None), Store.email != "")
+            q = q.filter(Store.has_email)
 
         if has_instagram is True:
-            q = q.filter(Store.instagram.isnot(None), Store.instagram != "")
+            q = q.filter(Store.has_instagram)
 
         if has_tiktok is True:
-            q = q.filter(Store.tiktok.isnot(None), Store.tiktok != "")
+            q = q.filter(Store.has_tiktok)
 
-        total = q.count()
-        items = q.order_by(Store.created_at.desc()).offset(skip).limit(limit).all()
-
-        return items, total
+        return q
 
     def get_or_create(self, domain: str, defaults: dict) -> tuple[Store, bool]:
         """Get existing store or create new one."""
@@ -72,20 +161,8 @@ class StoreRepository(BaseRepository[Store]):
 
     def get_niches(self) -> list[str]:
         """Get distinct niches."""
-        result = (
-            self.db.query(Store.niche)
-            .filter(Store.niche.isnot(None))
-            .distinct()
-            .all()
-        )
-        return [r[0] for r in result if r[0]]
+        return [f["value"] for f in self.facets.get_summary()["niche"]]
 
     def get_countries(self) -> list[str]:
         """Get distinct countries."""
-        result = (
-            self.db.query(Store.country)
-            .filter(Store.country.isnot(None))
-            .distinct()
-            .all()
-        )
-        return [r[0] for r in result if r[0]]
+        return [f["value"] for f in self.facets.get_summary()["country"]]
@@ -4,6 +4,8 @@ from app.schemas.store import (
     StoreUpdate,
     StoreResponse,
     StoreListResponse,
+    FacetCount,
+    FilterOptionsResponse,
 )
 from app.schemas.search import (
     SearchJobBase,
@@ -11,7 +13,11 @@ from app.schemas.search import (
     SearchJobResponse,
     SearchJobWithResults,
     SearchJobListResponse,
+    PageTimings,
+    SearchTimings,
+    SearchRunStatsResponse,
 )
+from app.schemas.stats import SearchStatusCount, DashboardStatsResponse
 
 __all__ = [
     "StoreBase",
@@ -19,9 +25,16 @@ __all__ = [
     "StoreUpdate",
     "StoreResponse",
     "StoreListResponse",
+    "FacetCount",
+    "FilterOptionsResponse",
     "SearchJobBase",
     "SearchJobCreate",
     "SearchJobResponse",
     "SearchJobWithResults",
     "SearchJobListResponse",
+    "PageTimings",
+    "SearchTimings",
+    "SearchRunStatsResponse",
+    "SearchStatusCount",
+    "DashboardStatsResponse",
 ]
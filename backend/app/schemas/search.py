@@ -1,9 +1,9 @@
+import enum
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 from pydantic import BaseModel
 
 from app.models.search import SearchStatus
-from app.schemas.store import StoreResponse
 
 
 class SearchJobBase(BaseModel):
@@ -16,6 +16,15 @@ class SearchJobCreate(SearchJobBase):
     pass
 
 
+class RetryMode(str, enum.Enum):
+    # Query the SERP again and visit every URL
+    FULL = "full"
+    # Carry on with the URLs the last run didn't get to
+    RESUME = "resume"
+    # Those, plus the URLs that failed
+    FAILED = "failed"
+
+
 class SearchJobResponse(SearchJobBase):
     id: int
     status: SearchStatus
@@ -30,12 +39,48 @@ class SearchJobResponse(SearchJobBase):
 
 
 class SearchJobWithResults(SearchJobResponse):
-    stores: list[StoreResponse] = []
+    # Store fields as in StoreResponse, limited to the requested fields
+    stores: list[dict[str, Any]] = []
+    next_cursor: Optional[int] = None
 
 
 class SearchJobListResponse(BaseModel):
     items: list[SearchJobResponse]
     total: int
+    total_exact: bool = True
     page: int
     page_size: int
     pages: int
+
+
+class PageTimings(BaseModel):
+    count: int = 0
+    p50: Optional[float] = None
+    p95: Optional[float] = None
+    max: Optional[float] = None
+
+
+class SearchTimings(BaseModel):
+    # Wall time in seconds per stage: serp, scrape, db_write
+    stages: dict[str, float] = {}
+    urls_found: int = 0
+    # Already in the database, linked without scraping
+    urls_known: int = 0
+    scraped: int = 0
+    not_shopify: int = 0
+    # SERP source: hit, coalesced, miss or bypass (None when the URLs were checkpointed)
+    serp_cache: Optional[str] = None
+    # Failed URLs by exception class
+    errors: dict[str, int] = {}
+    page_seconds: PageTimings = PageTimings()
+    total_seconds: float = 0.0
+
+
+class SearchRunStatsResponse(BaseModel):
+    search_id: int
+    status: SearchStatus
+    stores_found: int
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    # None until a run has finished
+    timings: Optional[SearchTimings] = None
@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+
+from app.schemas.store import FacetCount
+
+
+class SearchStatusCount(BaseModel):
+    status: str
+    count: int
+    stores_found: int
+
+
+class DashboardStatsResponse(BaseModel):
+    total_stores: int
+    contact_counts: dict[str, int]
+    niche_counts: list[FacetCount]
+    # Stores created per day (value is YYYY-MM-DD), oldest first, gaps filled with 0
+    stores_per_day: list[FacetCount]
+    total_searches: int
+    searches_by_status: list[SearchStatusCount]
+    # Stores found by completed searches
+    stores_found: int
+    # Completed share of finished (completed or failed) searches
+    success_rate: float
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 from pydantic import BaseModel, HttpUrl, EmailStr
 
 
@@ -45,9 +45,49 @@ class StoreResponse(StoreBase):
         from_attributes = True
 
 
+STORE_FIELDS = list(StoreResponse.model_fields)
+
+# List endpoints skip the unbounded description column unless asked for it
+STORE_LIST_FIELDS = [f for f in STORE_FIELDS if f != "description"]
+
+
+def parse_store_fields(fields: Optional[str], default: Optional[list[str]] = None) -> list[str]:
+    """
+    Parse a comma-separated fields parameter into StoreResponse field names.
+
+    Defaults to `default` (all fields if unset); id is always included.
+    Raises ValueError on unknown fields.
+    """
+    if not fields:
+        return default or STORE_FIELDS
+
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in STORE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    return ["id"] + [f for f in dict.fromkeys(requested) if f != "id"]
+
+
 class StoreListResponse(BaseModel):
-    items: list[StoreResponse]
+    # Store fields as in StoreResponse, limited to the requested fields
+    items: list[dict[str, Any]]
     total: int
+    total_exact: bool = True
     page: int
     page_size: int
     pages: int
+
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+
+class FilterOptionsResponse(BaseModel):
+    niches: list[str]
+    countries: list[str]
+    total: int = 0
+    niche_counts: list[FacetCount] = []
+    country_counts: list[FacetCount] = []
+    contact_counts: dict[str, int] = {}
@@ -2,16 +2,44 @@ from abc import ABC, abstractmethod
 from typing import Any, Optional
 import asyncio
 import random
+import time
+
+import httpx
+from playwright.async_api import Playwright, TimeoutError as PlaywrightTimeout, async_playwright
 
 from app.core.config import get_settings
+from app.core.prometheus import BROWSER_LAUNCHES, SCRAPES, SCRAPE_SECONDS
+from app.core.worker_loop import shared_playwright
+
+TIMEOUT_ERRORS = (asyncio.TimeoutError, PlaywrightTimeout, httpx.TimeoutException)
 
 
 class BaseScraper(ABC):
     """Abstract base class for all scrapers (SOLID: Open/Closed, Liskov Substitution)."""
 
+    # Label for this scraper's metrics
+    name = "base"
+
     def __init__(self):
         self.settings = get_settings()
 
+    def record_scrape(self, started: float, outcome: str) -> None:
+        """Count a scrape by outcome and observe its duration since `started` (perf_counter)."""
+        SCRAPES.labels(self.name, outcome).inc()
+        SCRAPE_SECONDS.labels(self.name).observe(time.perf_counter() - started)
+
+    @staticmethod
+    def error_outcome(error: Exception) -> str:
+        return "timeout" if isinstance(error, TIMEOUT_ERRORS) else "error"
+
+    def record_browser_launch(self) -> None:
+        BROWSER_LAUNCHES.labels(self.name).inc()
+
+    @staticmethod
+    async def start_playwright() -> Playwright:
+        """The worker's shared Playwright driver, or a new one outside the worker loop."""
+        return await shared_playwright() or await async_playwright().start()
+
     async def delay(self) -> None:
         """Random delay between requests to avoid rate limiting."""
         delay_time = random.uniform(
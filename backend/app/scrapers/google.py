@@ -1,9 +1,10 @@
 import asyncio
 import re
+import time
 from typing import Any
 from urllib.parse import urlparse, parse_qs, unquote
 
-from playwright.async_api import async_playwright, Browser, Page, TimeoutError as PlaywrightTimeout
+from playwright.async_api import Browser, Page, TimeoutError as PlaywrightTimeout
 
 from app.scrapers.base import SearchScraper
 
@@ -11,6 +12,8 @@ from app.scrapers.base import SearchScraper
 class GoogleScraper(SearchScraper):
     """Google search scraper using Playwright for JavaScript rendering."""
 
+    name = "google"
+
     def __init__(self):
         super().__init__()
         self._browser: Browser | None = None
@@ -18,7 +21,7 @@ class GoogleScraper(SearchScraper):
     async def _get_browser(self) -> Browser:
         """Get or create browser instance."""
         if self._browser is None or not self._browser.is_connected():
-            playwright = await async_playwright().start()
+            playwright = await self.start_playwright()
             self._browser = await playwright.chromium.launch(
                 headless=True,
                 args=[
@@ -27,6 +30,7 @@ class GoogleScraper(SearchScraper):
                     "--no-sandbox",
                 ],
             )
+            self.record_browser_launch()
         return self._browser
 
     async def _create_page(self) -> Page:
@@ -135,6 +139,7 @@ class GoogleScraper(SearchScraper):
         Returns:
             List of URLs found
         """
+        started = time.perf_counter()
         page = await self._create_page()
         all_urls = []
 
@@ -182,8 +187,13 @@ class GoogleScraper(SearchScraper):
                 except PlaywrightTimeout:
                     break
 
+            self.record_scrape(started, "success")
             return list(dict.fromkeys(all_urls))[:max_results]
 
+        except Exception as e:
+            self.record_scrape(started, self.error_outcome(e))
+            raise
+
         finally:
             await page.context.close()
 
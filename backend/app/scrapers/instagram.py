@@ -1,9 +1,10 @@
 import re
 import json
+import time
 from typing import Any
 from urllib.parse import urlparse
 
-from playwright.async_api import async_playwright, Browser, Page
+from playwright.async_api import Browser, Page
 from bs4 import BeautifulSoup
 
 from app.scrapers.base import BaseScraper
@@ -12,6 +13,8 @@ from app.scrapers.base import BaseScraper
 class InstagramScraper(BaseScraper):
     """Scrape Instagram profiles for bio links and business info."""
 
+    name = "instagram"
+
     def __init__(self):
         super().__init__()
         self._browser: Browser | None = None
@@ -19,7 +22,7 @@ class InstagramScraper(BaseScraper):
     async def _get_browser(self) -> Browser:
         """Get or create browser instance."""
         if self._browser is None or not self._browser.is_connected():
-            playwright = await async_playwright().start()
+            playwright = await self.start_playwright()
             self._browser = await playwright.chromium.launch(
                 headless=True,
                 args=[
@@ -28,6 +31,7 @@ class InstagramScraper(BaseScraper):
                     "--no-sandbox",
                 ],
             )
+            self.record_browser_launch()
         return self._browser
 
     async def _create_page(self) -> Page:
@@ -110,6 +114,7 @@ class InstagramScraper(BaseScraper):
         """
         handle = self._normalize_handle(url)
         profile_url = self._build_profile_url(handle)
+        started = time.perf_counter()
         page = await self._create_page()
 
         try:
@@ -139,9 +144,11 @@ class InstagramScraper(BaseScraper):
             if json_data:
                 data.update(json_data)
 
+            self.record_scrape(started, "success")
             return data
 
         except Exception as e:
+            self.record_scrape(started, self.error_outcome(e))
             return {"error": str(e), "handle": f"@{handle}", "url": profile_url}
 
         finally:
@@ -3,6 +3,8 @@ from dataclasses import dataclass
 from typing import Optional
 import asyncio
 
+from app.core.prometheus import PROXY_REQUESTS
+
 
 @dataclass
 class Proxy:
@@ -124,23 +126,28 @@ class ProxyRotator:
         async with self._lock:
             available = [p for p in self._proxies if p.url not in self._failed]
             if not available:
+                PROXY_REQUESTS.labels("exhausted").inc()
                 return None
 
             proxy = available[self._current_index % len(available)]
             self._current_index += 1
+            PROXY_REQUESTS.labels("assigned").inc()
             return proxy
 
     async def get_random(self) -> Proxy | None:
         """Get a random proxy."""
         available = [p for p in self._proxies if p.url not in self._failed]
         if not available:
+            PROXY_REQUESTS.labels("exhausted").inc()
             return None
+        PROXY_REQUESTS.labels("assigned").inc()
         return random.choice(available)
 
     async def mark_failed(self, proxy: Proxy) -> None:
         """Mark a proxy as failed."""
         async with self._lock:
             self._failed.add(proxy.url)
+        PROXY_REQUESTS.labels("failed").inc()
 
     async def reset_failed(self) -> None:
         """Reset all failed proxies."""
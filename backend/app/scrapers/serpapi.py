@@ -1,8 +1,11 @@
 import os
+import time
+from contextlib import nullcontext
 from typing import Any
 
 import httpx
 
+from app.core.worker_loop import shared_http_client
 from app.scrapers.base import SearchScraper
 
 
@@ -14,13 +17,14 @@ class SerpAPIScraper(SearchScraper):
     Free tier: 100 searches/month
     """
 
-    BASE_URL = "https://serpapi.com/search"
+    name = "serpapi"
 
     def __init__(self, api_key: str | None = None):
         super().__init__()
         self.api_key = api_key or os.getenv("SERPAPI_KEY")
         if not self.api_key:
             raise ValueError("SerpAPI key required. Set SERPAPI_KEY env var or pass api_key.")
+        self.base_url = self.settings.serpapi_base_url.rstrip("/")
 
     def _build_search_query(self, niche: str, location: str | None = None) -> str:
         """Build search query for finding Shopify stores."""
@@ -46,40 +50,54 @@ class SerpAPIScraper(SearchScraper):
         all_urls = []
         start = 0
         results_per_page = 100  # SerpAPI max per request
+        started = time.perf_counter()
+        outcome = "success"
 
-        async with httpx.AsyncClient() as client:
-            while len(all_urls) < max_results:
-                params = {
-                    "q": query,
-                    "api_key": self.api_key,
-                    "engine": "google",
-                    "num": min(results_per_page, max_results - len(all_urls)),
-                    "start": start,
-                }
+        # Reuse the worker's pooled client (kept open) when there is one
+        shared = await shared_http_client()
+
+        try:
+            async with nullcontext(shared) if shared else httpx.AsyncClient() as client:
+                while len(all_urls) < max_results:
+                    params = {
+                        "q": query,
+                        "api_key": self.api_key,
+                        "engine": "google",
+                        "num": min(results_per_page, max_results - len(all_urls)),
+                        "start": start,
+                    }
+
+                    response = await client.get(f"{self.base_url}/search", params=params)
+
+                    if response.status_code != 200:
+                        outcome = "error"
+                        break
 
-                response = await client.get(self.BASE_URL, params=params)
+                    data = response.json()
 
-                if response.status_code != 200:
-                    break
+                    # Extract organic results
+                    organic_results = data.get("organic_results", [])
+                    if not organic_results:
+                        break
 
-                data = response.json()
+                    for result in organic_results:
+                        url = result.get("link")
+                        if url and self._is_valid_url(url):
+                            all_urls.append(url)
 
-                # Extract organic results
-                organic_results = data.get("organic_results", [])
-                if not organic_results:
-                    break
+                    # Check if more pages available
+                    if not data.get("serpapi_pagination", {}).get("next"):
+                        break
 
-                for result in organic_results:
-                    url = result.get("link")
-                    if url and self._is_valid_url(url):
-                        all_urls.append(url)
+                    start += results_per_page
+                    await self.delay()
 
-                # Check if more pages available
-                if not data.get("serpapi_pagination", {}).get("next"):
-                    break
+        except Exception as e:
+            outcome = self.error_outcome(e)
+            raise
 
-                start += results_per_page
-                await self.delay()
+        finally:
+            self.record_scrape(started, outcome)
 
         return list(dict.fromkeys(all_urls))[:max_results]
 
@@ -130,7 +148,7 @@ class SerpAPIScraper(SearchScraper):
         """Get SerpAPI account info (remaining searches, etc.)."""
         async with httpx.AsyncClient() as client:
             response = await client.get(
-                "https://serpapi.com/account",
+                f"{self.base_url}/account",
                 params={"api_key": self.api_key},
             )
 
@@ -1,11 +1,13 @@
 import re
 import json
+import time
 from typing import Any
 from urllib.parse import urlparse
 
-from playwright.async_api import async_playwright, Browser, Page
+from playwright.async_api import Browser, Page
 from bs4 import BeautifulSoup
 
+from app.core.prometheus import observe_stage
 from app.scrapers.base import BaseScraper, DataExtractor
 
 
@@ -246,6 +248,8 @@ class ShopifyExtractor(DataExtractor):
 class ShopifyScraper(BaseScraper):
     """Complete Shopify store scraper."""
 
+    name = "shopify"
+
     def __init__(self):
         super().__init__()
         self._browser: Browser | None = None
@@ -254,11 +258,12 @@ class ShopifyScraper(BaseScraper):
     async def _get_browser(self) -> Browser:
         """Get or create browser instance."""
         if self._browser is None or not self._browser.is_connected():
-            playwright = await async_playwright().start()
+            playwright = await self.start_playwright()
             self._browser = await playwright.chromium.launch(
                 headless=True,
                 args=["--disable-dev-shm-usage", "--no-sandbox"],
             )
+            self.record_browser_launch()
         return self._browser
 
     async def _create_page(self) -> Page:
@@ -294,26 +299,34 @@ class ShopifyScraper(BaseScraper):
 
     async def scrape(self, url: str) -> dict[str, Any]:
         """Scrape Shopify store data."""
+        started = time.perf_counter()
         page = await self._create_page()
 
         try:
-            await page.goto(url, wait_until="networkidle", timeout=30000)
+            with observe_stage("navigate"):
+                await page.goto(url, wait_until="networkidle", timeout=30000)
             await self.delay()
 
             html = await page.content()
 
             # Verify it's actually Shopify
-            if not ShopifyDetector.is_shopify(html, url):
+            with observe_stage("detect"):
+                is_shopify = ShopifyDetector.is_shopify(html, url)
+            if not is_shopify:
+                self.record_scrape(started, "not_shopify")
                 return {"error": "Not a Shopify store", "url": url}
 
             # Extract store data
-            data = await self.extractor.extract(html, url)
+            with observe_stage("extract"):
+                data = await self.extractor.extract(html, url)
             data["is_shopify"] = True
 
+            self.record_scrape(started, "success")
             return data
 
         except Exception as e:
-            return {"error": str(e), "url": url}
+            self.record_scrape(started, self.error_outcome(e))
+            return {"error": str(e), "error_type": type(e).__name__, "url": url}
 
         finally:
             await page.context.close()
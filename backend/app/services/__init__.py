@@ -1,4 +1,6 @@
 from app.services.store_service import StoreService
 from app.services.search_service import SearchService
+from app.services.export_service import ExportService
+from app.services.stats_service import StatsService
 
-__all__ = ["StoreService", "SearchService"]
+__all__ = ["StoreService", "SearchService", "ExportService", "StatsService"]
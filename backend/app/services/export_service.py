@@ -0,0 +1,194 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Iterator, Optional
+
+from app.db.database import SessionLocal
+from app.repositories.search_repository import SearchRepository
+from app.repositories.store_repository import StoreRepository
+
+EXPORT_COLUMNS = [
+    "id",
+    "url",
+    "domain",
+    "store_name",
+    "email",
+    "phone",
+    "country",
+    "niche",
+    "description",
+    "instagram",
+    "tiktok",
+    "facebook",
+    "twitter",
+    "created_at",
+    "updated_at",
+    "last_scraped_at",
+]
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def parquet_available() -> bool:
+    """Parquet export needs the optional pyarrow dependency."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that buffers bytes until drained."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ExportService:
+    """
+    Stream stores out as CSV, NDJSON or Parquet.
+
+    Also streams a search's results as NDJSON.
+
+    Rows come from a server-side cursor in batches and each batch is encoded
+    and yielded as one chunk, so memory stays flat regardless of row count.
+    Uses its own session because streaming outlives the request's session.
+    """
+
+    def __init__(self, batch_size: int = 1000):
+        self.batch_size = batch_size
+
+    def stream(self, format: str, filters: Optional[dict] = None) -> Iterator[bytes]:
+        """Yield the encoded export in chunks."""
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {format}")
+
+        encoder = {
+            "csv": self._encode_csv,
+            "ndjson": self._encode_ndjson,
+            "parquet": self._encode_parquet,
+        }[format]
+        yield from encoder(self._iter_batches(filters or {}), EXPORT_COLUMNS)
+
+    def stream_search_results(self, search_id: int, columns: list[str]) -> Iterator[bytes]:
+        """Yield the stores found by a search as NDJSON chunks."""
+        yield from self._encode_ndjson(self._iter_search_batches(search_id, columns), columns)
+
+    def write_to_file(self, path: str, format: str, filters: Optional[dict] = None) -> None:
+        """Write the export to a file."""
+        with open(path, "wb") as f:
+            for chunk in self.stream(format, filters):
+                f.write(chunk)
+
+    def _iter_batches(self, filters: dict) -> Iterator[list[tuple]]:
+        db = SessionLocal()
+
+        try:
+            rows = StoreRepository(db).iter_rows(
+                EXPORT_COLUMNS, batch_size=self.batch_size, **filters
+            )
+            yield from self._batched(tuple(row) for row in rows)
+
+        finally:
+            db.close()
+
+    def _iter_search_batches(self, search_id: int, columns: list[str]) -> Iterator[list[tuple]]:
+        db = SessionLocal()
+
+        try:
+            rows = SearchRepository(db).iter_store_rows(
+                search_id, columns, batch_size=self.batch_size
+            )
+            # Drop the leading result id
+            yield from self._batched(tuple(row)[1:] for row in rows)
+
+        finally:
+            db.close()
+
+    def _batched(self, rows: Iterator[tuple]) -> Iterator[list[tuple]]:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _encode_csv(self, batches: Iterator[list[tuple]], columns: list[str]) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+
+        for batch in batches:
+            writer.writerows([self._plain(v) for v in row] for row in batch)
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+
+        # Header only when there are no rows
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+    def _encode_ndjson(self, batches: Iterator[list[tuple]], columns: list[str]) -> Iterator[bytes]:
+        for batch in batches:
+            lines = [
+                json.dumps({c: self._plain(v) for c, v in zip(columns, row)})
+                for row in batch
+            ]
+            yield ("\n".join(lines) + "\n").encode()
+
+    def _encode_parquet(self, batches: Iterator[list[tuple]], columns: list[str]) -> Iterator[bytes]:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        timestamp_columns = {"created_at", "updated_at", "last_scraped_at"}
+        schema = pa.schema([
+            (c, pa.timestamp("us") if c in timestamp_columns
+             else pa.int64() if c == "id" else pa.string())
+            for c in columns
+        ])
+
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(sink, schema)
+        try:
+            for batch in batches:
+                values = list(zip(*batch))
+                # One row group per batch
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.array(col, type=field.type) for col, field in zip(values, schema)],
+                    schema=schema,
+                ))
+                yield sink.drain()
+        finally:
+            writer.close()
+        yield sink.drain()
+
+    @staticmethod
+    def _plain(value: Any) -> Any:
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
@@ -1,6 +1,11 @@
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import Any, Optional
 import math
 
+from app.core.config import get_settings
+from app.core.events import current_seq
+from app.core.serialization import rows_to_dicts
+
 from app.repositories.search_repository import SearchRepository
 from app.repositories.store_repository import StoreRepository
 from app.schemas.search import (
@@ -8,9 +13,11 @@ from app.schemas.search import (
     SearchJobResponse,
     SearchJobWithResults,
     SearchJobListResponse,
+    SearchRunStatsResponse,
+    RetryMode,
 )
-from app.schemas.store import StoreResponse
-from app.models.search import SearchJob, SearchStatus
+from app.schemas.store import STORE_FIELDS
+from app.models.search import SearchJob, SearchStatus, SearchUrlStatus
 
 
 class SearchService:
@@ -29,28 +36,82 @@ class SearchService:
     def get_search(self, search_id: int) -> Optional[SearchJob]:
         return self.search_repo.get(search_id)
 
-    def get_search_with_results(self, search_id: int) -> Optional[SearchJobWithResults]:
-        """Get search job with all found stores."""
+    def get_search_with_results(
+        self,
+        search_id: int,
+        fields: Optional[list[str]] = None,
+        cursor: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> Optional[SearchJobWithResults]:
+        """
+        Get search job with the stores it found.
+
+        Returns all stores unless limit is set, in which case next_cursor
+        points at the following page (None on the last page).
+        """
         search = self.search_repo.get(search_id)
         if not search:
             return None
 
-        stores = self.search_repo.get_stores_for_search(search_id)
+        columns = fields or STORE_FIELDS
+        # Fetch one extra row to know whether another page exists
+        rows = self.search_repo.get_store_rows(
+            search_id,
+            columns,
+            cursor=cursor,
+            limit=limit + 1 if limit else None,
+        )
+
+        next_cursor = None
+        if limit and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = rows[-1][0]
 
         return SearchJobWithResults(
-            id=search.id,
-            query=search.query,
-            niche=search.niche,
-            location=search.location,
+            **SearchJobResponse.model_validate(search).model_dump(),
+            stores=rows_to_dicts(columns, (row[1:] for row in rows)),
+            next_cursor=next_cursor,
+        )
+
+    def get_run_stats(self, search_id: int) -> Optional[SearchRunStatsResponse]:
+        """Stage timings and URL outcomes of the search's latest finished run."""
+        search = self.search_repo.get(search_id)
+        if not search:
+            return None
+
+        return SearchRunStatsResponse(
+            search_id=search.id,
             status=search.status,
             stores_found=search.stores_found,
-            error_message=search.error_message,
-            created_at=search.created_at,
             started_at=search.started_at,
             completed_at=search.completed_at,
-            stores=[StoreResponse.model_validate(s) for s in stores],
+            timings=search.timings,
         )
 
+    def get_progress_snapshot(self, search_id: int) -> Optional[dict[str, Any]]:
+        """
+        Current state of a search for WebSocket clients (re)joining it.
+
+        seq is read before the search, so every event with a higher seq is
+        at least as new as the snapshot. Stores are fetched from
+        /searches/{id}/results.
+        """
+        seq = current_seq(search_id)
+        search = self.search_repo.get(search_id)
+        if not search:
+            return None
+
+        snapshot = {
+            "type": "snapshot",
+            "search_id": search_id,
+            "seq": seq,
+            "status": search.status.value,
+            "stores_found": search.stores_found,
+        }
+        if search.error_message:
+            snapshot["error"] = search.error_message
+        return snapshot
+
     def list_searches(
         self,
         page: int = 1,
@@ -58,12 +119,13 @@ class SearchService:
     ) -> SearchJobListResponse:
         skip = (page - 1) * page_size
         items = self.search_repo.get_all(skip=skip, limit=page_size)
-        total = self.search_repo.count()
-        pages = math.ceil(total / page_size) if total > 0 else 1
+        total = self.search_repo.count_query(cache_key="count:searches")
+        pages = math.ceil(total.total / page_size) if total.total > 0 else 1
 
         return SearchJobListResponse(
             items=[SearchJobResponse.model_validate(item) for item in items],
-            total=total,
+            total=total.total,
+            total_exact=total.exact,
             page=page,
             page_size=page_size,
             pages=pages,
@@ -82,6 +144,32 @@ class SearchService:
     ) -> Optional[SearchJob]:
         return self.search_repo.update_status(search_id, status, error_message)
 
+    def can_retry(self, search: SearchJob) -> bool:
+        """
+        Whether a search can be retried: it finished, or it has been running
+        for longer than SEARCH_STALLED_AFTER, so its tasks are taken to be lost
+        (a worker died before sending its chunks, or the finalizer was lost).
+        """
+        if search.status in (SearchStatus.FAILED, SearchStatus.COMPLETED):
+            return True
+        stalled_after = timedelta(seconds=get_settings().search_stalled_after)
+        return (
+            search.status == SearchStatus.RUNNING
+            and search.started_at is not None
+            and datetime.utcnow() - search.started_at > stalled_after
+        )
+
+    def prepare_retry(self, search_id: int, mode: RetryMode) -> None:
+        """Set up the search's URL checkpoint for the next run to retry in this mode."""
+        if mode == RetryMode.FULL:
+            self.search_repo.clear_urls(search_id)
+            return
+        # Nothing is in flight for a finished or stalled search: URLs its
+        # scrape tasks never got to (lost tasks) are pending again
+        self.search_repo.reset_urls(search_id, SearchUrlStatus.QUEUED)
+        if mode == RetryMode.FAILED:
+            self.search_repo.reset_urls(search_id, SearchUrlStatus.FAILED)
+
     def add_store_to_search(self, search_id: int, store_id: int) -> None:
         """Add a store to search results and increment counter."""
         self.search_repo.add_store_to_search(search_id, store_id)
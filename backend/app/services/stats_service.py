@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+from typing import Any
+
+from app.models.search import SearchStatus
+from app.repositories.store_repository import StoreRepository
+from app.repositories.search_repository import SearchRepository
+
+
+class StatsService:
+    """
+    Dashboard statistics read from precomputed aggregates.
+
+    Store facets and search stats are maintained on every write and
+    reconciled periodically, so this never scans stores or search_jobs.
+    """
+
+    def __init__(
+        self,
+        store_repo: StoreRepository,
+        search_repo: SearchRepository,
+    ):
+        self.store_repo = store_repo
+        self.search_repo = search_repo
+
+    def get_dashboard_stats(self, days: int = 30) -> dict[str, Any]:
+        """Store and search totals, plus stores per day for the last `days` days."""
+        facets = self.store_repo.facets.get_summary()
+
+        today = datetime.utcnow().date()
+        since = today - timedelta(days=days - 1)
+        daily = {
+            row.value: row.count
+            for row in self.store_repo.facets.get_daily_counts(since)
+        }
+        stores_per_day = [
+            {"value": day, "count": daily.get(day, 0)}
+            for day in ((since + timedelta(days=i)).isoformat() for i in range(days))
+        ]
+
+        searches = {status.value: {"count": 0, "stores_found": 0} for status in SearchStatus}
+        for row in self.search_repo.stats.get_counts():
+            searches[row.status] = {"count": row.count, "stores_found": row.stores_found}
+
+        total_searches = sum(s["count"] for s in searches.values())
+        completed = searches[SearchStatus.COMPLETED.value]
+        finished = completed["count"] + searches[SearchStatus.FAILED.value]["count"]
+
+        return {
+            "total_stores": facets["total"],
+            "contact_counts": facets["contact"],
+            "niche_counts": facets["niche"],
+            "stores_per_day": stores_per_day,
+            "total_searches": total_searches,
+            "searches_by_status": [
+                {"status": status, **counts} for status, counts in searches.items()
+            ],
+            "stores_found": completed["stores_found"],
+            "success_rate": round(completed["count"] / finished, 4) if finished else 0.0,
+        }
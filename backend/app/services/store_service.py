@@ -1,8 +1,14 @@
-from typing import Optional
+from typing import Any, Optional
 import math
 
 from app.repositories.store_repository import StoreRepository
-from app.schemas.store import StoreCreate, StoreUpdate, StoreResponse, StoreListResponse
+from app.core.serialization import rows_to_dicts
+from app.schemas.store import (
+    StoreCreate,
+    StoreUpdate,
+    FilterOptionsResponse,
+    STORE_LIST_FIELDS,
+)
 from app.models.store import Store
 
 
@@ -40,10 +46,18 @@ class StoreService:
         has_tiktok: Optional[bool] = None,
         page: int = 1,
         page_size: int = 20,
-    ) -> StoreListResponse:
+        fields: Optional[list[str]] = None,
+    ) -> dict[str, Any]:
+        """
+        Search stores, returning a StoreListResponse-shaped dict.
+
+        Only `fields` columns are selected (default: all but description) and
+        rows are zipped straight into dicts, skipping ORM and Pydantic objects.
+        """
         skip = (page - 1) * page_size
+        columns = fields or STORE_LIST_FIELDS
 
-        items, total = self.store_repo.search(
+        rows, total = self.store_repo.search(
             query=query,
             niche=niche,
             country=country,
@@ -52,24 +66,32 @@ class StoreService:
             has_tiktok=has_tiktok,
             skip=skip,
             limit=page_size,
+            columns=columns,
         )
 
-        pages = math.ceil(total / page_size) if total > 0 else 1
+        pages = math.ceil(total.total / page_size) if total.total > 0 else 1
 
-        return StoreListResponse(
-            items=[StoreResponse.model_validate(item) for item in items],
-            total=total,
-            page=page,
-            page_size=page_size,
-            pages=pages,
-        )
+        return {
+            "items": rows_to_dicts(columns, rows),
+            "total": total.total,
+            "total_exact": total.exact,
+            "page": page,
+            "page_size": page_size,
+            "pages": pages,
+        }
 
     def get_or_create_store(self, domain: str, defaults: dict) -> tuple[Store, bool]:
         return self.store_repo.get_or_create(domain, defaults)
 
-    def get_filter_options(self) -> dict:
-        """Get available filter options."""
-        return {
-            "niches": self.store_repo.get_niches(),
-            "countries": self.store_repo.get_countries(),
-        }
+    def get_filter_options(self) -> FilterOptionsResponse:
+        """Get available filter options with store counts."""
+        summary = self.store_repo.facets.get_summary()
+
+        return FilterOptionsResponse(
+            niches=[f["value"] for f in summary["niche"]],
+            countries=[f["value"] for f in summary["country"]],
+            total=summary["total"],
+            niche_counts=summary["niche"],
+            country_counts=summary["country"],
+            contact_counts=summary["contact"],
+        )
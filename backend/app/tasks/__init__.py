@@ -1,15 +1,24 @@
 from app.tasks.celery_app import celery_app
 from app.tasks.search_tasks import (
     run_search_task,
+    scrape_search_chunk,
+    finalize_search,
     scrape_store_details,
     scrape_instagram_profile,
     scrape_tiktok_profile,
 )
+from app.tasks.maintenance_tasks import rebuild_store_facets, rebuild_search_stats
+from app.tasks.export_tasks import export_stores_task
 
 __all__ = [
     "celery_app",
     "run_search_task",
+    "scrape_search_chunk",
+    "finalize_search",
     "scrape_store_details",
     "scrape_instagram_profile",
     "scrape_tiktok_profile",
+    "rebuild_store_facets",
+    "rebuild_search_stats",
+    "export_stores_task",
 ]
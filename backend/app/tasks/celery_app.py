@@ -1,15 +1,51 @@
+import glob
+import os
+import time
+
 from celery import Celery
+from celery.schedules import crontab
+from celery.signals import (
+    task_postrun,
+    task_prerun,
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+    worker_shutdown,
+)
+from kombu import Exchange, Queue
+from prometheus_client import start_http_server
 
 from app.core.config import get_settings
+from app.core.prometheus import CELERY_TASK_SECONDS, metrics_registry, multiprocess_enabled
+from app.core.worker_loop import worker_loop
 
 settings = get_settings()
 
+# Separate queues so each kind of work gets workers sized for it (see the
+# per-queue workers in docker-compose.prod.yml), and long browser searches
+# don't hold up quick rescrapes and lookups. A worker started without -Q
+# consumes them all
+QUEUES = ("serp", "store_scrape", "social", "maintenance")
+
+# Redis emulates priorities with a list per step and serves the lowest
+# number first. Work a user is waiting on jumps the queue's batch work
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 6
+
 celery_app = Celery(
     "leadgen",
     broker=settings.celery_broker_url,
     backend=settings.celery_result_backend,
-    include=["app.tasks.search_tasks"],
+    include=[
+        "app.tasks.search_tasks",
+        "app.tasks.maintenance_tasks",
+        "app.tasks.export_tasks",
+    ],
 )
+# The app shared tasks resolve to in every thread: set_as_current only
+# covers this one, so API endpoints queueing tasks from the threadpool
+# would otherwise get Celery's default (amqp://localhost) app
+celery_app.set_default()
 
 celery_app.conf.update(
     task_serializer="json",
@@ -21,4 +57,74 @@ celery_app.conf.update(
     task_time_limit=3600,  # 1 hour max per task
     worker_prefetch_multiplier=1,
     worker_concurrency=4,
+    task_queues=[Queue(name, Exchange(name), routing_key=name) for name in QUEUES],
+    task_default_queue="maintenance",
+    task_routes={
+        "app.tasks.search_tasks.run_search_task": {"queue": "serp"},
+        "app.tasks.search_tasks.finalize_search": {"queue": "serp"},
+        "app.tasks.search_tasks.scrape_search_chunk": {"queue": "store_scrape"},
+        "app.tasks.search_tasks.scrape_store_details": {"queue": "store_scrape"},
+        "app.tasks.search_tasks.scrape_instagram_profile": {"queue": "social"},
+        "app.tasks.search_tasks.scrape_tiktok_profile": {"queue": "social"},
+        "app.tasks.maintenance_tasks.*": {"queue": "maintenance"},
+        "app.tasks.export_tasks.*": {"queue": "maintenance"},
+    },
+    task_default_priority=PRIORITY_BATCH,
+    broker_transport_options={"priority_steps": [PRIORITY_INTERACTIVE, 3, PRIORITY_BATCH, 9]},
 )
+
+celery_app.conf.beat_schedule = {
+    "rebuild-store-facets": {
+        "task": "app.tasks.maintenance_tasks.rebuild_store_facets",
+        "schedule": crontab(minute=0),  # Hourly
+    },
+    "rebuild-search-stats": {
+        "task": "app.tasks.maintenance_tasks.rebuild_search_stats",
+        "schedule": crontab(minute=30),  # Hourly, offset from the facet rebuild
+    },
+}
+
+
+# Start times of tasks running in this process, by task id
+_task_started: dict[str, float] = {}
+
+
+@task_prerun.connect
+def _record_task_start(task_id=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _record_task_duration(task_id=None, task=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is not None and task is not None:
+        CELERY_TASK_SECONDS.labels(task.name, state or "UNKNOWN").observe(
+            time.perf_counter() - started
+        )
+
+
+@worker_init.connect
+def _start_metrics_server(**kwargs):
+    """Serve Prometheus metrics from the worker's main process."""
+    if not settings.worker_metrics_port:
+        return
+    if multiprocess_enabled():
+        # Samples from a previous run would be merged into this one's
+        directory = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+        os.makedirs(directory, exist_ok=True)
+        for path in glob.glob(os.path.join(directory, "*.db")):
+            os.remove(path)
+    start_http_server(settings.worker_metrics_port, registry=metrics_registry())
+
+
+@worker_process_init.connect
+def _start_worker_loop(**kwargs):
+    """Start the pool process's event loop, which its tasks' coroutines run on."""
+    worker_loop.start()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _stop_worker_loop(**kwargs):
+    """Close the loop's shared resources (solo pool: the loop started on first use)."""
+    worker_loop.stop()
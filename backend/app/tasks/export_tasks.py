@@ -0,0 +1,63 @@
+import argparse
+import os
+from datetime import datetime
+from typing import Optional
+
+from celery import shared_task
+
+from app.core.config import get_settings
+from app.services.export_service import ExportService, EXPORT_FORMATS
+
+
+@shared_task
+def export_stores_task(
+    format: str = "csv",
+    filters: Optional[dict] = None,
+    filename: Optional[str] = None,
+) -> dict:
+    """
+    Export matching stores to a file in the configured export directory.
+
+    Args:
+        format: csv, ndjson or parquet
+        filters: Same filters as GET /stores (query, niche, country, has_*)
+        filename: Output file name (defaults to a timestamped name)
+    """
+    settings = get_settings()
+    os.makedirs(settings.export_dir, exist_ok=True)
+
+    filename = filename or f"stores-{datetime.utcnow():%Y%m%d-%H%M%S}.{format}"
+    path = os.path.join(settings.export_dir, os.path.basename(filename))
+
+    ExportService().write_to_file(path, format, filters)
+
+    return {"status": "completed", "path": path, "bytes": os.path.getsize(path)}
+
+
+def main() -> None:
+    """Command line export: python -m app.tasks.export_tasks --format csv -o leads.csv"""
+    parser = argparse.ArgumentParser(description="Export stores to a file.")
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="csv")
+    parser.add_argument("-o", "--output", required=True, help="Output file path")
+    parser.add_argument("--query")
+    parser.add_argument("--niche")
+    parser.add_argument("--country")
+    parser.add_argument("--has-email", action="store_true", default=None)
+    parser.add_argument("--has-instagram", action="store_true", default=None)
+    parser.add_argument("--has-tiktok", action="store_true", default=None)
+    args = parser.parse_args()
+
+    filters = dict(
+        query=args.query,
+        niche=args.niche,
+        country=args.country,
+        has_email=args.has_email,
+        has_instagram=args.has_instagram,
+        has_tiktok=args.has_tiktok,
+    )
+    ExportService().write_to_file(args.output, args.format, filters)
+    print(f"Exported stores to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+from celery import shared_task
+
+from app.db.database import SessionLocal
+from app.repositories.facet_repository import FacetRepository
+from app.repositories.stats_repository import SearchStatsRepository
+
+
+@shared_task
+def rebuild_store_facets() -> dict:
+    """
+    Recompute store facet counts from scratch.
+
+    Facets are maintained incrementally on every store write; this periodic
+    rebuild corrects any drift (e.g. rows changed outside the repositories).
+    """
+    db = SessionLocal()
+
+    try:
+        FacetRepository(db).rebuild()
+        return {"status": "rebuilt"}
+
+    finally:
+        db.close()
+
+
+@shared_task
+def rebuild_search_stats() -> dict:
+    """
+    Recompute search stats per status from scratch.
+
+    Like store facets, search stats are maintained on every search write;
+    this periodic rebuild corrects any drift.
+    """
+    db = SessionLocal()
+
+    try:
+        SearchStatsRepository(db).rebuild()
+        return {"status": "rebuilt"}
+
+    finally:
+        db.close()
@@ -1,71 +1,289 @@
-import asyncio
 import os
-from datetime import datetime
-from celery import shared_task
+from datetime import datetime, timezone
+from urllib.parse import urlparse
 
+from celery import chord, shared_task
+
+from app.core.config import get_settings
+from app.core.events import SearchProgress, notify_search_update
+from app.core.profiling import task_profile
+from app.core.serp_cache import serp_cache
+from app.core.worker_loop import worker_loop
 from app.db.database import SessionLocal
 from app.repositories.search_repository import SearchRepository
 from app.repositories.store_repository import StoreRepository
-from app.models.search import SearchStatus
+from app.models.search import SearchStatus, SearchUrlStatus
+from app.schemas.store import STORE_LIST_FIELDS
 from app.scrapers import GoogleScraper, ShopifyScraper, SerpAPIScraper, InstagramScraper, TikTokScraper
+from app.tasks.celery_app import PRIORITY_BATCH, PRIORITY_INTERACTIVE
+from app.tasks.search_timings import SearchTimings
 
 
-def run_async(coro):
-    """Helper to run async code in sync context."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
+def run_async(coro, profile=None):
+    """Run async code on this worker's event loop (sampling loop lag if profiled)."""
+    return worker_loop.run(profile.watch(coro) if profile else coro)
 
 
-@shared_task(bind=True, max_retries=3)
-def run_search_task(self, search_id: int):
+@shared_task(bind=True, max_retries=3, acks_late=True)
+def run_search_task(self, search_id: int, profile: bool = False, refresh_serp: bool = False):
     """
     Execute a search job.
 
     1. Search Google for Shopify stores matching niche/location
     2. Validate and scrape each found URL
     3. Extract store data and save to database
+
+    Steps 2-3 fan out across workers: stores already saved are linked here,
+    the new URLs are split into chunks of SEARCH_CHUNK_SIZE for
+    scrape_search_chunk tasks, and finalize_search completes the search once
+    every chunk has reported. With SEARCH_CHUNK_SIZE=0 it all runs here.
+
+    Progress is checkpointed per URL (search_urls), so a retry, or a run
+    redelivered after a worker died (acks_late), resumes with the URLs
+    still pending rather than querying the SERP and visiting all of them again.
+    URLs handed to chunks are marked queued first, so a run redelivered after
+    dispatching doesn't dispatch them again; one redelivered after the search
+    finished leaves it as it is.
+
+    SERP results are shared with identical searches through the SERP cache;
+    refresh_serp=True (a full retry) queries the SERP again regardless.
+
+    With profile=True (or PROFILE_TASKS set) the run, and each chunk, is profiled.
     """
+    with task_profile(self, {"search_id": search_id}, enabled=profile) as profiler:
+        return _run_search(self, search_id, profiler, profile, refresh_serp)
+
+
+def _run_search(task, search_id: int, profiler, profile: bool, refresh_serp: bool = False) -> dict:
     db = SessionLocal()
+    timings = SearchTimings()
+    queued = False
 
     try:
         search_repo = SearchRepository(db)
         store_repo = StoreRepository(db)
 
-        # Update status to running
-        search_repo.update_status(search_id, SearchStatus.RUNNING)
-
         search = search_repo.get(search_id)
         if not search:
             return {"error": "Search not found"}
 
-        # Run the async scraping logic
-        result = run_async(_execute_search(
+        # Checked before the search is touched: a redelivered run must not
+        # restart the clock on, or reopen, a search that's in hand or done
+        handled = _already_handled(task, search, search_repo)
+        if handled:
+            return {"search_id": search_id, "status": search.status.value, handled: True}
+
+        # Update status to running
+        search = search_repo.update_status(search_id, SearchStatus.RUNNING)
+        notify_search_update(search_id, SearchStatus.RUNNING.value)
+
+        # Stores found are pushed to clients in coalesced batches
+        progress = SearchProgress(search_id, stores_found=search.stores_found)
+
+        chunk_size = get_settings().search_chunk_size
+        if chunk_size <= 0:
+            return run_async(_execute_search(
+                search_id=search_id,
+                query=search.query,
+                niche=search.niche,
+                location=search.location,
+                search_repo=search_repo,
+                store_repo=store_repo,
+                progress=progress,
+                timings=timings,
+                refresh_serp=refresh_serp,
+            ), profiler)
+
+        urls = run_async(_discover_urls(
             search_id=search_id,
             query=search.query,
             niche=search.niche,
             location=search.location,
             search_repo=search_repo,
             store_repo=store_repo,
-        ))
-
-        return result
+            progress=progress,
+            timings=timings,
+            refresh_serp=refresh_serp,
+        ), profiler)
+
+        discovery = timings.to_dict(samples=True)
+        chunks = [urls[i:i + chunk_size] for i in range(0, len(urls), chunk_size)]
+        if not chunks:
+            return _finalize_search(search_repo, search_id, [], discovery)
+
+        # Recorded before sending: dying in between leaves the search
+        # RUNNING rather than scraping every URL twice
+        search_repo.queue_urls(search_id, urls)
+        queued = True
+
+        # Chunks are batch work next to interactive rescrapes; the finalizer
+        # is quick and completes the search, so it goes to the front
+        chord(
+            scrape_search_chunk.s(search_id, chunk, search.niche, profile=profile)
+            .set(priority=PRIORITY_BATCH)
+            for chunk in chunks
+        )(finalize_search.s(search_id, discovery).set(priority=PRIORITY_INTERACTIVE))
+
+        return {
+            "search_id": search_id,
+            "status": "running",
+            "urls": len(urls),
+            "chunks": len(chunks),
+        }
 
     except Exception as e:
-        search_repo.update_status(
+        db.rollback()
+        if queued:
+            # The chord didn't go out: the retry dispatches these URLs again
+            search_repo.reset_urls(search_id, SearchUrlStatus.QUEUED)
+        timings.error(type(e).__name__)
+        search_repo.update_timings(search_id, timings.to_dict())
+        failed = search_repo.update_status(
             search_id,
             SearchStatus.FAILED,
             error_message=str(e),
         )
-        raise self.retry(exc=e, countdown=60)
+        notify_search_update(
+            search_id,
+            SearchStatus.FAILED.value,
+            stores_found=failed.stores_found if failed else 0,
+            error=str(e),
+        )
+        raise task.retry(exc=e, countdown=60)
 
     finally:
         db.close()
 
 
+@shared_task(bind=True, max_retries=2, acks_late=True, soft_time_limit=900, time_limit=960)
+def scrape_search_chunk(self, search_id: int, urls: list[str], niche: str | None, profile: bool = False):
+    """
+    Scrape a chunk of a fanned-out search's new URLs (see run_search_task).
+
+    Always returns a report for finalize_search, which a raising header task
+    would never reach: URLs that failed are listed in it, and a chunk that
+    fails as a whole (soft time limit included) is retried, then reported
+    as failed with all its URLs.
+    """
+    with task_profile(self, {"search_id": search_id, "urls": len(urls)}, enabled=profile) as profiler:
+        return _scrape_chunk(self, search_id, urls, niche, profiler)
+
+
+def _scrape_chunk(task, search_id: int, urls: list[str], niche: str | None, profiler) -> dict:
+    db = SessionLocal()
+    timings = SearchTimings()
+
+    try:
+        failed_urls = run_async(_scrape_urls(
+            search_id=search_id,
+            urls=urls,
+            niche=niche,
+            search_repo=SearchRepository(db),
+            store_repo=StoreRepository(db),
+            progress=SearchProgress(search_id),
+            timings=timings,
+        ), profiler)
+        return {
+            "ok": True,
+            "urls": len(urls),
+            "failed_urls": failed_urls,
+            "timings": timings.to_dict(samples=True),
+        }
+
+    except Exception as e:
+        if task.request.retries < task.max_retries:
+            raise task.retry(exc=e, countdown=30)
+        timings.error(type(e).__name__)
+        return {
+            "ok": False,
+            "urls": len(urls),
+            "failed_urls": urls,
+            "error": str(e),
+            "timings": timings.to_dict(samples=True),
+        }
+
+    finally:
+        db.close()
+
+
+@shared_task(bind=True, max_retries=3)
+def finalize_search(self, reports: list[dict], search_id: int, discovery: dict):
+    """
+    Complete a fanned-out search from its discovery timings and chunk reports.
+
+    Partial failure is not failure: the search is COMPLETED if any chunk
+    ran, with error_message counting the chunks that didn't, and FAILED
+    only when all of them failed. Either way stores_found counts every
+    store saved, since chunks update it as they go.
+
+    If it still can't finish after its retries, the search is marked FAILED
+    (best effort) rather than left RUNNING: its URL checkpoints survive, so
+    a "resume" retry picks it up.
+    """
+    db = SessionLocal()
+    try:
+        return _finalize_search(SearchRepository(db), search_id, reports, discovery)
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e, countdown=10)
+        db.rollback()
+        _mark_failed(SearchRepository(db), search_id, f"Could not finalize search: {e}")
+        raise
+    finally:
+        db.close()
+
+
+def _mark_failed(search_repo: SearchRepository, search_id: int, error: str) -> None:
+    """Mark a search FAILED if the database allows it (when giving up on it anyway)."""
+    try:
+        failed = search_repo.update_status(search_id, SearchStatus.FAILED, error_message=error)
+    except Exception:
+        return
+    notify_search_update(
+        search_id,
+        SearchStatus.FAILED.value,
+        stores_found=failed.stores_found if failed else 0,
+        error=error,
+    )
+
+
+def _finalize_search(search_repo: SearchRepository, search_id: int, reports: list[dict], discovery: dict) -> dict:
+    search = search_repo.get(search_id)
+    if not search:
+        return {"error": "Search not found"}
+
+    # Total time from the discovery task's start, on whichever worker that was
+    started = search.started_at.replace(tzinfo=timezone.utc).timestamp() if search.started_at else None
+    timings = SearchTimings(started)
+    timings.merge(discovery)
+    for report in reports:
+        timings.merge(report["timings"])
+
+    failed_chunks = [report for report in reports if not report["ok"]]
+    error = None
+    if failed_chunks:
+        error = (
+            f"{len(failed_chunks)} of {len(reports)} scrape tasks failed "
+            f"({sum(report['urls'] for report in failed_chunks)} URLs): "
+            f"{failed_chunks[0]['error']}"
+        )
+    status = SearchStatus.FAILED if reports and len(failed_chunks) == len(reports) else SearchStatus.COMPLETED
+
+    search_repo.update_timings(search_id, timings.to_dict())
+    search = search_repo.update_status(search_id, status, error_message=error)
+    notify_search_update(search_id, status.value, search.stores_found, error=error)
+
+    return {
+        "search_id": search_id,
+        "status": status.value,
+        "stores_found": search.stores_found,
+        "chunks": len(reports),
+        "failed_chunks": len(failed_chunks),
+        "failed_urls": sum(len(report["failed_urls"]) for report in reports),
+        "urls": search_repo.url_counts(search_id),
+    }
+
+
 async def _execute_search(
     search_id: int,
     query: str,
@@ -73,103 +291,252 @@ async def _execute_search(
     location: str | None,
     search_repo: SearchRepository,
     store_repo: StoreRepository,
+    progress: SearchProgress,
+    timings: SearchTimings,
+    refresh_serp: bool = False,
 ) -> dict:
-    """Async search execution."""
+    """Async search execution, all in this task."""
+    urls = await _discover_urls(
+        search_id, query, niche, location, search_repo, store_repo, progress, timings, refresh_serp
+    )
+    failed_urls = []
+    if urls:
+        failed_urls = await _scrape_urls(search_id, urls, niche, search_repo, store_repo, progress, timings)
+
+    # Mark search as completed (after the last partial batch of stores)
+    progress.flush()
+    search_repo.update_timings(search_id, timings.to_dict())
+    search_repo.update_status(search_id, SearchStatus.COMPLETED)
+    notify_search_update(search_id, SearchStatus.COMPLETED.value, progress.stores_found)
 
-    # Choose search method: SerpAPI if available, otherwise Playwright
-    serpapi_key = os.getenv("SERPAPI_KEY")
+    return {
+        "search_id": search_id,
+        "status": "completed",
+        "stores_found": timings.urls_known + timings.scraped,
+        "failed_urls": len(failed_urls),
+        "urls": search_repo.url_counts(search_id),
+    }
 
-    if serpapi_key:
-        searcher = SerpAPIScraper(api_key=serpapi_key)
-        search_query = searcher._build_search_query(niche or query, location)
-        urls = await searcher.search(search_query, max_results=50)
-    else:
-        searcher = GoogleScraper()
-        try:
-            urls = await searcher.search_shopify_stores(
-                niche=niche or query,
-                location=location,
-                max_results=50,
-            )
-        finally:
-            await searcher.close()
 
-    if not urls:
-        search_repo.update_status(search_id, SearchStatus.COMPLETED)
-        return {"search_id": search_id, "status": "completed", "stores_found": 0}
+def _already_handled(task, search, search_repo: SearchRepository) -> str | None:
+    """
+    Why a run must leave its search alone, or None if it should run.
+
+    The API sets a search PENDING before sending a run, and a run that fails
+    marks it FAILED before retrying itself, so a run that finds its search
+    COMPLETED, or FAILED on its first delivery, was redelivered after the
+    search finished. One that finds its URLs queued was redelivered after
+    dispatching them: the chunks and finalizer already sent will finish it.
+    """
+    if search.status == SearchStatus.COMPLETED:
+        return "already_finished"
+    if search.status == SearchStatus.FAILED and not task.request.retries:
+        return "already_finished"
+    if search_repo.get_urls(search.id, SearchUrlStatus.QUEUED):
+        return "already_dispatched"
+    return None
+
+
+async def _discover_urls(
+    search_id: int,
+    query: str,
+    niche: str | None,
+    location: str | None,
+    search_repo: SearchRepository,
+    store_repo: StoreRepository,
+    progress: SearchProgress,
+    timings: SearchTimings,
+    refresh_serp: bool = False,
+) -> list[str]:
+    """
+    Search for store URLs and link the stores already in the database.
+
+    The SERP URLs (one per domain) are checkpointed on the first run; a
+    retried or restarted run picks up the ones still pending instead of
+    querying again. Returns the URLs left to scrape.
+    """
+    search = search_repo.get(search_id)
+    if search.serp_fetched_at is None:
+        # Choose search method: SerpAPI if available, otherwise Playwright
+        serpapi_key = os.getenv("SERPAPI_KEY")
+
+        with timings.stage("serp"):
+            if serpapi_key:
+                searcher = SerpAPIScraper(api_key=serpapi_key)
+            else:
+                searcher = GoogleScraper()
+            search_query = searcher._build_search_query(niche or query, location)
+            try:
+                # Cached per query, shared with identical searches in flight
+                urls, timings.serp_cache = await serp_cache.get_or_fetch(
+                    "serpapi" if serpapi_key else "google",
+                    search_query,
+                    50,
+                    lambda: searcher.search(search_query, max_results=50),
+                    refresh=refresh_serp,
+                )
+            finally:
+                # The browser is only launched on a cache miss
+                if isinstance(searcher, GoogleScraper):
+                    await searcher.close()
+
+        domains = set()
+        unique_urls = []
+        for url in urls:
+            if _domain(url) not in domains:
+                domains.add(_domain(url))
+                unique_urls.append(url)
+        search_repo.save_urls(search_id, unique_urls)
+
+    urls = search_repo.get_urls(search_id, SearchUrlStatus.PENDING)
+    timings.urls_found = len(urls)
+    new_urls = []
+
+    try:
+        for url in urls:
+            progress.tick()
+            existing = store_repo.get_by_domain(_domain(url))
+            if existing:
+                timings.urls_known += 1
+                _link_store(search_id, existing, search_repo, progress, timings)
+                search_repo.set_url_status(search_id, url, SearchUrlStatus.DONE, store_id=existing.id)
+            else:
+                new_urls.append(url)
+    finally:
+        # On the loop, where a flush timer may be pending: before any status change
+        progress.flush()
+
+    return new_urls
+
+
+async def _scrape_urls(
+    search_id: int,
+    urls: list[str],
+    niche: str | None,
+    search_repo: SearchRepository,
+    store_repo: StoreRepository,
+    progress: SearchProgress,
+    timings: SearchTimings,
+) -> list[str]:
+    """
+    Scrape new store URLs and save the Shopify stores among them.
 
-    # Scrape each URL for Shopify store data
+    Each URL's outcome is checkpointed, and URLs no longer pending or
+    queued (done by an earlier attempt at this chunk) are skipped. A URL
+    failing doesn't stop the rest; returns the URLs that failed.
+    """
     shopify_scraper = ShopifyScraper()
-    stores_found = 0
+    pending = set(search_repo.get_urls(search_id, SearchUrlStatus.PENDING, SearchUrlStatus.QUEUED))
+    failed_urls = []
 
     try:
         for url in urls:
+            if url not in pending:
+                continue
+            progress.tick()
             try:
-                # Check if store already exists
-                from urllib.parse import urlparse
-                domain = urlparse(url).netloc.replace("www.", "")
-
-                existing = store_repo.get_by_domain(domain)
+                # Saved since discovery, e.g. by another search
+                existing = store_repo.get_by_domain(_domain(url))
                 if existing:
-                    # Link existing store to search
-                    search_repo.add_store_to_search(search_id, existing.id)
-                    search_repo.increment_stores_found(search_id)
-                    stores_found += 1
+                    timings.urls_known += 1
+                    _link_store(search_id, existing, search_repo, progress, timings)
+                    search_repo.set_url_status(search_id, url, SearchUrlStatus.DONE, store_id=existing.id)
                     continue
 
                 # Scrape the store
-                store_data = await shopify_scraper.scrape(url)
+                with timings.page():
+                    store_data = await shopify_scraper.scrape(url)
 
                 if store_data.get("error") or not store_data.get("is_shopify"):
+                    if store_data.get("error_type"):
+                        timings.error(store_data["error_type"])
+                        failed_urls.append(url)
+                        search_repo.set_url_status(
+                            search_id, url, SearchUrlStatus.FAILED, error_type=store_data["error_type"]
+                        )
+                    else:
+                        timings.not_shopify += 1
+                        search_repo.set_url_status(search_id, url, SearchUrlStatus.NOT_SHOPIFY)
                     continue
 
-                # Create store record
+                # Create store record and link it to the search results
                 social = store_data.get("social_links", {})
-                store = store_repo.create({
-                    "url": store_data["url"],
-                    "domain": store_data["domain"],
-                    "store_name": store_data.get("store_name"),
-                    "email": store_data.get("email"),
-                    "phone": store_data.get("phone"),
-                    "country": store_data.get("country"),
-                    "niche": niche,
-                    "description": store_data.get("description"),
-                    "instagram": social.get("instagram"),
-                    "tiktok": social.get("tiktok"),
-                    "facebook": social.get("facebook"),
-                    "twitter": social.get("twitter"),
-                    "last_scraped_at": datetime.utcnow(),
-                })
-
-                # Link to search results
-                search_repo.add_store_to_search(search_id, store.id)
-                search_repo.increment_stores_found(search_id)
-                stores_found += 1
-
-            except Exception:
-                # Continue with next URL on individual failures
-                continue
+                with timings.stage("db_write"):
+                    store = store_repo.create({
+                        "url": store_data["url"],
+                        "domain": store_data["domain"],
+                        "store_name": store_data.get("store_name"),
+                        "email": store_data.get("email"),
+                        "phone": store_data.get("phone"),
+                        "country": store_data.get("country"),
+                        "niche": niche,
+                        "description": store_data.get("description"),
+                        "instagram": social.get("instagram"),
+                        "tiktok": social.get("tiktok"),
+                        "facebook": social.get("facebook"),
+                        "twitter": social.get("twitter"),
+                        "last_scraped_at": datetime.utcnow(),
+                    })
+                _link_store(search_id, store, search_repo, progress, timings)
+                search_repo.set_url_status(search_id, url, SearchUrlStatus.DONE, store_id=store.id)
+                timings.scraped += 1
+
+            except Exception as e:
+                # Continue with next URL on individual failures (e.g. another
+                # chunk saving the same store first)
+                search_repo.db.rollback()
+                timings.error(type(e).__name__)
+                failed_urls.append(url)
+                search_repo.set_url_status(search_id, url, SearchUrlStatus.FAILED, error_type=type(e).__name__)
 
     finally:
         await shopify_scraper.close()
+        # Publish the last partial batch before any status change
+        progress.flush()
 
-    # Mark search as completed
-    search_repo.update_status(search_id, SearchStatus.COMPLETED)
+    return failed_urls
+
+
+def _link_store(
+    search_id: int,
+    store,
+    search_repo: SearchRepository,
+    progress: SearchProgress,
+    timings: SearchTimings,
+) -> None:
+    """Add a store to the search's results, unless it's there already, and report it."""
+    with timings.stage("db_write"):
+        # Linked by an earlier run of the search
+        if search_repo.has_store(search_id, store.id):
+            return
+        search_repo.add_store_to_search(search_id, store.id)
+        search = search_repo.increment_stores_found(search_id)
+    # The search's own count: chunks running elsewhere add to it too
+    progress.store_found(_store_event_data(store), search.stores_found)
+
+
+def _domain(url: str) -> str:
+    return urlparse(url).netloc.replace("www.", "")
 
-    return {
-        "search_id": search_id,
-        "status": "completed",
-        "stores_found": stores_found,
-    }
+
+def _store_event_data(store) -> dict:
+    """Store fields sent in progress events (as in the list endpoint)."""
+    return {field: getattr(store, field) for field in STORE_LIST_FIELDS}
 
 
 @shared_task(bind=True, max_retries=2)
-def scrape_store_details(self, store_id: int, scrape_social: bool = False):
+def scrape_store_details(self, store_id: int, scrape_social: bool = False, profile: bool = False):
     """
     Scrape/update details for a specific store.
 
     Optionally scrapes social media profiles for additional data.
+    With profile=True (or PROFILE_TASKS set) the run is profiled.
     """
+    with task_profile(self, {"store_id": store_id}, enabled=profile) as profiler:
+        return _scrape_store_details(self, store_id, scrape_social, profiler)
+
+
+def _scrape_store_details(task, store_id: int, scrape_social: bool, profiler) -> dict:
     db = SessionLocal()
 
     try:
@@ -179,11 +546,11 @@ def scrape_store_details(self, store_id: int, scrape_social: bool = False):
         if not store:
             return {"error": "Store not found"}
 
-        result = run_async(_scrape_store(store, store_repo, scrape_social))
+        result = run_async(_scrape_store(store, store_repo, scrape_social), profiler)
         return result
 
     except Exception as e:
-        raise self.retry(exc=e, countdown=30)
+        raise task.retry(exc=e, countdown=30)
 
     finally:
         db.close()
@@ -0,0 +1,96 @@
+import math
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from app.core.prometheus import SEARCH_STAGE_SECONDS
+
+
+class SearchTimings:
+    """
+    Wall time per stage and URL outcome counts for one search run.
+
+    Stage times are also observed in the Prometheus stage histogram, so one
+    timer feeds both the per-search breakdown and the fleet-wide metrics.
+    A fanned-out search times each task separately and merge()s the parts;
+    `started` is a wall-clock timestamp so the total spans all of them.
+    """
+
+    def __init__(self, started: float | None = None):
+        self.started = started if started is not None else time.time()
+        self.stages: dict[str, float] = {}
+        self.urls_found = 0
+        self.urls_known = 0
+        self.scraped = 0
+        self.not_shopify = 0
+        # Where the SERP URLs came from (see SerpCache); None if not fetched
+        self.serp_cache: str | None = None
+        self.errors: Counter[str] = Counter()
+        self._page_seconds: list[float] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Add the block's wall time to a stage, whether or not it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+            SEARCH_STAGE_SECONDS.labels(name).observe(elapsed)
+
+    @contextmanager
+    def page(self) -> Iterator[None]:
+        """Time one store page scrape (counted in the "scrape" stage)."""
+        start = time.perf_counter()
+        with self.stage("scrape"):
+            try:
+                yield
+            finally:
+                self._page_seconds.append(time.perf_counter() - start)
+
+    def error(self, error_type: str | None) -> None:
+        self.errors[error_type or "Error"] += 1
+
+    def merge(self, data: dict[str, Any]) -> None:
+        """Add the counts of another run's to_dict(samples=True)."""
+        for name, seconds in data.get("stages", {}).items():
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+        self.urls_found += data.get("urls_found", 0)
+        self.urls_known += data.get("urls_known", 0)
+        self.scraped += data.get("scraped", 0)
+        self.not_shopify += data.get("not_shopify", 0)
+        self.serp_cache = self.serp_cache or data.get("serp_cache")
+        self.errors.update(data.get("errors", {}))
+        self._page_seconds.extend(data.get("page_samples", []))
+
+    def to_dict(self, samples: bool = False) -> dict[str, Any]:
+        """The breakdown; samples=True adds raw page times, for merge()."""
+        pages = sorted(self._page_seconds)
+        data = {
+            "stages": {name: round(seconds, 3) for name, seconds in self.stages.items()},
+            "urls_found": self.urls_found,
+            "urls_known": self.urls_known,
+            "scraped": self.scraped,
+            "not_shopify": self.not_shopify,
+            "serp_cache": self.serp_cache,
+            "errors": dict(self.errors),
+            "page_seconds": {
+                "count": len(pages),
+                "p50": _percentile(pages, 0.50),
+                "p95": _percentile(pages, 0.95),
+                "max": round(pages[-1], 3) if pages else None,
+            },
+            "total_seconds": round(time.time() - self.started, 3),
+        }
+        if samples:
+            data["page_samples"] = [round(seconds, 3) for seconds in self._page_seconds]
+        return data
+
+
+def _percentile(values: list[float], q: float) -> float | None:
+    """Nearest-rank percentile of sorted values."""
+    if not values:
+        return None
+    return round(values[max(0, math.ceil(q * len(values)) - 1)], 3)
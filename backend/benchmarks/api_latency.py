@@ -0,0 +1,80 @@
+"""
+Latency benchmark for a running API.
+
+Sends GET requests from a fixed number of concurrent clients and reports
+throughput and latency percentiles. Run it against the same server and data
+before and after a change to compare:
+
+    python -m benchmarks.api_latency --url http://localhost:8000/api/v1/stores \\
+        --concurrency 50 --requests 5000
+
+Raise RATE_LIMIT_DEFAULT on the server first, or most requests get 429s.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+
+import httpx
+
+
+async def run(url: str, concurrency: int, requests: int, warmup: int) -> dict:
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    remaining = requests
+
+    async with httpx.AsyncClient(
+        timeout=30,
+        limits=httpx.Limits(max_connections=concurrency),
+    ) as client:
+        for _ in range(warmup):
+            await client.get(url)
+
+        async def worker() -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                response = await client.get(url)
+                latencies.append(time.perf_counter() - start)
+                statuses[response.status_code] += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "seconds": round(elapsed, 2),
+        "rps": round(len(latencies) / elapsed, 1),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+        "p50_ms": _percentile_ms(latencies, 0.50),
+        "p95_ms": _percentile_ms(latencies, 0.95),
+        "p99_ms": _percentile_ms(latencies, 0.99),
+        "status": dict(statuses),
+    }
+
+
+def _percentile_ms(sorted_values: list[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return round(sorted_values[index] * 1000, 2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark GET latency of a running API.")
+    parser.add_argument("--url", default="http://localhost:8000/api/v1/stores")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=50)
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.url, args.concurrency, args.requests, args.warmup))
+    for key, value in result.items():
+        print(f"{key:>10}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Load test of the read API with a realistic request mix.
+
+Drives a weighted mix of store listings (filters, text search, deep pages),
+/stores/filters and /searches/{id}/results at a fixed concurrency, and
+reports latency percentiles and SQL statements per request for each kind.
+Seed a scratch database first (see benchmarks.seed), then start the API
+with query counting on and the response cache and rate limits off, so the
+numbers measure the database path:
+
+    python -m benchmarks.seed --stores 1000000 --searches 5000 --reset
+    QUERY_COUNT_HEADER=true RESPONSE_CACHE_ENABLED=false RATE_LIMIT_ENABLED=false \\
+        uvicorn app.main:app --workers 4
+    python -m benchmarks.api_load --concurrency 32 --requests 10000 --output before.json
+
+Request parameters come from a seeded RNG over what the API reports
+(niches by store count, countries, search ids), so runs against the same
+dataset issue the same requests.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from collections import Counter, defaultdict
+from typing import Any, Callable
+
+import httpx
+
+# Weighted request kinds: (weight, build(rng, context) -> (path, params))
+Scenario = tuple[int, Callable[[random.Random, dict[str, Any]], tuple[str, dict[str, Any]]]]
+
+
+def _niche(rng: random.Random, context: dict[str, Any]) -> str:
+    """A niche, picked in proportion to its store count (popular ones dominate)."""
+    counts = context["niche_counts"]
+    return rng.choices([c["value"] for c in counts], [c["count"] for c in counts])[0]
+
+
+def _filtered(rng: random.Random, context: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+    params: dict[str, Any] = {"niche": _niche(rng, context)}
+    if context["countries"] and rng.random() < 0.4:
+        params["country"] = rng.choice(context["countries"])
+    flag = rng.choice([None, "has_email", "has_instagram", "has_tiktok"])
+    if flag:
+        params[flag] = "true"
+    return "/stores", params
+
+
+def _search_text(rng: random.Random, context: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+    return "/stores", {"query": _niche(rng, context).split()[-1]}
+
+
+def _deep_page(rng: random.Random, context: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+    last_page = max(1, context["store_pages"])
+    return "/stores", {"page": rng.randint(min(100, last_page), last_page)}
+
+
+def _search_results(rng: random.Random, context: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+    search_id = rng.choice(context["search_ids"])
+    return f"/searches/{search_id}/results", {"limit": 100}
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "stores.list": (20, lambda rng, context: ("/stores", {})),
+    "stores.filtered": (30, _filtered),
+    "stores.search": (10, _search_text),
+    "stores.deep_page": (10, _deep_page),
+    "stores.filters": (15, lambda rng, context: ("/stores/filters", {})),
+    "searches.results": (15, _search_results),
+}
+
+
+async def discover(client: httpx.AsyncClient, rng: random.Random) -> dict[str, Any]:
+    """What the request builders draw from: facets, page count and search ids."""
+    filters = (await client.get("/stores/filters")).json()
+    stores = (await client.get("/stores", params={"page_size": 20})).json()
+    searches = (await client.get("/searches", params={"page_size": 100})).json()
+
+    search_ids = [s["id"] for s in searches["items"]]
+    for page in rng.sample(range(2, searches["pages"] + 1), min(9, max(0, searches["pages"] - 1))):
+        response = await client.get("/searches", params={"page": page, "page_size": 100})
+        search_ids.extend(s["id"] for s in response.json()["items"])
+
+    return {
+        "niche_counts": filters["niche_counts"],
+        "countries": filters["countries"],
+        "store_pages": stores["pages"],
+        "search_ids": search_ids,
+    }
+
+
+async def run(base_url: str, concurrency: int, requests: int, warmup: int, seed: int) -> dict[str, Any]:
+    rng = random.Random(seed)
+    names = list(SCENARIOS)
+    weights = [SCENARIOS[name][0] for name in names]
+
+    latencies: dict[str, list[float]] = defaultdict(list)
+    queries: dict[str, list[int]] = defaultdict(list)
+    statuses: dict[str, Counter] = defaultdict(Counter)
+
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        timeout=60,
+        limits=httpx.Limits(max_connections=concurrency),
+    ) as client:
+        context = await discover(client, rng)
+        if not context["niche_counts"] or not context["search_ids"]:
+            raise SystemExit("No stores or searches: seed the database first (benchmarks.seed)")
+
+        plan = []
+        for _ in range(warmup + requests):
+            name = rng.choices(names, weights)[0]
+            plan.append((name, *SCENARIOS[name][1](rng, context)))
+        warmup_plan, plan = plan[:warmup], plan[warmup:]
+
+        for _, path, params in warmup_plan:
+            await client.get(path, params=params)
+
+        async def worker() -> None:
+            while plan:
+                name, path, params = plan.pop()
+                start = time.perf_counter()
+                response = await client.get(path, params=params)
+                latencies[name].append(time.perf_counter() - start)
+                statuses[name][response.status_code] += 1
+                if "X-DB-Queries" in response.headers:
+                    queries[name].append(int(response.headers["X-DB-Queries"]))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    total = sum(len(values) for values in latencies.values())
+    return {
+        "requests": total,
+        "seconds": round(elapsed, 2),
+        "rps": round(total / elapsed, 1),
+        "endpoints": {
+            name: _summarize(latencies[name], queries[name], statuses[name])
+            for name in names if latencies[name]
+        },
+    }
+
+
+def _summarize(latencies: list[float], queries: list[int], statuses: Counter) -> dict[str, Any]:
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+        "p50_ms": _percentile_ms(latencies, 0.50),
+        "p95_ms": _percentile_ms(latencies, 0.95),
+        "p99_ms": _percentile_ms(latencies, 0.99),
+        "max_ms": round(latencies[-1] * 1000, 2),
+        # None when the API runs without QUERY_COUNT_HEADER
+        "queries_mean": round(statistics.fmean(queries), 2) if queries else None,
+        "queries_max": max(queries) if queries else None,
+        "status": dict(statuses),
+    }
+
+
+def _percentile_ms(sorted_values: list[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return round(sorted_values[index] * 1000, 2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the read API with a mixed workload.")
+    parser.add_argument("--url", default="http://localhost:8000/api/v1")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.url, args.concurrency, args.requests, args.warmup, args.seed))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+    print(f"{result['requests']} requests in {result['seconds']}s ({result['rps']} req/s)")
+    for name, stats in result["endpoints"].items():
+        print(
+            f"{name:>18}: n={stats['requests']:<6} p50 {stats['p50_ms']:>8} ms  "
+            f"p95 {stats['p95_ms']:>8} ms  p99 {stats['p99_ms']:>8} ms  "
+            f"queries {stats['queries_mean']} (max {stats['queries_max']})  {stats['status']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
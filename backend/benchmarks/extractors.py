@@ -0,0 +1,275 @@
+"""
+Offline benchmark of the page extractors over a fixture corpus.
+
+Runs the HTML-processing half of each scraper (no browser, no network) over
+the saved pages in benchmarks/fixtures/pages and reports throughput, latency
+percentiles, peak memory and accuracy against the expected fields recorded
+in benchmarks/fixtures/expected.json:
+
+    python -m benchmarks.extractors --iterations 50 --output before.json
+    # ... change an extractor ...
+    python -m benchmarks.extractors --iterations 50 --compare before.json
+
+The pages are synthetic, modelled on real theme markup (Shopify Dawn,
+WooCommerce Storefront, BigCommerce Cornerstone, Instagram and TikTok
+profiles), and expected values are what a correct lead record would hold,
+not what the extractors return today. Memory is measured in a separate
+tracemalloc pass, since tracing slows the timed runs down several times.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from bs4 import BeautifulSoup
+
+from app.scrapers.instagram import InstagramScraper
+from app.scrapers.shopify import ShopifyDetector, ShopifyExtractor
+from app.scrapers.tiktok import TikTokScraper
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def load_corpus(fixtures_dir: str = FIXTURES_DIR) -> list[dict[str, Any]]:
+    """Manifest entries with each page's HTML loaded under "html"."""
+    with open(os.path.join(fixtures_dir, "expected.json")) as f:
+        pages = json.load(f)["pages"]
+    for page in pages:
+        with open(os.path.join(fixtures_dir, "pages", page["file"]), encoding="utf-8") as f:
+            page["html"] = f.read()
+    return pages
+
+
+def _profile_extract(scraper, html: str, defaults: dict[str, Any]) -> dict[str, Any]:
+    """What InstagramScraper.scrape / TikTokScraper.scrape do with page HTML."""
+    soup = BeautifulSoup(html, "lxml")
+    data = dict(defaults)
+    data.update(scraper._extract_from_html(html, soup))
+    data.update(scraper._extract_json_data(html) or {})
+    return data
+
+
+def build_targets(corpus: list[dict[str, Any]]) -> dict[str, tuple[Callable, list[dict]]]:
+    """Benchmark name -> (function of a page, pages it runs on)."""
+    loop = asyncio.new_event_loop()
+    shopify_extractor = ShopifyExtractor()
+    instagram = InstagramScraper()
+    tiktok = TikTokScraper()
+
+    def shopify_extract(page: dict) -> dict[str, Any]:
+        data = loop.run_until_complete(shopify_extractor.extract(page["html"], page["url"]))
+        return {**data, **data.pop("social_links")}
+
+    storefronts = [p for p in corpus if p["type"] == "storefront"]
+    return {
+        "shopify.detect": (
+            lambda page: ShopifyDetector.is_shopify(page["html"], page["url"]),
+            storefronts,
+        ),
+        "shopify.extract": (
+            shopify_extract,
+            [p for p in storefronts if p["is_shopify"]],
+        ),
+        "instagram.extract": (
+            lambda page: _profile_extract(instagram, page["html"], {"is_business": False}),
+            [p for p in corpus if p["type"] == "instagram"],
+        ),
+        "tiktok.extract": (
+            lambda page: _profile_extract(tiktok, page["html"], {}),
+            [p for p in corpus if p["type"] == "tiktok"],
+        ),
+    }
+
+
+def time_target(fn: Callable, pages: list[dict], iterations: int, warmup: int) -> dict[str, Any]:
+    for _ in range(warmup):
+        for page in pages:
+            fn(page)
+
+    latencies: list[float] = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for page in pages:
+            call_start = time.perf_counter()
+            fn(page)
+            latencies.append(time.perf_counter() - call_start)
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "pages": len(pages),
+        "calls": len(latencies),
+        "pages_per_sec": round(len(latencies) / elapsed, 1),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "p50_ms": _percentile_ms(latencies, 0.50),
+        "p95_ms": _percentile_ms(latencies, 0.95),
+        "max_ms": round(latencies[-1] * 1000, 3),
+    }
+
+
+def peak_memory_kb(fn: Callable, pages: list[dict]) -> float:
+    """Largest traced allocation peak of a single call (page HTML excluded)."""
+    peak = 0
+    tracemalloc.start()
+    try:
+        for page in pages:
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            fn(page)
+            _, call_peak = tracemalloc.get_traced_memory()
+            peak = max(peak, call_peak - baseline)
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+
+def _normalize(field: str, value: Any) -> Any:
+    if field == "phone" and value is not None:
+        return re.sub(r"\D", "", str(value))
+    if isinstance(value, str):
+        return value.strip().casefold()
+    return value
+
+
+def score_detect(fn: Callable, pages: list[dict]) -> dict[str, Any]:
+    wrong = [p["file"] for p in pages if fn(p) != p["is_shopify"]]
+    return {
+        "correct": len(pages) - len(wrong),
+        "total": len(pages),
+        "rate": round((len(pages) - len(wrong)) / len(pages), 3),
+        "misclassified": wrong,
+    }
+
+
+def score_fields(fn: Callable, pages: list[dict]) -> dict[str, Any]:
+    """Per-field match rates of extracted values against expected ones."""
+    fields: dict[str, dict[str, int]] = {}
+    misses = []
+    for page in pages:
+        data = fn(page)
+        for field, expected in page["expected"].items():
+            actual = data.get(field)
+            counts = fields.setdefault(field, {"correct": 0, "total": 0})
+            counts["total"] += 1
+            if _normalize(field, actual) == _normalize(field, expected):
+                counts["correct"] += 1
+            else:
+                misses.append({
+                    "file": page["file"],
+                    "field": field,
+                    "expected": expected,
+                    "actual": actual,
+                })
+
+    correct = sum(c["correct"] for c in fields.values())
+    total = sum(c["total"] for c in fields.values())
+    return {
+        "correct": correct,
+        "total": total,
+        "rate": round(correct / total, 3) if total else None,
+        "fields": {
+            field: round(c["correct"] / c["total"], 3) for field, c in fields.items()
+        },
+        "misses": misses,
+    }
+
+
+def run(iterations: int, warmup: int) -> dict[str, Any]:
+    corpus = load_corpus()
+    results = {}
+    for name, (fn, pages) in build_targets(corpus).items():
+        result = time_target(fn, pages, iterations, warmup)
+        result["peak_memory_kb"] = peak_memory_kb(fn, pages)
+        score = score_detect if name == "shopify.detect" else score_fields
+        result["accuracy"] = score(fn, pages)
+        results[name] = result
+
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "iterations": iterations,
+        "targets": results,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any]) -> dict[str, dict[str, str]]:
+    """Relative change of each target's headline numbers against a baseline run."""
+    changes = {}
+    for name, result in current["targets"].items():
+        before = baseline.get("targets", {}).get(name)
+        if not before:
+            continue
+        changes[name] = {
+            key: _change(before.get(key), result.get(key))
+            for key in ("pages_per_sec", "p95_ms", "peak_memory_kb")
+        }
+        changes[name]["accuracy"] = _change(
+            before.get("accuracy", {}).get("rate"), result["accuracy"]["rate"]
+        )
+    return changes
+
+
+def _change(before: float | None, after: float | None) -> str:
+    if not before or after is None:
+        return f"{before} -> {after}"
+    return f"{before} -> {after} ({(after - before) / before:+.1%})"
+
+
+def _percentile_ms(sorted_values: list[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return round(sorted_values[index] * 1000, 3)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(__file__),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark page extractors over the fixture corpus.")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--output", help="write the full results as JSON to this file")
+    parser.add_argument("--compare", help="baseline results JSON to compare against")
+    args = parser.parse_args()
+
+    result = run(args.iterations, args.warmup)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+    print(f"commit {result['commit']}, python {result['python']}, {result['iterations']} iterations")
+    for name, target in result["targets"].items():
+        accuracy = target["accuracy"]
+        print(
+            f"{name:>18}: {target['pages_per_sec']:>8} pages/s  "
+            f"p95 {target['p95_ms']:>8} ms  peak {target['peak_memory_kb']:>8} KiB  "
+            f"accuracy {accuracy['correct']}/{accuracy['total']}"
+        )
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\nvs {args.compare} (commit {baseline.get('commit')}):")
+        for name, changes in compare(result, baseline).items():
+            print(f"{name:>18}: " + "  ".join(f"{k} {v}" for k, v in changes.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,427 @@
+"""
+End-to-end search pipeline benchmark against a simulated web.
+
+Starts a local HTTP server (in its own process) that plays both SerpAPI and
+N storefronts, then runs searches through the real worker path
+(run_async(_execute_search(...))): SerpAPI client, Playwright, detector,
+extractor and database writes. Nothing leaves the machine, so runs are
+comparable across commits:
+
+    python -m benchmarks.pipeline --stores 200 --latency-ms 200 \\
+        --error-rate 0.05 --trickle-rate 0.05 --output after.json
+
+Each store is served at http://store-NNNN.localhost:PORT/ (Chromium
+resolves *.localhost to loopback) with one of the fixture pages from
+benchmarks/fixtures/pages, and behaves in one of four ways:
+
+    ok          page after --latency-ms (+/- --jitter-ms)
+    error       503 after the same latency
+    trickle     page streamed in chunks over --trickle-seconds
+    never_idle  page that polls the server forever, so "networkidle" never
+                comes and the navigation runs into its timeout
+
+The fake SERP answers /search like SerpAPI, returning the next 50 stores
+for each search ("bench-0", "bench-1", ...), so --stores 200 runs 4 searches.
+
+Reports URLs processed per minute, process CPU and peak RSS (the browser
+and Playwright driver are sampled separately when psutil is installed), and
+database round trips (statements + commits) per URL. Use a scratch
+database: searches and stores created by the run are deleted afterwards
+unless --keep is given.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import random
+import re
+import resource
+import threading
+import time
+from typing import Any
+
+import httpx
+import uvicorn
+from sqlalchemy import event
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - optional, for browser CPU/RSS
+    psutil = None
+
+from app.core.config import get_settings
+from app.core.events import SearchProgress
+from app.db.database import SessionLocal, engine
+from app.models.search import SearchStatus
+from app.repositories.search_repository import SearchRepository
+from app.repositories.store_repository import StoreRepository
+from app.tasks.search_tasks import _execute_search, run_async
+from app.tasks.search_timings import SearchTimings
+
+PAGES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "pages")
+# _execute_search asks the SERP for at most this many URLs per search
+URLS_PER_SEARCH = 50
+BEHAVIOURS = ("error", "trickle", "never_idle")
+
+# Keeps the browser off the network: fixture pages reference real CDNs
+_CSP = "<meta http-equiv=\"Content-Security-Policy\" content=\"default-src 'self' 'unsafe-inline' data:\">"
+_POLL_SCRIPT = "<script>setInterval(function () { fetch('/_poll?t=' + Date.now()); }, 200);</script>"
+
+
+def build_scenario(
+    stores: int,
+    shopify_ratio: float,
+    rates: dict[str, float],
+    seed: int,
+) -> list[dict[str, Any]]:
+    """Simulated stores: kind (shopify/other), behaviour and fixture page."""
+    rng = random.Random(seed)
+    fixtures = {
+        kind: sorted(os.listdir(os.path.join(PAGES_DIR, kind)))
+        for kind in ("shopify", "other")
+    }
+    scenario = []
+    for i in range(stores):
+        kind = "shopify" if rng.random() < shopify_ratio else "other"
+        behaviour, draw, threshold = "ok", rng.random(), 0.0
+        for name in BEHAVIOURS:
+            threshold += rates[name]
+            if draw < threshold:
+                behaviour = name
+                break
+        scenario.append({
+            "host": f"store-{i:04d}.localhost",
+            "kind": kind,
+            "behaviour": behaviour,
+            "page": os.path.join(kind, fixtures[kind][i % len(fixtures[kind])]),
+        })
+    return scenario
+
+
+def create_app(scenario: list[dict[str, Any]], port: int, options: dict[str, float]):
+    """Starlette app serving the fake SERP (on 127.0.0.1) and every store (by Host)."""
+    stores = {store["host"]: store for store in scenario}
+    pages = {}
+    for store in scenario:
+        if store["page"] not in pages:
+            with open(os.path.join(PAGES_DIR, store["page"]), encoding="utf-8") as f:
+                pages[store["page"]] = f.read().replace("<head>", "<head>" + _CSP, 1)
+    rng = random.Random()
+
+    async def latency() -> None:
+        delay = options["latency_ms"] + rng.uniform(-1, 1) * options["jitter_ms"]
+        await asyncio.sleep(max(0.0, delay) / 1000)
+
+    async def serp(request: Request) -> Response:
+        await asyncio.sleep(options["serp_latency_ms"] / 1000)
+        match = re.search(r"bench-(\d+)", request.query_params.get("q", ""))
+        if not match:
+            return JSONResponse({"organic_results": []})
+        first = int(match.group(1)) * URLS_PER_SEARCH + int(request.query_params.get("start", 0))
+        count = int(request.query_params.get("num", URLS_PER_SEARCH))
+        results = [
+            {"position": i + 1, "link": f"http://{store['host']}:{port}/"}
+            for i, store in enumerate(scenario[first:first + count])
+        ]
+        return JSONResponse({"organic_results": results})
+
+    async def storefront(request: Request) -> Response:
+        store = stores.get(request.url.hostname or "")
+        if store is None:
+            return Response(status_code=404)
+        await latency()
+        html = pages[store["page"]]
+
+        if store["behaviour"] == "error":
+            return HTMLResponse("<html><body>Service Unavailable</body></html>", status_code=503)
+
+        if store["behaviour"] == "trickle":
+            chunks = 20
+            size = math.ceil(len(html) / chunks)
+
+            async def body():
+                for i in range(chunks):
+                    yield html[i * size:(i + 1) * size]
+                    await asyncio.sleep(options["trickle_seconds"] / chunks)
+
+            return StreamingResponse(body(), media_type="text/html")
+
+        if store["behaviour"] == "never_idle":
+            html = html.replace("</body>", _POLL_SCRIPT + "</body>", 1)
+        return HTMLResponse(html)
+
+    async def poll(request: Request) -> Response:
+        await asyncio.sleep(0.1)
+        return Response(status_code=204)
+
+    async def health(request: Request) -> Response:
+        return Response("ok")
+
+    return Starlette(routes=[
+        Route("/search", serp),
+        Route("/_health", health),
+        Route("/_poll", poll),
+        Route("/", storefront),
+        Route("/{path:path}", lambda request: Response(status_code=404)),
+    ])
+
+
+def _serve(scenario: list[dict[str, Any]], port: int, options: dict[str, float]) -> None:
+    uvicorn.run(create_app(scenario, port, options), host="127.0.0.1", port=port, log_level="warning")
+
+
+class SimulatedWeb:
+    """The simulated web in a child process, so it doesn't skew the pipeline's CPU."""
+
+    def __init__(self, scenario: list[dict[str, Any]], port: int, options: dict[str, float]):
+        self.port = port
+        self.base_url = f"http://127.0.0.1:{port}"
+        self._process = multiprocessing.get_context("spawn").Process(
+            target=_serve, args=(scenario, port, options), daemon=True,
+        )
+
+    def __enter__(self) -> "SimulatedWeb":
+        self._process.start()
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            try:
+                if httpx.get(f"{self.base_url}/_health").status_code == 200:
+                    return self
+            except httpx.TransportError:
+                time.sleep(0.1)
+        self._process.terminate()
+        raise RuntimeError(f"Simulated web didn't start on port {self.port}")
+
+    def __exit__(self, *exc) -> None:
+        self._process.terminate()
+        self._process.join(5)
+
+
+class RoundTripCounter:
+    """Counts statements and commits sent to the database by this process."""
+
+    def __init__(self):
+        self.statements = 0
+        self.commits = 0
+
+    def __enter__(self) -> "RoundTripCounter":
+        event.listen(engine, "before_cursor_execute", self._on_statement)
+        event.listen(engine, "commit", self._on_commit)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(engine, "before_cursor_execute", self._on_statement)
+        event.remove(engine, "commit", self._on_commit)
+
+    def _on_statement(self, *args) -> None:
+        self.statements += 1
+
+    def _on_commit(self, *args) -> None:
+        self.commits += 1
+
+
+class ResourceSampler:
+    """
+    CPU and RSS of this process (exact, from rusage) and of its browser
+    processes (sampled every `interval` via psutil, excluding the server).
+    """
+
+    def __init__(self, exclude_pids: set[int], interval: float = 0.5):
+        self.exclude_pids = exclude_pids
+        self.interval = interval
+        self.browser_cpu: dict[int, float] = {}
+        self.browser_peak_rss = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> "ResourceSampler":
+        self._start = resource.getrusage(resource.RUSAGE_SELF)
+        if psutil is not None:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        end = resource.getrusage(resource.RUSAGE_SELF)
+        self.cpu_seconds = (end.ru_utime - self._start.ru_utime) + (end.ru_stime - self._start.ru_stime)
+        self.peak_rss_mb = end.ru_maxrss / 1024
+        if psutil is not None:
+            self._stop.set()
+            self._thread.join()
+
+    def _run(self) -> None:
+        me = psutil.Process()
+        while not self._stop.wait(self.interval):
+            rss = 0
+            for child in me.children(recursive=True):
+                if child.pid in self.exclude_pids:
+                    continue
+                try:
+                    cpu = child.cpu_times()
+                    self.browser_cpu[child.pid] = cpu.user + cpu.system
+                    rss += child.memory_info().rss
+                except psutil.Error:
+                    continue
+            self.browser_peak_rss = max(self.browser_peak_rss, rss)
+
+    def to_dict(self, seconds: float) -> dict[str, Any]:
+        result = {
+            "cpu_seconds": round(self.cpu_seconds, 2),
+            "cpu_percent": round(self.cpu_seconds / seconds * 100, 1),
+            "peak_rss_mb": round(self.peak_rss_mb, 1),
+        }
+        if psutil is not None:
+            browser_cpu = sum(self.browser_cpu.values())
+            result["browser_cpu_seconds"] = round(browser_cpu, 2)
+            result["browser_cpu_percent"] = round(browser_cpu / seconds * 100, 1)
+            result["browser_peak_rss_mb"] = round(self.browser_peak_rss / 1024 / 1024, 1)
+        return result
+
+
+def run_searches(searches: int) -> tuple[list[int], list[dict[str, Any]]]:
+    """Run searches "bench-0".. through the worker path; their ids and timings."""
+    search_ids, timings = [], []
+    for i in range(searches):
+        db = SessionLocal()
+        try:
+            search_repo = SearchRepository(db)
+            store_repo = StoreRepository(db)
+            search = search_repo.create({"query": f"bench-{i}", "niche": f"bench-{i}"})
+            search_ids.append(search.id)
+            search_repo.update_status(search.id, SearchStatus.RUNNING)
+
+            search_timings = SearchTimings()
+            run_async(_execute_search(
+                search_id=search.id,
+                query=search.query,
+                niche=search.niche,
+                location=search.location,
+                search_repo=search_repo,
+                store_repo=store_repo,
+                progress=SearchProgress(search.id),
+                timings=search_timings,
+            ))
+            timings.append(search_timings.to_dict())
+        finally:
+            db.close()
+    return search_ids, timings
+
+
+def cleanup(search_ids: list[int], scenario: list[dict[str, Any]], port: int) -> None:
+    db = SessionLocal()
+    try:
+        search_repo = SearchRepository(db)
+        store_repo = StoreRepository(db)
+        # Searches first: deleting them removes their result links
+        for search_id in search_ids:
+            search_repo.delete(search_id)
+        for store in scenario:
+            existing = store_repo.get_by_domain(f"{store['host']}:{port}")
+            if existing:
+                store_repo.delete(existing.id)
+    finally:
+        db.close()
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    rates = {
+        "error": args.error_rate,
+        "trickle": args.trickle_rate,
+        "never_idle": args.never_idle_rate,
+    }
+    scenario = build_scenario(args.stores, args.shopify_ratio, rates, args.seed)
+    options = {
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "serp_latency_ms": args.serp_latency_ms,
+        "trickle_seconds": args.trickle_seconds,
+    }
+
+    # _execute_search picks SerpAPI when a key is set; point it at the fake SERP
+    os.environ["SERPAPI_KEY"] = "benchmark"
+    settings = get_settings()
+    settings.scrape_delay_min = settings.scrape_delay_max = args.delay
+    # Every run asks for "bench-0".. again: always query the simulated SERP
+    settings.serp_cache_ttl = 0
+
+    with SimulatedWeb(scenario, args.port, options) as web:
+        settings.serpapi_base_url = web.base_url
+        searches = math.ceil(args.stores / URLS_PER_SEARCH)
+        start = time.perf_counter()
+        with RoundTripCounter() as db_trips, ResourceSampler({web._process.pid}) as usage:
+            search_ids, timings = run_searches(searches)
+        elapsed = time.perf_counter() - start
+
+    try:
+        urls = sum(t["urls_found"] for t in timings)
+        errors: dict[str, int] = {}
+        for t in timings:
+            for error_type, count in t["errors"].items():
+                errors[error_type] = errors.get(error_type, 0) + count
+
+        return {
+            "stores": args.stores,
+            "searches": searches,
+            "behaviours": {
+                name: sum(1 for s in scenario if s["behaviour"] == name)
+                for name in ("ok", *BEHAVIOURS)
+            },
+            "seconds": round(elapsed, 2),
+            "urls_processed": urls,
+            "stores_per_min": round(urls / elapsed * 60, 1),
+            "stores_saved": sum(t["scraped"] for t in timings),
+            "not_shopify": sum(t["not_shopify"] for t in timings),
+            "errors": errors,
+            "stages": {
+                stage: round(sum(t["stages"].get(stage, 0.0) for t in timings), 2)
+                for stage in ("serp", "scrape", "db_write")
+            },
+            "page_p95_seconds": max((t["page_seconds"]["p95"] or 0) for t in timings),
+            **usage.to_dict(elapsed),
+            "db_statements": db_trips.statements,
+            "db_commits": db_trips.commits,
+            "db_round_trips_per_store": (
+                round((db_trips.statements + db_trips.commits) / urls, 2) if urls else None
+            ),
+        }
+    finally:
+        if not args.keep:
+            cleanup(search_ids, scenario, args.port)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the search pipeline against a simulated web.")
+    parser.add_argument("--stores", type=int, default=100)
+    parser.add_argument("--shopify-ratio", type=float, default=0.8)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--jitter-ms", type=float, default=100)
+    parser.add_argument("--serp-latency-ms", type=float, default=500)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--trickle-rate", type=float, default=0.05)
+    parser.add_argument("--trickle-seconds", type=float, default=5)
+    parser.add_argument("--never-idle-rate", type=float, default=0.0,
+                        help="each never-idle store costs a full navigation timeout (30s)")
+    parser.add_argument("--delay", type=float, default=0.0,
+                        help="per-page scrape delay (SCRAPE_DELAY_MIN/MAX) for the run")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--keep", action="store_true", help="keep the searches and stores created")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    result = run(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    for key, value in result.items():
+        print(f"{key:>26}: {value}")
+
+
+if __name__ == "__main__":
+    main()
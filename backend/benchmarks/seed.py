@@ -0,0 +1,262 @@
+"""
+Seed Postgres with a large synthetic dataset for API load tests.
+
+Generates stores, searches and search result links with realistic skew
+(a few niches and countries dominate, recent stores outnumber old ones,
+some stores turn up in many searches), loads them with COPY, then rebuilds
+the store facets and search stats and ANALYZEs, so the API sees the same
+state it would after organic growth. Same arguments, same dataset:
+
+    python -m benchmarks.seed --stores 1000000 --searches 5000 --reset
+
+Use a scratch database: --reset truncates stores, searches, results,
+facets and stats. Without it the stores table must be empty.
+"""
+
+import argparse
+import csv
+import io
+import random
+import time
+from itertools import accumulate
+from datetime import datetime, timedelta
+from typing import Any, Iterator
+
+from app.db.database import SessionLocal, engine
+from app.models.search import SearchStatus
+from app.repositories.facet_repository import FacetRepository
+from app.repositories.stats_repository import SearchStatsRepository
+
+BATCH_SIZE = 50000
+
+NICHE_WORDS = [
+    "jewelry", "skincare", "candles", "coffee", "pet supplies", "fitness apparel",
+    "yoga", "tea", "home decor", "kids clothing", "swimwear", "streetwear",
+    "supplements", "phone cases", "sneakers", "vintage clothing", "plants",
+    "ceramics", "stationery", "hot sauce", "beard care", "lingerie", "watches",
+    "sunglasses", "hair care", "bags", "baby products", "outdoor gear",
+    "kitchenware", "art prints", "soap", "eyelashes", "nail polish", "toys",
+    "board games", "bike accessories", "fishing", "golf", "hats", "socks",
+]
+NICHE_MODIFIERS = ["", "organic ", "handmade ", "luxury ", "eco ", "vegan "]
+COUNTRIES = [
+    ("United States", 0.42),
+    ("United Kingdom", 0.12),
+    ("Canada", 0.08),
+    ("Australia", 0.07),
+    ("Germany", 0.05),
+    ("Europe", 0.04),
+    ("New Zealand", 0.02),
+    ("France", 0.02),
+    (None, 0.18),
+]
+LOCATIONS = ["USA", "UK", "Canada", "Australia", "California", "New York", "London", "Texas"]
+NAME_WORDS = [
+    "Bloom", "Wild", "Golden", "North", "Urban", "Little", "Salt", "Cedar",
+    "Moon", "Honey", "Stone", "Velvet", "Sunny", "Pine", "Coral", "Maple",
+]
+NAME_SUFFIXES = ["Co", "Studio", "Shop", "Goods", "Supply", "Collective", "House", "Lab"]
+SEARCH_STATUSES = [
+    (SearchStatus.COMPLETED, 0.85),
+    (SearchStatus.FAILED, 0.07),
+    (SearchStatus.PENDING, 0.05),
+    (SearchStatus.RUNNING, 0.03),
+]
+
+STORE_COLUMNS = [
+    "url", "domain", "store_name", "email", "phone", "country", "niche",
+    "description", "instagram", "tiktok", "facebook", "twitter",
+    "has_email", "has_instagram", "has_tiktok",
+    "created_at", "updated_at", "last_scraped_at",
+]
+SEARCH_COLUMNS = [
+    "query", "niche", "location", "status", "stores_found",
+    "created_at", "started_at", "completed_at",
+]
+
+
+def zipf_weights(n: int, s: float = 1.1) -> list[float]:
+    """Cumulative Zipf weights for random.choices(cum_weights=...)."""
+    return list(accumulate(1 / (rank ** s) for rank in range(1, n + 1)))
+
+
+def generate_stores(rng: random.Random, count: int, niches: list[str], now: datetime) -> Iterator[list[Any]]:
+    niche_weights = zipf_weights(len(niches))
+    countries, country_weights = zip(*COUNTRIES)
+    country_weights = list(accumulate(country_weights))
+    for i in range(count):
+        name = f"{rng.choice(NAME_WORDS)} {rng.choice(NAME_WORDS)} {rng.choice(NAME_SUFFIXES)}"
+        slug = name.lower().replace(" ", "")
+        domain = f"{slug}-{i}.com"
+        handle = f"@{slug}{i}"
+        niche = rng.choices(niches, cum_weights=niche_weights)[0]
+        email = f"hello@{domain}" if rng.random() < 0.35 else None
+        instagram = handle if rng.random() < 0.55 else None
+        tiktok = handle if rng.random() < 0.22 else None
+        # Squared draw: recent stores are denser, as the table grows over time
+        created_at = now - timedelta(days=730 * rng.random() ** 2, seconds=rng.randrange(86400))
+        yield [
+            f"https://{domain}",
+            domain,
+            name,
+            email,
+            f"+1 555 {rng.randrange(1000000):07d}" if rng.random() < 0.25 else None,
+            rng.choices(countries, cum_weights=country_weights)[0],
+            niche,
+            f"{name}: {niche} shipped worldwide. Free returns on all orders.",
+            instagram,
+            tiktok,
+            f"@{slug}{i}" if rng.random() < 0.4 else None,
+            f"@{slug}{i}" if rng.random() < 0.15 else None,
+            email is not None,
+            instagram is not None,
+            tiktok is not None,
+            created_at,
+            created_at,
+            created_at if rng.random() < 0.8 else None,
+        ]
+
+
+def generate_searches(
+    rng: random.Random,
+    count: int,
+    store_count: int,
+    niches: list[str],
+    now: datetime,
+) -> tuple[list[list[Any]], list[list[int]]]:
+    """Search rows and, per search, the (distinct) store ids it found."""
+    niche_weights = zipf_weights(len(niches))
+    statuses, status_weights = zip(*SEARCH_STATUSES)
+    searches, results = [], []
+    for _ in range(count):
+        niche = rng.choices(niches, cum_weights=niche_weights)[0]
+        location = rng.choice(LOCATIONS) if rng.random() < 0.5 else None
+        status = rng.choices(statuses, status_weights)[0]
+
+        store_ids: list[int] = []
+        if status in (SearchStatus.COMPLETED, SearchStatus.FAILED):
+            # Mostly tens of stores, with a long tail of very large searches
+            size = min(store_count, 5000, int(rng.lognormvariate(3.2, 1.0)))
+            # Cubed draw: low ids (the oldest stores) are found again and again
+            store_ids = list({int(store_count * rng.random() ** 3) + 1 for _ in range(size)})
+
+        created_at = now - timedelta(days=365 * rng.random())
+        started_at = created_at + timedelta(seconds=5) if status != SearchStatus.PENDING else None
+        completed_at = (
+            started_at + timedelta(seconds=30 + 2 * len(store_ids))
+            if status in (SearchStatus.COMPLETED, SearchStatus.FAILED) else None
+        )
+        searches.append([
+            f"{niche} {location}" if location else niche,
+            niche,
+            location,
+            status.name,
+            len(store_ids),
+            created_at,
+            started_at,
+            completed_at,
+        ])
+        results.append(store_ids)
+    return searches, results
+
+
+def copy_rows(cursor, table: str, columns: list[str], rows: Iterator[list[Any]]) -> int:
+    """COPY rows into a table in batches; returns the number of rows."""
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    total = 0
+    while True:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        batch = 0
+        for row in rows:
+            writer.writerow(["" if v is None else v for v in row])
+            batch += 1
+            if batch == BATCH_SIZE:
+                break
+        if not batch:
+            return total
+        buffer.seek(0)
+        cursor.copy_expert(sql, buffer)
+        total += batch
+
+
+def seed(stores: int, searches: int, seed_value: int, reset: bool) -> dict[str, Any]:
+    rng = random.Random(seed_value)
+    now = datetime(2025, 1, 1)
+    niches = [f"{modifier}{word}" for word in NICHE_WORDS for modifier in NICHE_MODIFIERS]
+    rng.shuffle(niches)
+    timings: dict[str, float] = {}
+
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        if reset:
+            cursor.execute(
+                "TRUNCATE search_results, search_jobs, stores, store_facets, search_stats "
+                "RESTART IDENTITY CASCADE"
+            )
+        else:
+            cursor.execute("SELECT EXISTS (SELECT 1 FROM stores)")
+            if cursor.fetchone()[0]:
+                raise SystemExit("stores is not empty: use a scratch database and pass --reset")
+
+        start = time.perf_counter()
+        copy_rows(cursor, "stores", STORE_COLUMNS, generate_stores(rng, stores, niches, now))
+        timings["stores"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        search_rows, results = generate_searches(rng, searches, stores, niches, now)
+        copy_rows(cursor, "search_jobs", SEARCH_COLUMNS, iter(search_rows))
+        # Identities restart at 1 after --reset; otherwise continue from the max
+        cursor.execute("SELECT COALESCE(MAX(id), 0) FROM search_jobs")
+        first_id = cursor.fetchone()[0] - len(search_rows) + 1
+        links = (
+            [first_id + i, store_id]
+            for i, store_ids in enumerate(results)
+            for store_id in store_ids
+        )
+        result_count = copy_rows(cursor, "search_results", ["search_id", "store_id"], links)
+        timings["searches"] = time.perf_counter() - start
+        connection.commit()
+
+        start = time.perf_counter()
+        connection.set_session(autocommit=True)
+        for table in ("stores", "search_jobs", "search_results"):
+            cursor.execute(f"VACUUM ANALYZE {table}")
+        timings["analyze"] = time.perf_counter() - start
+    finally:
+        connection.close()
+
+    start = time.perf_counter()
+    db = SessionLocal()
+    try:
+        FacetRepository(db).rebuild()
+        SearchStatsRepository(db).rebuild()
+    finally:
+        db.close()
+    timings["rebuild"] = time.perf_counter() - start
+
+    return {
+        "stores": stores,
+        "searches": searches,
+        "search_results": result_count,
+        "niches": len(niches),
+        **{f"{step}_seconds": round(seconds, 1) for step, seconds in timings.items()},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed the database with synthetic stores and searches.")
+    parser.add_argument("--stores", type=int, default=1000000)
+    parser.add_argument("--searches", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--reset", action="store_true", help="truncate existing data first")
+    args = parser.parse_args()
+
+    result = seed(args.stores, args.searches, args.seed, args.reset)
+    for key, value in result.items():
+        print(f"{key:>16}: {value}")
+
+
+if __name__ == "__main__":
+    main()
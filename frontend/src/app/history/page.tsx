@@ -17,7 +17,8 @@ export default function HistoryPage() {
   };
 
   const handleRetry = (search: SearchJob) => {
-    retrySearch.mutate(search.id);
+    // Reuse the failed run's URLs: retry only the ones that failed or weren't reached
+    retrySearch.mutate({ id: search.id, mode: 'failed' });
   };
 
   const handleDelete = (search: SearchJob) => {
@@ -32,7 +33,7 @@ export default function HistoryPage() {
       <div>
         <h1 className="text-2xl font-bold text-gray-900">Search History</h1>
         <p className="text-gray-500">
-          {searchesData?.total || 0} total searches
+          {searchesData?.total_exact === false && '~'}{searchesData?.total || 0} total searches
         </p>
       </div>
 
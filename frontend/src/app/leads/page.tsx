@@ -5,8 +5,9 @@ import { Download } from 'lucide-react';
 import { Button, Spinner } from '@/components/atoms';
 import { SearchInput } from '@/components/molecules';
 import { LeadsTable, FilterPanel, LeadDetail } from '@/components/organisms';
-import { useStores, useFilterOptions, useRescrapeStore } from '@/hooks';
-import { exportToCSV, exportToJSON } from '@/lib/export';
+import { useStores, useStore, useFilterOptions, useRescrapeStore } from '@/hooks';
+import { storesApi } from '@/lib/api';
+import { EXPORT_COLUMNS, exportToCSV, exportToJSON } from '@/lib/export';
 import type { Store, StoreFilters } from '@/types';
 
 export default function LeadsPage() {
@@ -17,6 +18,8 @@ export default function LeadsPage() {
   const [selectedStore, setSelectedStore] = useState<Store | null>(null);
 
   const { data: storesData, isLoading: isLoadingStores } = useStores(filters);
+  // List rows omit description; fetch the full store for the detail view
+  const { data: storeDetail } = useStore(selectedStore?.id ?? 0);
   const { data: filterOptions, isLoading: isLoadingFilters } = useFilterOptions();
   const rescrapeStore = useRescrapeStore();
 
@@ -32,16 +35,18 @@ export default function LeadsPage() {
     setFilters({ page: 1, page_size: 20 });
   };
 
-  const handleExportCSV = () => {
-    if (storesData?.items) {
-      exportToCSV(storesData.items, 'all-leads');
-    }
+  // The listed rows omit description: fetch the page again with every export column
+  const loadExportPage = async (): Promise<Store[]> => {
+    const { items } = await storesApi.list({ ...filters, fields: EXPORT_COLUMNS.join(',') });
+    return items;
   };
 
-  const handleExportJSON = () => {
-    if (storesData?.items) {
-      exportToJSON(storesData.items, 'all-leads');
-    }
+  const handleExportCSV = async () => {
+    exportToCSV(await loadExportPage(), 'all-leads');
+  };
+
+  const handleExportJSON = async () => {
+    exportToJSON(await loadExportPage(), 'all-leads');
   };
 
   const handleRescrape = (storeId: number) => {
@@ -55,7 +60,7 @@ export default function LeadsPage() {
         <div>
           <h1 className="text-2xl font-bold text-gray-900">All Leads</h1>
           <p className="text-gray-500">
-            {storesData?.total || 0} total stores in database
+            {storesData?.total_exact === false && '~'}{storesData?.total || 0} total stores in database
           </p>
         </div>
 
@@ -128,7 +133,7 @@ export default function LeadsPage() {
 
       {/* Store detail modal */}
       <LeadDetail
-        store={selectedStore}
+        store={storeDetail ?? selectedStore}
         isOpen={!!selectedStore}
         onClose={() => setSelectedStore(null)}
         onRescrape={handleRescrape}
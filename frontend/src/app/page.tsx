@@ -4,12 +4,13 @@ import { useRouter } from 'next/navigation';
 import { Store, TrendingUp, Search as SearchIcon } from 'lucide-react';
 import { SearchForm, SearchHistory } from '@/components/organisms';
 import { StatCard } from '@/components/molecules';
-import { useCreateSearch, useRecentSearches } from '@/hooks';
+import { useCreateSearch, useRecentSearches, useStats } from '@/hooks';
 import type { CreateSearchRequest, SearchJob } from '@/types';
 
 export default function HomePage() {
   const router = useRouter();
   const { data: recentSearches, isLoading: isLoadingSearches } = useRecentSearches(5);
+  const { data: stats } = useStats();
   const createSearch = useCreateSearch();
 
   const handleSearch = async (data: CreateSearchRequest) => {
@@ -25,10 +26,6 @@ export default function HomePage() {
     router.push(`/search/${search.id}`);
   };
 
-  // Calculate stats from recent searches
-  const completedSearches = recentSearches?.filter(s => s.status === 'COMPLETED') || [];
-  const totalStoresFound = completedSearches.reduce((sum, s) => sum + s.stores_found, 0);
-
   return (
     <div className="space-y-8">
       {/* Header */}
@@ -43,17 +40,17 @@ export default function HomePage() {
       <div className="grid gap-4 md:grid-cols-3">
         <StatCard
           label="Total Searches"
-          value={recentSearches?.length || 0}
+          value={stats?.total_searches || 0}
           icon={<SearchIcon className="h-6 w-6" />}
         />
         <StatCard
           label="Stores Found"
-          value={totalStoresFound}
+          value={stats?.stores_found || 0}
           icon={<Store className="h-6 w-6" />}
         />
         <StatCard
           label="Success Rate"
-          value={completedSearches.length > 0 ? `${Math.round((completedSearches.length / (recentSearches?.length || 1)) * 100)}%` : '0%'}
+          value={`${Math.round((stats?.success_rate || 0) * 100)}%`}
           icon={<TrendingUp className="h-6 w-6" />}
         />
       </div>
@@ -1,14 +1,16 @@
 'use client';
 
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { useParams, useRouter } from 'next/navigation';
+import { useQueryClient } from '@tanstack/react-query';
 import { ArrowLeft, Download, RefreshCw } from 'lucide-react';
 import { Button, Spinner } from '@/components/atoms';
 import { StatusBadge } from '@/components/molecules';
 import { LeadsTable, LeadDetail } from '@/components/organisms';
 import { useSearch, useSearchResults, useRetrySearch, useRescrapeStore, useToast, useWebSocket } from '@/hooks';
 import { exportToCSV, exportToJSON } from '@/lib/export';
-import type { Store } from '@/types';
+import { isSearchActive } from '@/lib/utils';
+import type { SearchJob, SearchStatus, Store } from '@/types';
 
 export default function SearchResultPage() {
   const params = useParams();
@@ -16,27 +18,53 @@ export default function SearchResultPage() {
   const searchId = Number(params.id);
   const toast = useToast();
 
-  const { data: search, isLoading: isLoadingSearch, refetch: refetchSearch } = useSearch(searchId);
-  const { data: searchResults, isLoading: isLoadingResults, refetch: refetchResults } = useSearchResults(searchId);
+  const queryClient = useQueryClient();
   const retrySearch = useRetrySearch();
   const rescrapeStore = useRescrapeStore();
 
   const [selectedStore, setSelectedStore] = useState<Store | null>(null);
 
-  // WebSocket for real-time updates
-  const { isConnected } = useWebSocket({
+  // Sequence number of the last event applied, to detect missed events
+  const lastSeq = useRef(0);
+
+  // WebSocket for real-time updates, pushed from the search worker
+  const { isConnected, send } = useWebSocket({
     searchId,
     onMessage: (message) => {
+      if (message.type === 'snapshot') {
+        // Authoritative state as of message.seq; results come from REST
+        lastSeq.current = message.seq ?? 0;
+        queryClient.setQueryData<SearchJob>(['search', searchId], (old) =>
+          old ? { ...old, status: (message.status?.toUpperCase() ?? old.status) as SearchStatus, stores_found: message.stores_found ?? old.stores_found } : old
+        );
+        refetchSearch();
+        refetchResults();
+        return;
+      }
+      if (message.type === 'resync') {
+        // Updates were dropped while we lagged behind
+        send('snapshot');
+        return;
+      }
+      if (message.seq !== undefined) {
+        if (message.seq <= lastSeq.current) return; // Already covered by a snapshot
+        if (message.seq > lastSeq.current + 1) send('snapshot');
+        lastSeq.current = message.seq;
+      }
+
       if (message.type === 'search_update') {
         refetchSearch();
-        if (message.status === 'COMPLETED') {
+        const status = message.status?.toUpperCase();
+        if (status === 'COMPLETED') {
           refetchResults();
           toast.success('Search completed', `Found ${message.stores_found} stores`);
-        } else if (message.status === 'FAILED') {
+        } else if (status === 'FAILED') {
           toast.error('Search failed', message.error || 'An error occurred');
         }
-      } else if (message.type === 'store_found') {
-        // Could add store to list optimistically
+      } else if (message.type === 'search_progress') {
+        queryClient.setQueryData<SearchJob>(['search', searchId], (old) =>
+          old ? { ...old, stores_found: message.stores_found ?? old.stores_found } : old
+        );
         refetchResults();
       }
     },
@@ -45,6 +73,10 @@ export default function SearchResultPage() {
     },
   });
 
+  // Poll only while the socket is down
+  const { data: search, isLoading: isLoadingSearch, refetch: refetchSearch } = useSearch(searchId, !isConnected);
+  const { data: searchResults, isLoading: isLoadingResults, refetch: refetchResults } = useSearchResults(searchId);
+
   const handleExportCSV = () => {
     if (searchResults?.stores) {
       exportToCSV(searchResults.stores, `leads-${search?.niche || 'search'}-${searchId}`);
@@ -61,7 +93,8 @@ export default function SearchResultPage() {
 
   const handleRetry = async () => {
     try {
-      await retrySearch.mutateAsync(searchId);
+      // Reuse the failed run's URLs: retry only the ones that failed or weren't reached
+      await retrySearch.mutateAsync({ id: searchId, mode: 'failed' });
       toast.info('Search restarted', 'The search has been queued for retry');
     } catch (error) {
       toast.error('Retry failed', 'Could not restart the search');
@@ -96,7 +129,7 @@ export default function SearchResultPage() {
     );
   }
 
-  const isRunning = search.status === 'RUNNING' || search.status === 'PENDING';
+  const isRunning = isSearchActive(search.status);
 
   return (
     <div className="space-y-6">
@@ -1,4 +1,5 @@
 export * from './useStores';
 export * from './useSearches';
+export * from './useStats';
 export * from './useToast';
 export * from './useWebSocket';
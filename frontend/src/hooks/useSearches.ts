@@ -2,7 +2,8 @@
 
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import { searchesApi } from '@/lib/api';
-import type { CreateSearchRequest } from '@/types';
+import { isSearchActive } from '@/lib/utils';
+import type { CreateSearchRequest, RetryMode } from '@/types';
 
 export function useSearches(page = 1, pageSize = 20) {
   return useQuery({
@@ -19,14 +20,14 @@ export function useRecentSearches(limit = 10) {
   });
 }
 
-export function useSearch(id: number) {
+export function useSearch(id: number, poll = true) {
   return useQuery({
     queryKey: ['search', id],
     queryFn: () => searchesApi.get(id),
     enabled: !!id,
-    refetchInterval: (data) => {
-      // Keep polling while search is running
-      if (data?.status === 'RUNNING' || data?.status === 'PENDING') {
+    refetchInterval: (query) => {
+      // Keep polling while search is running (unless updates are pushed)
+      if (poll && isSearchActive(query.state.data?.status)) {
         return 3000;
       }
       return false;
@@ -58,8 +59,8 @@ export function useRetrySearch() {
   const queryClient = useQueryClient();
 
   return useMutation({
-    mutationFn: (id: number) => searchesApi.retry(id),
-    onSuccess: (_, id) => {
+    mutationFn: ({ id, mode }: { id: number; mode?: RetryMode }) => searchesApi.retry(id, mode),
+    onSuccess: (_, { id }) => {
       queryClient.invalidateQueries({ queryKey: ['search', id] });
       queryClient.invalidateQueries({ queryKey: ['searches'] });
       queryClient.invalidateQueries({ queryKey: ['recentSearches'] });
@@ -0,0 +1,12 @@
+'use client';
+
+import { useQuery } from '@tanstack/react-query';
+import { statsApi } from '@/lib/api';
+
+export function useStats(days = 30) {
+  return useQuery({
+    queryKey: ['stats', days],
+    queryFn: () => statsApi.get(days),
+    refetchInterval: 10000,
+  });
+}
@@ -5,12 +5,15 @@ import { useEffect, useRef, useState, useCallback } from 'react';
 const WS_URL = process.env.NEXT_PUBLIC_WS_URL || 'ws://localhost:8000';
 
 export type WebSocketMessage = {
-  type: 'search_update' | 'store_found';
-  search_id: number;
+  type: 'search_update' | 'search_progress' | 'snapshot' | 'resync' | 'heartbeat';
+  search_id?: number;
+  // Per-search sequence number; a gap means events were missed
+  seq?: number;
   status?: string;
   stores_found?: number;
   error?: string;
-  store?: any;
+  // Stores found since the previous search_progress event
+  stores?: any[];
 };
 
 interface UseWebSocketOptions {
@@ -45,12 +48,16 @@ export function useWebSocket({
 
     ws.onopen = () => {
       setIsConnected(true);
+      // Catch up on anything published before (or while) we were connecting
+      if (searchId) ws.send('snapshot');
       onConnect?.();
     };
 
     ws.onmessage = (event) => {
       try {
         const message = JSON.parse(event.data) as WebSocketMessage;
+        // Server heartbeats only keep the connection alive
+        if (message.type === 'heartbeat') return;
         setLastMessage(message);
         onMessage?.(message);
       } catch (e) {
@@ -87,6 +94,12 @@ export function useWebSocket({
     }
   }, []);
 
+  const send = useCallback((data: string) => {
+    if (wsRef.current?.readyState === WebSocket.OPEN) {
+      wsRef.current.send(data);
+    }
+  }, []);
+
   const sendPing = useCallback(() => {
     if (wsRef.current?.readyState === WebSocket.OPEN) {
       wsRef.current.send('ping');
@@ -110,5 +123,6 @@ export function useWebSocket({
     lastMessage,
     connect,
     disconnect,
+    send,
   };
 }
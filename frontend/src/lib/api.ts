@@ -8,6 +8,8 @@ import type {
   SearchJobWithResults,
   SearchJobListResponse,
   CreateSearchRequest,
+  DashboardStats,
+  RetryMode,
 } from '@/types';
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api/v1';
@@ -107,6 +109,7 @@ export const storesApi = {
     if (filters.has_tiktok !== undefined) params.append('has_tiktok', String(filters.has_tiktok));
     if (filters.page) params.append('page', String(filters.page));
     if (filters.page_size) params.append('page_size', String(filters.page_size));
+    if (filters.fields) params.append('fields', filters.fields);
 
     const { data } = await api.get<StoreListResponse>(`/stores?${params}`);
     return data;
@@ -160,8 +163,8 @@ export const searchesApi = {
     return data;
   },
 
-  retry: async (id: number): Promise<SearchJob> => {
-    const { data } = await api.post<SearchJob>(`/searches/${id}/retry`);
+  retry: async (id: number, mode: RetryMode = 'full'): Promise<SearchJob> => {
+    const { data } = await api.post<SearchJob>(`/searches/${id}/retry`, null, { params: { mode } });
     return data;
   },
 
@@ -170,4 +173,12 @@ export const searchesApi = {
   },
 };
 
+// Stats API
+export const statsApi = {
+  get: async (days = 30): Promise<DashboardStats> => {
+    const { data } = await api.get<DashboardStats>(`/stats?days=${days}`);
+    return data;
+  },
+};
+
 export default api;
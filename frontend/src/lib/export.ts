@@ -1,36 +1,30 @@
 import type { Store } from '@/types';
 
-export function exportToCSV(stores: Store[], filename = 'leads'): void {
-  const headers = [
-    'Store Name',
-    'Domain',
-    'Email',
-    'Phone',
-    'Country',
-    'Niche',
-    'Instagram',
-    'TikTok',
-    'Facebook',
-    'Twitter',
-    'URL',
-  ];
+// Same columns as the server-side export (EXPORT_COLUMNS in export_service.py)
+export const EXPORT_COLUMNS: (keyof Store)[] = [
+  'id',
+  'url',
+  'domain',
+  'store_name',
+  'email',
+  'phone',
+  'country',
+  'niche',
+  'description',
+  'instagram',
+  'tiktok',
+  'facebook',
+  'twitter',
+  'created_at',
+  'updated_at',
+  'last_scraped_at',
+];
 
-  const rows = stores.map((store) => [
-    store.store_name || '',
-    store.domain,
-    store.email || '',
-    store.phone || '',
-    store.country || '',
-    store.niche || '',
-    store.instagram || '',
-    store.tiktok || '',
-    store.facebook || '',
-    store.twitter || '',
-    store.url,
-  ]);
+export function exportToCSV(stores: Store[], filename = 'leads'): void {
+  const rows = stores.map((store) => EXPORT_COLUMNS.map((column) => store[column] ?? ''));
 
   const csvContent = [
-    headers.join(','),
+    EXPORT_COLUMNS.join(','),
     ...rows.map((row) =>
       row.map((cell) => `"${String(cell).replace(/"/g, '""')}"`).join(',')
     ),
@@ -40,7 +34,10 @@ export function exportToCSV(stores: Store[], filename = 'leads'): void {
 }
 
 export function exportToJSON(stores: Store[], filename = 'leads'): void {
-  const jsonContent = JSON.stringify(stores, null, 2);
+  const rows = stores.map((store) =>
+    Object.fromEntries(EXPORT_COLUMNS.map((column) => [column, store[column] ?? null]))
+  );
+  const jsonContent = JSON.stringify(rows, null, 2);
   downloadFile(jsonContent, `${filename}.json`, 'application/json');
 }
 
@@ -59,3 +59,9 @@ export function getStatusColor(status: string): string {
       return 'bg-gray-100 text-gray-800';
   }
 }
+
+// The API sends lowercase statuses; pushed updates are upper-cased on arrival
+export function isSearchActive(status?: string): boolean {
+  const normalized = status?.toUpperCase();
+  return normalized === 'RUNNING' || normalized === 'PENDING';
+}
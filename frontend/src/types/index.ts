@@ -21,6 +21,7 @@ export interface Store {
 export interface StoreListResponse {
   items: Store[];
   total: number;
+  total_exact?: boolean;
   page: number;
   page_size: number;
   pages: number;
@@ -35,16 +36,31 @@ export interface StoreFilters {
   has_tiktok?: boolean;
   page?: number;
   page_size?: number;
+  // Comma-separated store fields (the API omits description by default)
+  fields?: string;
+}
+
+export interface FacetCount {
+  value: string;
+  count: number;
 }
 
 export interface FilterOptions {
   niches: string[];
   countries: string[];
+  total?: number;
+  niche_counts?: FacetCount[];
+  country_counts?: FacetCount[];
+  contact_counts?: Record<string, number>;
 }
 
 // Search types
 export type SearchStatus = 'PENDING' | 'RUNNING' | 'COMPLETED' | 'FAILED';
 
+// full: new SERP query, every URL; resume: URLs the last run didn't reach;
+// failed: those plus the URLs that failed
+export type RetryMode = 'full' | 'resume' | 'failed';
+
 export interface SearchJob {
   id: number;
   query: string;
@@ -60,11 +76,13 @@ export interface SearchJob {
 
 export interface SearchJobWithResults extends SearchJob {
   stores: Store[];
+  next_cursor?: number | null;
 }
 
 export interface SearchJobListResponse {
   items: SearchJob[];
   total: number;
+  total_exact?: boolean;
   page: number;
   page_size: number;
   pages: number;
@@ -76,6 +94,24 @@ export interface CreateSearchRequest {
   location?: string;
 }
 
+// Stats types
+export interface SearchStatusCount {
+  status: string;
+  count: number;
+  stores_found: number;
+}
+
+export interface DashboardStats {
+  total_stores: number;
+  contact_counts: Record<string, number>;
+  niche_counts: FacetCount[];
+  stores_per_day: FacetCount[];
+  total_searches: number;
+  searches_by_status: SearchStatusCount[];
+  stores_found: number;
+  success_rate: number;
+}
+
 // API response types
 export interface ApiError {
   detail: string;